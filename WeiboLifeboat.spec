@@ -58,11 +58,13 @@ a = Analysis(
         'src.gui.main_window',
         'src.gui.style',
         'src.gui.config_store',
+        'src.gui._json',
+        'src.gui._domain',
         'src.gui.cookie_login',
         'src.gui.cookie_login_native',
         'src.gui.pipeline_process',
+        'src.gui.log_view',
         'src.gui.shadow_button',
-        'src.gui.shadow_container',
         'src.gui.sidebar_delegate',
         'src.gui.title_bar',
         'src.database',
@@ -74,6 +76,7 @@ a = Analysis(
         'src.pipeline.runner',
         'src.pipeline.weibo_cn_parser',
         'src.pipeline.http_utils',
+        'src.pipeline.rate_limit',
         'src.pipeline.events',
         # macOS 原生 WebView
         'Foundation',
@@ -82,12 +85,15 @@ a = Analysis(
         'objc',
         # Windows 原生 WebView
         'PySide6.QtAxContainer',
+        'clr',
         'win32com',
         'winreg',
         # pywebview
         'webview',
         'bottle',
         'proxy_tools',
+        # httpx HTTP/2（httpcore 运行时才导入 h2）
+        'h2',
     ],
     hookspath=[],
     hooksconfig={},
@@ -9,19 +9,21 @@ Usage:
 
 from __future__ import annotations
 
+import importlib.util
+import multiprocessing
 import os
 import sys
 from pathlib import Path
 
-from src.gui.app import main
-
 
 if __name__ == "__main__":
+    # 详情页解析使用进程池：打包后的可执行文件需要 freeze_support，否则子进程会再次启动 GUI
+    multiprocessing.freeze_support()
+
     # Guardrail: many crashes/missing deps come from accidentally using the system Python
     # instead of the project's venv. Provide a clear hint.
-    try:
-        import PySide6  # noqa: F401
-    except Exception:
+    # 只检查是否可用，不在这里真正导入（PySide6 由 src.gui.app.main() 按需加载）
+    if importlib.util.find_spec("PySide6") is None:
         venv_py = Path(__file__).resolve().parent / ".venv" / "bin" / "python"
         msg = [
             "[weibo-backup] PySide6 未安装 / 当前解释器不包含依赖。",
@@ -36,6 +38,8 @@ if __name__ == "__main__":
     if pref:
         print(f"[weibo-backup] WEIBO_GUI_STYLE={pref}", file=sys.stderr)
 
+    from src.gui.app import main
+
     raise SystemExit(main())
 
 
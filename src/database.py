@@ -3,11 +3,119 @@
 """
 import sqlite3
 import json
+import threading
+import zlib
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Iterable, Tuple
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 from pathlib import Path
 from loguru import logger
 
+try:
+    import orjson  # 可选加速：直接输出 UTF-8 bytes
+except ImportError:
+    orjson = None
+
+
+_SQL_UPSERT_WEIBO = """
+    INSERT OR REPLACE INTO weibos
+    (id, user_id, created_at, text, source, reposts_count, comments_count, attitudes_count, raw_json,
+     is_retweet, is_truncated, retweet_category, detail_fetched)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# 热路径 SQL 统一定义为模块常量：sqlite3 语句缓存以 SQL 文本为键，文本固定即可复用已编译语句
+_SQL_WEIBO_EXISTS = "SELECT 1 FROM weibos WHERE id = ? LIMIT 1"
+_SQL_WEIBO_BRIEF = (
+    "SELECT id, text, raw_json, is_retweet, is_truncated, retweet_category, detail_fetched "
+    "FROM weibos WHERE id = ?"
+)
+_SQL_INSERT_IMAGE = "INSERT OR IGNORE INTO images (weibo_id, url, local_path, is_downloaded) VALUES (?, ?, ?, ?)"
+_SQL_INSERT_IMAGE_PENDING = "INSERT OR IGNORE INTO images (weibo_id, url, is_downloaded) VALUES (?, ?, 0)"
+_SQL_IMAGE_DEDUP = "SELECT id FROM images WHERE weibo_id = ? AND url = ?"
+_SQL_INSERT_VIDEO = (
+    "INSERT OR IGNORE INTO videos (weibo_id, url, cover_url, local_path, is_downloaded) VALUES (?, ?, ?, ?, ?)"
+)
+_SQL_VIDEO_DEDUP = "SELECT id FROM videos WHERE weibo_id = ? AND url = ?"
+_SQL_UPDATE_IMAGE_PATH = "UPDATE images SET local_path = ?, is_downloaded = 1 WHERE id = ?"
+_SQL_UPDATE_VIDEO_PATH = "UPDATE videos SET local_path = ?, is_downloaded = 1 WHERE id = ?"
+_SQL_WEIBO_IMAGES = "SELECT * FROM images WHERE weibo_id = ?"
+_SQL_WEIBO_VIDEOS = "SELECT * FROM videos WHERE weibo_id = ?"
+_SQL_GET_PROGRESS = "SELECT value FROM progress WHERE key = ?"
+_SQL_SET_PROGRESS = "INSERT OR REPLACE INTO progress (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)"
+
+
+def _year_start(year: int) -> str:
+    """年份下界字符串（created_at 以 YYYY 开头，直接做字符串比较即可命中索引）"""
+    return f"{int(year):04d}-01-01"
+
+
+# update_weibo_fields 允许更新的字段
+_UPDATABLE_WEIBO_FIELDS = frozenset({
+    "text",
+    "raw_json",
+    "is_retweet",
+    "is_truncated",
+    "retweet_category",
+    "detail_fetched",
+    "fetched_at",
+})
+
+# raw_json 超过该长度才压缩（太短的 JSON 压缩收益小于解压开销）
+_RAW_JSON_COMPRESS_MIN = 256
+
+
+def _dumps_json(obj: Any) -> bytes:
+    """紧凑 JSON（UTF-8，不转义中文）；优先 orjson，遇到其不支持的对象时退回标准库"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _pack_raw_json(value: Any) -> Any:
+    """
+    raw_json 入库编码：较长的 JSON 以 zlib 压缩后的 BLOB 存储，否则保持 TEXT。
+    两种格式共存于同一列，读取时由 _unpack_raw_json 自动识别。
+    value 可以是 str 或 UTF-8 bytes。
+    """
+    if value is None:
+        return None
+    data = value if isinstance(value, bytes) else str(value).encode('utf-8')
+    if len(data) >= _RAW_JSON_COMPRESS_MIN:
+        packed = zlib.compress(data, 6)
+        if len(packed) < len(data):
+            return packed
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def _unpack_raw_json(value: Any) -> Optional[str]:
+    """raw_json 出库解码：BLOB -> 解压后的 JSON 字符串；TEXT 原样返回"""
+    if isinstance(value, (bytes, memoryview)):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+
+def _weibo_row(weibo_data: Dict[str, Any]) -> Tuple[Any, ...]:
+    """微博字典 -> _SQL_UPSERT_WEIBO 的参数元组"""
+    return (
+        weibo_data['id'],
+        weibo_data['user_id'],
+        weibo_data.get('created_at'),
+        weibo_data.get('text'),
+        weibo_data.get('source'),
+        weibo_data.get('reposts_count', 0),
+        weibo_data.get('comments_count', 0),
+        weibo_data.get('attitudes_count', 0),
+        _pack_raw_json(_dumps_json(weibo_data)),
+        weibo_data.get("is_retweet"),
+        1 if weibo_data.get("is_truncated") else 0,
+        weibo_data.get("retweet_category"),
+        1 if weibo_data.get("detail_fetched") else 0,
+    )
+
 
 class Database:
     """微博数据库管理类"""
@@ -21,14 +129,87 @@ class Database:
         """
         self.db_path = db_path
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # isolation_level=None：由我们显式控制事务（BEGIN IMMEDIATE/COMMIT），避免隐式事务长期持有锁
+        # cached_statements 默认 128，调大以容纳全部常量语句和 list_* 查询
+        self.conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None, cached_statements=256
+        )
         self.conn.row_factory = sqlite3.Row  # 支持字典式访问
+        self._tls = threading.local()
+        # update_weibo_fields：字段集合 -> (字段顺序, SQL)
+        self._update_sql_cache: Dict[frozenset, Tuple[Tuple[str, ...], str]] = {}
+        # set_progress 暂存的最新进度：随下一个写事务一起提交（或 flush() 时单独提交）
+        self._pending_progress: Dict[str, str] = {}
+        # WAL + synchronous=NORMAL：提交不再逐行 fsync，读写互不阻塞（备份是写多读少的 I/O 密集场景）
+        # 注意：不开启 foreign_keys，否则 weibos 的 INSERT OR REPLACE 会因已有 images/videos 子记录而失败
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+        """)
         self._init_tables()
         logger.info(f"数据库初始化成功: {db_path}")
+
+    def _cursor(self) -> sqlite3.Cursor:
+        """当前线程复用的游标（避免每次调用都新建 Cursor 对象）"""
+        cur = getattr(self._tls, "cursor", None)
+        if cur is None:
+            cur = self._tls.cursor = self.conn.cursor()
+        return cur
+
+    def _scalar_cursor(self) -> sqlite3.Cursor:
+        """
+        当前线程复用的“元组”游标（row_factory=None）：只取单列/ID 的热路径不需要 sqlite3.Row 的按名访问
+        """
+        cur = getattr(self._tls, "scalar_cursor", None)
+        if cur is None:
+            cur = self._tls.scalar_cursor = self.conn.cursor()
+            cur.row_factory = None
+        return cur
+
+    @contextmanager
+    def _transaction(self):
+        """
+        写事务：BEGIN IMMEDIATE ... COMMIT（异常时回滚）。
+        已处于事务中时以 SAVEPOINT 嵌套在外层事务里（随外层一起提交，失败只回滚本段）。
+        set_progress 暂存的进度在提交前一并写入，因此进度不会先于它之前的数据落盘。
+        """
+        if self.conn.in_transaction:
+            # 嵌套：用 SAVEPOINT 保证本段失败时只回滚自己的写入
+            self.conn.execute("SAVEPOINT nested_tx")
+            try:
+                yield
+            except BaseException:
+                self.conn.execute("ROLLBACK TO nested_tx")
+                self.conn.execute("RELEASE nested_tx")
+                raise
+            else:
+                self.conn.execute("RELEASE nested_tx")
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+            if self._pending_progress:
+                # 用连接自带的临时游标：不能动线程复用游标，调用方可能还要读它的 rowcount/lastrowid
+                self.conn.executemany(_SQL_SET_PROGRESS, self._pending_progress.items())
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            self.conn.execute("COMMIT")
+            self._pending_progress.clear()
     
     def _init_tables(self):
         """创建数据库表"""
-        cursor = self.conn.cursor()
+        with self._transaction():
+            self._create_tables()
+        logger.info("数据库表结构创建完成")
+        self._ensure_weibos_columns()
+
+    def _create_tables(self):
+        cursor = self._cursor()
         
         # 微博主表
         cursor.execute("""
@@ -91,17 +272,44 @@ class Database:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_weibos_created ON weibos(created_at)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_images_weibo ON images(weibo_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_weibo ON videos(weibo_id)")
-        
-        self.conn.commit()
-        logger.info("数据库表结构创建完成")
-        self._ensure_weibos_columns()
+        # 待下载媒体：统一用 is_downloaded = 0 表示（旧数据里 local_path 为空但标记为已下载的，先纠正）
+        for table in ("images", "videos"):
+            cursor.execute(f"UPDATE {table} SET is_downloaded = 0 WHERE local_path IS NULL AND is_downloaded != 0")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_pending ON {table}(id) WHERE is_downloaded = 0"
+            )
+        # (weibo_id, url) 唯一：去重交给 sqlite（INSERT OR IGNORE），不再逐条 SELECT 检查
+        for table in ("images", "videos"):
+            self._ensure_media_unique_index(cursor, table)
+
+    def _ensure_media_unique_index(self, cursor: sqlite3.Cursor, table: str):
+        """
+        创建 {table}(weibo_id, url) 唯一索引。
+        旧数据库可能已存在重复记录：先去重（优先保留已下载的那条），再建索引。
+        """
+        sql = f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_weibo_url ON {table}(weibo_id, url)"
+        try:
+            cursor.execute(sql)
+        except sqlite3.IntegrityError:
+            cursor.execute(f"""
+                DELETE FROM {table} WHERE id NOT IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY weibo_id, url ORDER BY is_downloaded DESC, id
+                        ) AS rn
+                        FROM {table}
+                    ) WHERE rn = 1
+                )
+            """)
+            logger.warning(f"{table} 表存在重复记录，已去重 {cursor.rowcount} 条")
+            cursor.execute(sql)
 
     def _ensure_weibos_columns(self):
         """
         兼容已有数据库：确保我们需要的列存在。
         注意：只补齐列，不新增“业务之外”的额外列。
         """
-        cursor = self.conn.cursor()
+        cursor = self._cursor()
         cursor.execute("PRAGMA table_info(weibos)")
         existing = {row[1] for row in cursor.fetchall()}
         # sqlite 不支持 IF NOT EXISTS 的 ADD COLUMN（不同版本差异），所以手动判断
@@ -115,10 +323,21 @@ class Database:
         if "detail_fetched" not in existing:
             alters.append("ALTER TABLE weibos ADD COLUMN detail_fetched INTEGER DEFAULT 0")
 
-        for sql in alters:
-            cursor.execute(sql)
         if alters:
-            self.conn.commit()
+            with self._transaction():
+                for sql in alters:
+                    cursor.execute(sql)
+
+        # 依赖迁移后的列，放在 ALTER 之后创建
+        # 历史回填只关心未抓详情的微博：部分索引体积小，且按 created_at 有序
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_weibos_detail_unfetched ON weibos(created_at) "
+            "WHERE detail_fetched IS NULL OR detail_fetched = 0"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_weibos_need_detail ON weibos(created_at DESC) "
+            "WHERE is_truncated = 1 AND (detail_fetched IS NULL OR detail_fetched = 0)"
+        )
     
     def save_weibo(self, weibo_data: Dict[str, Any]) -> bool:
         """
@@ -131,32 +350,41 @@ class Database:
             是否保存成功
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO weibos 
-                (id, user_id, created_at, text, source, reposts_count, comments_count, attitudes_count, raw_json,
-                 is_retweet, is_truncated, retweet_category, detail_fetched)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                weibo_data['id'],
-                weibo_data['user_id'],
-                weibo_data.get('created_at'),
-                weibo_data.get('text'),
-                weibo_data.get('source'),
-                weibo_data.get('reposts_count', 0),
-                weibo_data.get('comments_count', 0),
-                weibo_data.get('attitudes_count', 0),
-                json.dumps(weibo_data, ensure_ascii=False),
-                weibo_data.get("is_retweet"),
-                1 if weibo_data.get("is_truncated") else 0,
-                weibo_data.get("retweet_category"),
-                1 if weibo_data.get("detail_fetched") else 0,
-            ))
-            self.conn.commit()
+            self._cursor().execute(_SQL_UPSERT_WEIBO, _weibo_row(weibo_data))
             return True
         except Exception as e:
             logger.error(f"保存微博失败 {weibo_data.get('id')}: {e}")
             return False
+
+    def save_weibos_bulk(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        批量保存微博（单个事务 + executemany）
+
+        Args:
+            rows: 微博数据字典序列
+
+        Returns:
+            保存成功的条数（整批失败时退回逐条保存，只丢掉出错的那几条）
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        try:
+            params = [_weibo_row(w) for w in rows]
+            with self._transaction():
+                self._cursor().executemany(_SQL_UPSERT_WEIBO, params)
+            return len(params)
+        except Exception as e:
+            logger.warning(f"批量保存微博失败，改为逐条保存: {e}")
+        try:
+            saved = 0
+            with self._transaction():
+                for w in rows:
+                    saved += self.save_weibo(w)
+            return saved
+        except Exception as e:
+            logger.error(f"逐条保存微博失败: {e}")
+            return 0
     
     def save_image(self, weibo_id: str, url: str, local_path: Optional[str] = None) -> int:
         """
@@ -170,18 +398,31 @@ class Database:
         Returns:
             图片记录ID
         """
-        cursor = self.conn.cursor()
-        # 去重：避免重复插入同一 weibo_id + url
-        cursor.execute("SELECT id FROM images WHERE weibo_id = ? AND url = ? LIMIT 1", (weibo_id, url))
-        row = cursor.fetchone()
-        if row:
-            return int(row["id"]) if isinstance(row, sqlite3.Row) else int(row[0])
-        cursor.execute(
-            "INSERT INTO images (weibo_id, url, local_path, is_downloaded) VALUES (?, ?, ?, ?)",
-            (weibo_id, url, local_path, 1 if local_path else 0),
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+        cursor = self._cursor()
+        cursor.execute(_SQL_INSERT_IMAGE, (weibo_id, url, local_path, 1 if local_path else 0))
+        if cursor.rowcount == 1:
+            return cursor.lastrowid
+        # 已存在（唯一索引冲突被忽略）：返回已有记录ID
+        return int(self._scalar_cursor().execute(_SQL_IMAGE_DEDUP, (weibo_id, url)).fetchone()[0])
+
+    def save_images_bulk(self, items: Iterable[Tuple[str, str]]) -> int:
+        """
+        批量保存图片记录（已存在的 weibo_id + url 自动忽略）
+
+        Args:
+            items: (微博ID, 图片URL) 序列
+
+        Returns:
+            新插入的条数
+        """
+        params = [(weibo_id, url) for weibo_id, url in items]
+        if not params:
+            return 0
+        cursor = self._cursor()
+        with self._transaction():
+            cursor.executemany(_SQL_INSERT_IMAGE_PENDING, params)
+            inserted = cursor.rowcount
+        return inserted
     
     def save_video(self, weibo_id: str, url: str, cover_url: Optional[str] = None, 
                    local_path: Optional[str] = None) -> int:
@@ -197,75 +438,56 @@ class Database:
         Returns:
             视频记录ID
         """
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT id FROM videos WHERE weibo_id = ? AND url = ? LIMIT 1", (weibo_id, url))
-        row = cursor.fetchone()
-        if row:
-            return int(row["id"]) if isinstance(row, sqlite3.Row) else int(row[0])
-        cursor.execute(
-            "INSERT INTO videos (weibo_id, url, cover_url, local_path, is_downloaded) VALUES (?, ?, ?, ?, ?)",
-            (weibo_id, url, cover_url, local_path, 1 if local_path else 0),
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+        cursor = self._cursor()
+        cursor.execute(_SQL_INSERT_VIDEO, (weibo_id, url, cover_url, local_path, 1 if local_path else 0))
+        if cursor.rowcount == 1:
+            return cursor.lastrowid
+        return int(self._scalar_cursor().execute(_SQL_VIDEO_DEDUP, (weibo_id, url)).fetchone()[0])
     
     def update_image_path(self, image_id: int, local_path: str):
         """更新图片本地路径"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE images SET local_path = ?, is_downloaded = 1 
-            WHERE id = ?
-        """, (local_path, image_id))
-        self.conn.commit()
+        self._cursor().execute(_SQL_UPDATE_IMAGE_PATH, (local_path, image_id))
     
     def update_video_path(self, video_id: int, local_path: str):
         """更新视频本地路径"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE videos SET local_path = ?, is_downloaded = 1 
-            WHERE id = ?
-        """, (local_path, video_id))
-        self.conn.commit()
+        self._cursor().execute(_SQL_UPDATE_VIDEO_PATH, (local_path, video_id))
     
     def get_undownloaded_images(self) -> List[Dict]:
         """获取未下载的图片列表"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM images WHERE is_downloaded = 0 OR local_path IS NULL")
+        cursor = self._cursor()
+        cursor.execute("SELECT * FROM images WHERE is_downloaded = 0")
         return [dict(row) for row in cursor.fetchall()]
     
     def get_undownloaded_videos(self) -> List[Dict]:
         """获取未下载的视频列表"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM videos WHERE is_downloaded = 0 OR local_path IS NULL")
+        cursor = self._cursor()
+        cursor.execute("SELECT * FROM videos WHERE is_downloaded = 0")
         return [dict(row) for row in cursor.fetchall()]
 
     def weibo_exists(self, weibo_id: str) -> bool:
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT 1 FROM weibos WHERE id = ? LIMIT 1", (weibo_id,))
-        return cursor.fetchone() is not None
+        return self._scalar_cursor().execute(_SQL_WEIBO_EXISTS, (weibo_id,)).fetchone() is not None
 
     def get_weibo_brief(self, weibo_id: str) -> Optional[Dict[str, Any]]:
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT id, text, raw_json, is_retweet, is_truncated, retweet_category, detail_fetched FROM weibos WHERE id = ?",
-            (weibo_id,),
-        )
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        row = self._cursor().execute(_SQL_WEIBO_BRIEF, (weibo_id,)).fetchone()
+        if not row:
+            return None
+        brief = dict(row)
+        brief["raw_json"] = _unpack_raw_json(brief["raw_json"])
+        return brief
 
     def list_weibos_needing_detail(self, limit: int = 200) -> List[str]:
         """
         需要抓取详情页的微博（用于补全文/补图片/补分类），基于 checkpoint 防重复。
         """
-        cursor = self.conn.cursor()
+        cursor = self._scalar_cursor()
         cursor.execute(
             "SELECT id FROM weibos WHERE is_truncated = 1 AND (detail_fetched IS NULL OR detail_fetched = 0) ORDER BY created_at DESC LIMIT ?",
             (limit,),
         )
-        return [row["id"] for row in cursor.fetchall()]
+        return [row[0] for row in cursor.fetchall()]
 
     def list_weibos_missing_retweet_flag(self, limit: int = 500) -> List[Dict[str, Any]]:
-        cursor = self.conn.cursor()
+        cursor = self._cursor()
         cursor.execute(
             "SELECT id, text, detail_fetched FROM weibos WHERE is_retweet IS NULL ORDER BY created_at DESC LIMIT ?",
             (limit,),
@@ -277,18 +499,18 @@ class Database:
         历史回填：选择年份 < before_year 且 detail_fetched=0/NULL 的微博（不区分是否折叠/原创/转发）。
         例如 before_year=2020 表示回填 2019 及以前。
         """
-        cursor = self.conn.cursor()
+        cursor = self._scalar_cursor()
         cursor.execute(
             """
             SELECT id FROM weibos
             WHERE (detail_fetched IS NULL OR detail_fetched = 0)
-              AND CAST(substr(created_at, 1, 4) AS int) < ?
+              AND created_at < ?
             ORDER BY created_at DESC
             LIMIT ?
             """,
-            (int(before_year), int(limit)),
+            (_year_start(before_year), int(limit)),
         )
-        return [row["id"] for row in cursor.fetchall()]
+        return [row[0] for row in cursor.fetchall()]
 
     def list_retweet_recheck_candidates_before_year(
         self,
@@ -302,31 +524,31 @@ class Database:
         - video_phrase: 只复核 text 含“微博视频”等尾巴的 is_retweet=0（更省）
         - all_original: 复核该范围内所有 is_retweet=0（更全面）
         """
-        cursor = self.conn.cursor()
+        cursor = self._scalar_cursor()
         if mode == "all_original":
             cursor.execute(
                 """
                 SELECT id FROM weibos
-                WHERE CAST(substr(created_at, 1, 4) AS int) < ?
+                WHERE created_at < ?
                   AND is_retweet = 0
                 ORDER BY created_at DESC
                 LIMIT ?
                 """,
-                (int(before_year), int(limit)),
+                (_year_start(before_year), int(limit)),
             )
         else:
             cursor.execute(
                 """
                 SELECT id FROM weibos
-                WHERE CAST(substr(created_at, 1, 4) AS int) < ?
+                WHERE created_at < ?
                   AND is_retweet = 0
                   AND (text LIKE '%的微博视频%' OR text LIKE '%微博视频%')
                 ORDER BY created_at DESC
                 LIMIT ?
                 """,
-                (int(before_year), int(limit)),
+                (_year_start(before_year), int(limit)),
             )
-        return [row["id"] for row in cursor.fetchall()]
+        return [row[0] for row in cursor.fetchall()]
 
     def list_retweet_recheck_candidates(
         self,
@@ -340,30 +562,30 @@ class Database:
         - video_phrase: 只复核 text 中包含“的微博视频”的、当前被标为原创(is_retweet=0)的微博（典型结构型转发）
         - all_original: 复核该年份所有 is_retweet=0 的微博（更全面但网络请求更多）
         """
-        cursor = self.conn.cursor()
-        y = str(year)
+        cursor = self._scalar_cursor()
+        year_range = (_year_start(year), _year_start(int(year) + 1))
         if mode == "all_original":
             cursor.execute(
                 """
                 SELECT id FROM weibos
-                WHERE created_at LIKE ? AND is_retweet = 0
+                WHERE created_at >= ? AND created_at < ? AND is_retweet = 0
                 ORDER BY created_at DESC
                 LIMIT ?
                 """,
-                (f"{y}-%", int(limit)),
+                (*year_range, int(limit)),
             )
         else:
             cursor.execute(
                 """
                 SELECT id FROM weibos
-                WHERE created_at LIKE ? AND is_retweet = 0
+                WHERE created_at >= ? AND created_at < ? AND is_retweet = 0
                   AND (text LIKE '%的微博视频%' OR text LIKE '%微博视频%')
                 ORDER BY created_at DESC
                 LIMIT ?
                 """,
-                (f"{y}-%", int(limit)),
+                (*year_range, int(limit)),
             )
-        return [row["id"] for row in cursor.fetchall()]
+        return [row[0] for row in cursor.fetchall()]
 
     def update_weibo_fields(self, weibo_id: str, fields: Dict[str, Any]) -> None:
         """
@@ -371,28 +593,65 @@ class Database:
         """
         if not fields:
             return
-        allowed = {
-            "text",
-            "raw_json",
-            "is_retweet",
-            "is_truncated",
-            "retweet_category",
-            "detail_fetched",
-            "fetched_at",
-        }
-        bad = set(fields.keys()) - allowed
-        if bad:
-            raise ValueError(f"不允许更新字段: {sorted(bad)}")
-        parts = []
-        params: List[Any] = []
-        for k, v in fields.items():
-            parts.append(f"{k} = ?")
-            params.append(v)
+        key = frozenset(fields)
+        cached = self._update_sql_cache.get(key)
+        if cached is None:
+            bad = key - _UPDATABLE_WEIBO_FIELDS
+            if bad:
+                raise ValueError(f"不允许更新字段: {sorted(bad)}")
+            # 字段顺序固定（排序），同一组字段总是生成同一条 SQL，可命中语句缓存
+            columns = tuple(sorted(key))
+            sql = f"UPDATE weibos SET {', '.join(f'{k} = ?' for k in columns)} WHERE id = ?"
+            cached = self._update_sql_cache[key] = (columns, sql)
+        columns, sql = cached
+        params = [_pack_raw_json(fields[k]) if k == "raw_json" else fields[k] for k in columns]
         params.append(weibo_id)
-        sql = f"UPDATE weibos SET {', '.join(parts)} WHERE id = ?"
-        cursor = self.conn.cursor()
-        cursor.execute(sql, tuple(params))
-        self.conn.commit()
+        self._cursor().execute(sql, params)
+
+    def update_weibos_bulk(
+        self,
+        updates: Iterable[Tuple[str, Dict[str, Any]]],
+        images: Iterable[Tuple[str, str]] = (),
+    ) -> None:
+        """
+        批量更新微博字段（可附带新增图片记录），单个事务提交。
+
+        Args:
+            updates: (微博ID, 字段字典) 序列
+            images: (微博ID, 图片URL) 序列
+        """
+        with self._transaction():
+            for weibo_id, fields in updates:
+                self.update_weibo_fields(weibo_id, fields)
+            self.save_images_bulk(images)
+
+    def compress_raw_json(self, batch_size: int = 500) -> int:
+        """
+        把旧版本写入的未压缩 raw_json 转为压缩格式（可重复执行，只处理 TEXT 行）。
+
+        Returns:
+            转换的行数
+        """
+        converted = 0
+        last_id = ""
+        while True:
+            rows = self._cursor().execute(
+                "SELECT id, raw_json FROM weibos WHERE id > ? AND typeof(raw_json) = 'text' "
+                "ORDER BY id LIMIT ?",
+                (last_id, int(batch_size)),
+            ).fetchall()
+            if not rows:
+                return converted
+            last_id = rows[-1]["id"]
+            updates = []
+            for row in rows:
+                packed = _pack_raw_json(row["raw_json"])
+                if isinstance(packed, bytes):
+                    updates.append((packed, row["id"]))
+            if updates:
+                with self._transaction():
+                    self._cursor().executemany("UPDATE weibos SET raw_json = ? WHERE id = ?", updates)
+                converted += len(updates)
     
     def get_all_weibos(self, order_by: str = "created_at DESC") -> List[Dict]:
         """
@@ -404,41 +663,73 @@ class Database:
         Returns:
             微博列表
         """
+        weibos = []
+        for row in self.iter_weibos(order_by=order_by, columns="*"):
+            w = dict(row)
+            w["raw_json"] = _unpack_raw_json(w["raw_json"])
+            weibos.append(w)
+        return weibos
+
+    def iter_weibos(
+        self,
+        order_by: str = "created_at DESC",
+        columns: str = "id, user_id, created_at, text",
+    ) -> Iterator[sqlite3.Row]:
+        """
+        逐行遍历微博（游标惰性读取，不一次性加载全部结果）
+
+        Args:
+            order_by: 排序方式
+            columns: 查询列，默认不含体积最大的 raw_json；需要全部列时传 "*"
+                （此时 raw_json 为库内原始值，可能是压缩后的 bytes）
+
+        Yields:
+            sqlite3.Row
+        """
+        # 独立游标：调用方边遍历边调用其他方法时不会互相干扰
         cursor = self.conn.cursor()
-        cursor.execute(f"SELECT * FROM weibos ORDER BY {order_by}")
-        return [dict(row) for row in cursor.fetchall()]
+        try:
+            cursor.execute(f"SELECT {columns} FROM weibos ORDER BY {order_by}")
+            yield from cursor
+        finally:
+            cursor.close()
     
     def get_weibo_images(self, weibo_id: str) -> List[Dict]:
         """获取指定微博的图片"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM images WHERE weibo_id = ?", (weibo_id,))
+        cursor = self._cursor()
+        cursor.execute(_SQL_WEIBO_IMAGES, (weibo_id,))
         return [dict(row) for row in cursor.fetchall()]
     
     def get_weibo_videos(self, weibo_id: str) -> List[Dict]:
         """获取指定微博的视频"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM videos WHERE weibo_id = ?", (weibo_id,))
+        cursor = self._cursor()
+        cursor.execute(_SQL_WEIBO_VIDEOS, (weibo_id,))
         return [dict(row) for row in cursor.fetchall()]
     
     def get_progress(self, key: str) -> Optional[str]:
-        """获取进度信息"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT value FROM progress WHERE key = ?", (key,))
-        row = cursor.fetchone()
-        return row['value'] if row else None
+        """获取进度信息（含尚未提交的暂存值）"""
+        pending = self._pending_progress.get(key)
+        if pending is not None:
+            return pending
+        row = self._scalar_cursor().execute(_SQL_GET_PROGRESS, (key,)).fetchone()
+        return row[0] if row else None
     
     def set_progress(self, key: str, value: str):
-        """设置进度信息"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO progress (key, value, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-        """, (key, value))
-        self.conn.commit()
+        """
+        设置进度信息：只在内存里记下最新值，随下一个写事务一起提交（不单独开事务，
+        也不会在两次调用之间持有写锁）；调用 flush() 强制落盘
+        """
+        self._pending_progress[key] = value
+
+    def flush(self) -> None:
+        """提交 set_progress 暂存的进度（阶段结束/关闭时调用）"""
+        if self._pending_progress:
+            with self._transaction():
+                pass
     
     def get_statistics(self) -> Dict[str, int]:
         """获取统计信息"""
-        cursor = self.conn.cursor()
+        cursor = self._cursor()
         
         stats = {}
         cursor.execute("SELECT COUNT(*) as count FROM weibos")
@@ -460,6 +751,7 @@ class Database:
     
     def close(self):
         """关闭数据库连接"""
+        self.flush()
         self.conn.close()
         logger.info("数据库连接已关闭")
 
@@ -0,0 +1,31 @@
+"""
+Cookie 过滤规则：域名判断与登录相关的 Cookie 名（WebEngine 与原生 WebView 两种登录对话框共用）
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+
+_WEIBO_SUFFIXES = ("weibo.cn", "weibo.com", "weibo.com.cn")
+
+# 与登录态相关的 Cookie 名；统计、CDN 之类的其它 Cookie 不需要保存
+_WEIBO_COOKIE_ALLOW = frozenset({
+    "SUB",
+    "SUBP",
+    "SCF",
+    "SSOLoginState",
+    "ALF",
+    "_T_WM",
+    "MLOGIN",
+    "XSRF-TOKEN",
+    "WEIBOCN_FROM",
+    "M_WEIBOCN_PARAMS",
+})
+
+# 至少要有这些 Cookie 才算登录成功
+_WEIBO_COOKIE_REQUIRED = ("SUB", "SUBP")
+
+
+@lru_cache(maxsize=64)
+def _domain_interesting(domain: str) -> bool:
+    """检查域名是否是微博相关"""
+    return bool(domain) and domain.lstrip(".").lower().endswith(_WEIBO_SUFFIXES)
@@ -0,0 +1,41 @@
+"""
+GUI 配置读写用的 JSON 小封装：优先 orjson（直接解析/输出 UTF-8 bytes），没装时退回标准库。
+输出格式与 json.dumps(ensure_ascii=False, indent=2) 一致。
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """缩进 2 空格、不转义中文的 UTF-8 bytes"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def dumps_line(obj: Any) -> str:
+    """单行、不转义中文的 str（用于日志里原样输出数据）"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False)
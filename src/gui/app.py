@@ -2,13 +2,6 @@ from __future__ import annotations
 
 import sys
 from datetime import datetime
-
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon
-from PySide6.QtWidgets import QApplication
-
-from .main_window import MainWindow
-from .style import apply_app_style
 from pathlib import Path
 
 
@@ -35,6 +28,13 @@ def main() -> int:
         print(f"Platform: {sys.platform}")
         print(f"Log file: {log_file}")
     
+    # PySide6 及主窗口模块体积很大：放到 main() 里导入，日志重定向完成后再加载
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QIcon
+    from PySide6.QtWidgets import QApplication
+
+    from .style import apply_app_style
+
     print("[APP] Starting application...")
     app = QApplication(sys.argv)
     print("[APP] QApplication created")
@@ -69,6 +69,8 @@ def main() -> int:
 
     print("[APP] Creating MainWindow...")
     try:
+        from .main_window import MainWindow
+
         win = MainWindow()
         print("[APP] MainWindow created")
     except Exception as e:
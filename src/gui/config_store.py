@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-import json
+import copy
+import os
+import re
+import stat
 import sys
-import shutil
+import tempfile
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from . import _json
 
 
 @dataclass
@@ -13,76 +19,185 @@ class AppPrefs:
     last_config_path: str = "config.json"
 
 
+@dataclass
+class _CachedFile:
+    mtime_ns: int
+    size: int
+    data: bytes
+    # 解析后的配置（只有 load_config/save_config 经手的文件才有）
+    cfg: Optional[Dict[str, Any]] = None
+
+
+# path -> 本进程最近一次读/写的文件内容（config.json、prefs 共用）：
+# 文件 mtime/size 未变时，读可直接复用解析结果，写时内容相同可跳过写盘
+_file_cache: Dict[Path, _CachedFile] = {}
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    先写同目录下的唯一临时文件并 fsync，再 os.replace 原子替换，避免崩溃后留下空的/写了一半的文件。
+    沿用原文件的权限位（config.json 里有 Cookie，用户可能设成 600）；新文件默认 0o600。
+    """
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        mode = 0o600
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _cache_is_fresh(path: Path, cached: Optional[_CachedFile]) -> bool:
+    if cached is None:
+        return False
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    return st.st_mtime_ns == cached.mtime_ns and st.st_size == cached.size
+
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """内容与缓存一致且文件未被外部修改时跳过写盘；返回是否真正写了文件"""
+    cached = _file_cache.get(path)
+    if cached is not None and cached.data == data and _cache_is_fresh(path, cached):
+        return False
+    _atomic_write(path, data)
+    st = path.stat()
+    _file_cache[path] = _CachedFile(st.st_mtime_ns, st.st_size, data)
+    return True
+
+
+def _home() -> str:
+    """用户主目录：直接读环境变量（与 Path.home() 的查找顺序一致），都没有时再退回 Path.home()"""
+    if sys.platform == "win32":
+        home = os.environ.get("USERPROFILE") or os.environ.get("HOME")
+    else:
+        home = os.environ.get("HOME")
+    return home or str(Path.home())
+
+
+@lru_cache(maxsize=None)
 def _prefs_path() -> Path:
     # Keep it dead-simple and dependency-free.
-    return Path.home() / ".weibo_backup_gui.json"
+    return Path(os.path.join(_home(), ".weibo_backup_gui.json"))
 
 
+@lru_cache(maxsize=None)
 def _get_user_config_dir() -> Path:
-    """获取用户配置目录（可写）"""
+    """获取用户配置目录（可写）；结果按进程缓存，目录只创建一次"""
     if sys.platform == "darwin":
-        config_dir = Path.home() / "Library" / "Application Support" / "WeiboLifeboat"
+        config_dir = os.path.join(_home(), "Library", "Application Support", "WeiboLifeboat")
     elif sys.platform == "win32":
-        config_dir = Path.home() / "AppData" / "Local" / "WeiboLifeboat"
+        config_dir = os.path.join(_home(), "AppData", "Local", "WeiboLifeboat")
     else:
-        config_dir = Path.home() / ".weibo-lifeboat"
+        config_dir = os.path.join(_home(), ".weibo-lifeboat")
     
-    config_dir.mkdir(parents=True, exist_ok=True)
-    return config_dir
+    os.makedirs(config_dir, exist_ok=True)
+    return Path(config_dir)
 
 
+@lru_cache(maxsize=None)
 def _get_user_data_dir() -> Path:
-    """获取用户数据目录（存放数据库、图片、视频等）"""
-    if sys.platform == "darwin":
-        # macOS: ~/Documents/WeiboLifeboat/
-        data_dir = Path.home() / "Documents" / "WeiboLifeboat"
-    elif sys.platform == "win32":
-        # Windows: %USERPROFILE%\Documents\WeiboLifeboat\
-        data_dir = Path.home() / "Documents" / "WeiboLifeboat"
-    else:
-        # Linux: ~/Documents/WeiboLifeboat/
-        data_dir = Path.home() / "Documents" / "WeiboLifeboat"
+    """获取用户数据目录（存放数据库、图片、视频等）；结果按进程缓存，目录只创建一次"""
+    # macOS: ~/Documents/WeiboLifeboat/
+    # Windows: %USERPROFILE%\Documents\WeiboLifeboat\
+    # Linux: ~/Documents/WeiboLifeboat/
+    data_dir = os.path.join(_home(), "Documents", "WeiboLifeboat")
     
-    data_dir.mkdir(parents=True, exist_ok=True)
-    return data_dir
+    os.makedirs(data_dir, exist_ok=True)
+    return Path(data_dir)
 
 
+@lru_cache(maxsize=None)
 def _get_default_config_path() -> Path:
     """获取默认配置文件路径（用户可写目录）"""
     return _get_user_config_dir() / "config.json"
 
 
+_STORAGE_KEYS = ("database_path", "images_dir", "videos_dir", "output_dir")
+
+# 直接在原始 bytes 上找出存储路径字段的值（不解析整个 JSON）
+_STORAGE_VALUE_RE = re.compile(
+    rb'"(?:database_path|images_dir|videos_dir|output_dir)"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+
+
+def _default_storage(data_dir: Path) -> Dict[str, str]:
+    """存储路径默认值：全部放在用户文档目录下"""
+    return {
+        "database_path": str(data_dir / "weibo.db"),
+        "images_dir": str(data_dir / "images"),
+        "videos_dir": str(data_dir / "videos"),
+        "output_dir": str(data_dir / "output"),
+    }
+
+
+def _needs_storage_rewrite(raw: bytes) -> Optional[Dict[str, Any]]:
+    """
+    判断已有配置的存储路径是否需要改写为文档目录（相对路径或旧的 data/ 目录）。
+    需要时返回解析好的配置，否则返回 None。
+    先用正则在原始 bytes 上预筛：所有路径都已是绝对路径（迁移过的配置）时完全不解析 JSON。
+    """
+    for m in _STORAGE_VALUE_RE.finditer(raw):
+        value = m.group(1).decode("utf-8", errors="replace")
+        if not os.path.isabs(value) or value.startswith("data/"):
+            break
+    else:
+        return None
+    config = _json.loads(raw)
+    storage = config.get("storage")
+    if not isinstance(storage, dict):
+        return None
+    for key in _STORAGE_KEYS:
+        if key in storage:
+            path = str(storage[key])
+            if not Path(path).is_absolute() or path.startswith("data/"):
+                return config
+    return None
+
+
 def _ensure_user_config_exists() -> Path:
-    """确保用户配置文件存在，如果不存在则从模板复制"""
+    """确保用户配置文件存在，如果不存在则从模板生成；每条路径最多读一次、写一次"""
     user_config = _get_default_config_path()
     data_dir = _get_user_data_dir()
-    
+
     if not user_config.exists():
-        # 创建新配置文件
-        # 尝试从打包的模板复制
+        # 尝试使用打包的模板
         if getattr(sys, 'frozen', False):
             # 打包后的路径
             template_path = Path(sys._MEIPASS) / "config.example.json"
         else:
             # 开发环境路径
             template_path = Path(__file__).resolve().parents[2] / "config.example.json"
-        
+
         if template_path.exists():
-            shutil.copy(template_path, user_config)
-            # 读取配置并更新存储路径为用户文档目录
+            raw = template_path.read_bytes()
             try:
-                config = json.loads(user_config.read_text(encoding="utf-8"))
-                # 更新存储路径为绝对路径
-                if "storage" not in config:
-                    config["storage"] = {}
-                config["storage"]["database_path"] = str(data_dir / "weibo.db")
-                config["storage"]["images_dir"] = str(data_dir / "images")
-                config["storage"]["videos_dir"] = str(data_dir / "videos")
-                config["storage"]["output_dir"] = str(data_dir / "output")
-                # 写回配置文件
-                user_config.write_text(json.dumps(config, ensure_ascii=False, indent=2), encoding="utf-8")
+                # 在内存里把存储路径改成文档目录下的绝对路径，再一次性写出
+                config = _json.loads(raw)
+                storage = config.get("storage")
+                if not isinstance(storage, dict):
+                    storage = config["storage"] = {}
+                storage.update(_default_storage(data_dir))
+                raw = _json.dumps(config)
             except Exception:
-                pass  # 如果更新失败，使用默认配置
+                pass  # 如果更新失败，原样使用模板
+            _atomic_write(user_config, raw)
         else:
             # 如果模板不存在，创建一个默认配置（使用文档目录）
             default_config = {
@@ -95,40 +210,22 @@ def _ensure_user_config_exists() -> Path:
                     "request_delay": 1.0,
                     "timeout": 30
                 },
-                "storage": {
-                    "database_path": str(data_dir / "weibo.db"),
-                    "images_dir": str(data_dir / "images"),
-                    "videos_dir": str(data_dir / "videos"),
-                    "output_dir": str(data_dir / "output")
-                }
+                "storage": _default_storage(data_dir),
             }
-            user_config.write_text(json.dumps(default_config, ensure_ascii=False, indent=2), encoding="utf-8")
+            _atomic_write(user_config, _json.dumps(default_config))
     else:
         # 配置文件已存在，检查并更新存储路径（如果是相对路径）
         try:
-            config = json.loads(user_config.read_text(encoding="utf-8"))
-            if "storage" in config:
-                needs_update = False
-                storage = config["storage"]
-                
-                # 检查路径是否需要更新（相对路径或旧的data/目录）
-                for key in ["database_path", "images_dir", "videos_dir", "output_dir"]:
-                    if key in storage:
-                        path = storage[key]
-                        # 如果是相对路径（如data/xxx），更新为文档目录
-                        if not Path(path).is_absolute() or path.startswith("data/"):
-                            needs_update = True
-                            break
-                
-                if needs_update:
-                    storage["database_path"] = str(data_dir / "weibo.db")
-                    storage["images_dir"] = str(data_dir / "images")
-                    storage["videos_dir"] = str(data_dir / "videos")
-                    storage["output_dir"] = str(data_dir / "output")
-                    user_config.write_text(json.dumps(config, ensure_ascii=False, indent=2), encoding="utf-8")
+            raw = user_config.read_bytes()
+            config = _needs_storage_rewrite(raw)
+            if config is not None:
+                config["storage"].update(_default_storage(data_dir))
+                data = _json.dumps(config)
+                if data != raw:
+                    _write_if_changed(user_config, data)
         except Exception:
             pass  # 如果更新失败，继续使用现有配置
-    
+
     return user_config
 
 
@@ -136,7 +233,7 @@ def load_prefs() -> AppPrefs:
     p = _prefs_path()
     try:
         if p.exists():
-            data = json.loads(p.read_text(encoding="utf-8"))
+            data = _json.loads(p.read_bytes())
             last_path = str(data.get("last_config_path") or "")
             # 如果是默认值或者旧的相对路径，使用新的用户配置目录
             if not last_path or last_path == "config.json":
@@ -152,40 +249,91 @@ def load_prefs() -> AppPrefs:
 def save_prefs(prefs: AppPrefs) -> None:
     p = _prefs_path()
     try:
-        p.write_text(json.dumps({"last_config_path": prefs.last_config_path}, ensure_ascii=False, indent=2), encoding="utf-8")
+        _write_if_changed(p, _json.dumps({"last_config_path": prefs.last_config_path}))
     except Exception:
         # best-effort
         return
 
 
 def load_config(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    cached = _file_cache.get(path)
+    if cached is None or cached.cfg is None or not _cache_is_fresh(path, cached):
+        st = path.stat()
+        data = path.read_bytes()
+        cached = _CachedFile(st.st_mtime_ns, st.st_size, data, _json.loads(data))
+        _file_cache[path] = cached
+    # 返回副本：调用方会直接修改返回的 dict
+    return copy.deepcopy(cached.cfg)
 
 
 def save_config(path: Path, cfg: Dict[str, Any]) -> None:
     # 确保目录存在
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
+    # 内容与磁盘上的一致（且文件未被外部修改）时不重写
+    if _write_if_changed(path, _json.dumps(cfg)):
+        _file_cache[path].cfg = copy.deepcopy(cfg)
+
 
+@lru_cache(maxsize=256)
+def _getter(keys: Tuple[str, ...]) -> Callable[[Dict[str, Any], Any], Any]:
+    """按 key 路径生成取值函数（每条路径只生成一次；GUI 里最常见的两层路径单独展开）"""
+    if len(keys) == 2:
+        k1, k2 = keys
 
-def get_nested(cfg: Dict[str, Any], keys: list[str], default: Any = None) -> Any:
-    cur: Any = cfg
-    for k in keys:
-        if not isinstance(cur, dict) or k not in cur:
+        def get2(cfg: Dict[str, Any], default: Any = None) -> Any:
+            sub = cfg.get(k1) if isinstance(cfg, dict) else None
+            if isinstance(sub, dict) and k2 in sub:
+                return sub[k2]
             return default
-        cur = cur[k]
-    return cur
 
+        return get2
+
+    def get(cfg: Dict[str, Any], default: Any = None) -> Any:
+        cur: Any = cfg
+        for k in keys:
+            if not isinstance(cur, dict) or k not in cur:
+                return default
+            cur = cur[k]
+        return cur
 
-def set_nested(cfg: Dict[str, Any], keys: list[str], value: Any) -> None:
-    cur: Any = cfg
-    for k in keys[:-1]:
-        nxt = cur.get(k)
-        if not isinstance(nxt, dict):
-            nxt = {}
-            cur[k] = nxt
-        cur = nxt
-    cur[keys[-1]] = value
+    return get
+
+
+@lru_cache(maxsize=256)
+def _setter(keys: Tuple[str, ...]) -> Callable[[Dict[str, Any], Any], None]:
+    """按 key 路径生成赋值函数（中间层不是 dict 时替换为空 dict）"""
+    if len(keys) == 2:
+        k1, k2 = keys
+
+        def set2(cfg: Dict[str, Any], value: Any) -> None:
+            sub = cfg.get(k1)
+            if not isinstance(sub, dict):
+                sub = cfg[k1] = {}
+            sub[k2] = value
+
+        return set2
+
+    parents, last = keys[:-1], keys[-1]
+
+    def set_(cfg: Dict[str, Any], value: Any) -> None:
+        cur: Any = cfg
+        for k in parents:
+            nxt = cur.get(k)
+            if not isinstance(nxt, dict):
+                nxt = {}
+                cur[k] = nxt
+            cur = nxt
+        cur[last] = value
+
+    return set_
+
+
+def get_nested(cfg: Dict[str, Any], keys: Sequence[str], default: Any = None) -> Any:
+    return _getter(tuple(keys))(cfg, default)
+
+
+def set_nested(cfg: Dict[str, Any], keys: Sequence[str], value: Any) -> None:
+    _setter(tuple(keys))(cfg, value)
 
 
 def safe_int(v: Any, default: int) -> int:
@@ -202,14 +350,17 @@ def safe_float(v: Any, default: float) -> float:
         return default
 
 
+_CONFIG_SECTIONS = ("weibo", "crawler", "storage")
+
+
 def ensure_config_shape(cfg: Dict[str, Any]) -> Dict[str, Any]:
     """
     Ensure minimal keys exist so the GUI can edit config safely.
     Doesn't try to validate semantics; just makes missing sections editable.
     """
-    cfg.setdefault("weibo", {})
-    cfg.setdefault("crawler", {})
-    cfg.setdefault("storage", {})
+    for section in _CONFIG_SECTIONS:
+        if not isinstance(cfg.get(section), dict):
+            cfg[section] = {}
     return cfg
 
 
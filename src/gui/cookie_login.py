@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from PySide6.QtCore import Qt, QTimer, QUrl, Signal
 from PySide6.QtGui import QIcon
@@ -17,17 +17,37 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from .shadow_container import create_shadow_button
+from ._domain import _WEIBO_COOKIE_ALLOW, _WEIBO_COOKIE_REQUIRED, _domain_interesting
+from .shadow_button import ShadowButton
 
-try:
-    from PySide6.QtWebEngineCore import QWebEngineProfile
-    from PySide6.QtWebEngineWidgets import QWebEngineView
+# QtWebEngine 体积很大（导入即加载 Chromium），推迟到第一次打开对话框时再导入
+_webengine: Optional[Tuple[Any, Any]] = None
 
-    _WEBENGINE_OK = True
-except Exception:
-    QWebEngineProfile = object  # type: ignore
-    QWebEngineView = object  # type: ignore
-    _WEBENGINE_OK = False
+
+def _load_webengine() -> Optional[Tuple[Any, Any]]:
+    """返回 (QWebEngineProfile, QWebEngineView)；不可用时返回 None（结果按进程缓存）"""
+    global _webengine
+    if _webengine is None:
+        try:
+            from PySide6.QtWebEngineCore import QWebEngineProfile
+            from PySide6.QtWebEngineWidgets import QWebEngineView
+
+            _webengine = (QWebEngineProfile, QWebEngineView)
+        except Exception:
+            _webengine = ()
+    return _webengine or None
+
+
+def __getattr__(name: str) -> Any:
+    # 兼容旧代码直接访问模块级的 QWebEngineProfile / QWebEngineView / _WEBENGINE_OK
+    if name == "_WEBENGINE_OK":
+        return _load_webengine() is not None
+    if name in ("QWebEngineProfile", "QWebEngineView"):
+        mods = _load_webengine()
+        if mods is None:
+            return object
+        return mods[0] if name == "QWebEngineProfile" else mods[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass(frozen=True)
@@ -36,37 +56,24 @@ class CapturedCookie:
     count: int
 
 
-def _cookie_key(c: QNetworkCookie) -> Tuple[str, str, str]:
-    # (domain, path, name)
-    try:
-        domain = (c.domain() or "").strip()
-    except Exception:
-        domain = ""
+def _cookie_entry(c: QNetworkCookie) -> Optional[Tuple[Tuple[str, str, str], str]]:
+    """
+    把 QNetworkCookie 一次性解码成 ((domain, path, name), value)；不是微博登录相关的 Cookie 返回 None。
+    domain 已转小写并去掉前导 "."，后续直接拿来做后缀判断。
+    """
     try:
+        # 先只解码名字：绝大多数 Cookie 在这里就被过滤掉
+        name = bytes(c.name()).decode("ascii", errors="ignore")
+        if name not in _WEIBO_COOKIE_ALLOW:
+            return None
+        domain = (c.domain() or "").strip().lower().lstrip(".")
+        if domain and not _domain_interesting(domain):
+            return None
         path = (c.path() or "").strip()
+        value = bytes(c.value()).decode("utf-8", errors="ignore")
     except Exception:
-        path = ""
-    try:
-        name = bytes(c.name()).decode("utf-8", errors="ignore")
-    except Exception:
-        name = ""
-    return (domain, path, name)
-
-
-def _cookie_str(c: QNetworkCookie) -> str:
-    try:
-        name = bytes(c.name()).decode("utf-8", errors="ignore")
-        val = bytes(c.value()).decode("utf-8", errors="ignore")
-        if not name:
-            return ""
-        return f"{name}={val}"
-    except Exception:
-        return ""
-
-
-def _domain_interesting(domain: str) -> bool:
-    d = (domain or "").lower().lstrip(".")
-    return d.endswith("weibo.cn") or d.endswith("weibo.com") or d.endswith("weibo.com.cn")
+        return None
+    return (domain, path, name), value
 
 
 class CookieLoginDialog(QDialog):
@@ -77,12 +84,15 @@ class CookieLoginDialog(QDialog):
         self.setWindowTitle("登录 Weibo 获取 Cookie")
         self.resize(980, 720)
 
-        if not _WEBENGINE_OK:
+        webengine = _load_webengine()
+        if webengine is None:
             QMessageBox.critical(self, "缺少 WebEngine", "当前环境未启用 QtWebEngine，无法使用内置登录。")
             self.reject()
             return
+        QWebEngineProfile, QWebEngineView = webengine
 
-        self._cookies: Dict[Tuple[str, str, str], QNetworkCookie] = {}
+        # (domain, path, name) -> value，均为已解码的 str
+        self._cookies: Dict[Tuple[str, str, str], str] = {}
         self._captured: Optional[CapturedCookie] = None
 
         # Dedicated profile to isolate and persist session across opens (convenient).
@@ -134,27 +144,24 @@ class CookieLoginDialog(QDialog):
         layout.addWidget(self.view, 1)
 
         bottom = QHBoxLayout()
-        capture_container, self.btn_capture = create_shadow_button("获取 Cookie")
+        self.btn_capture = ShadowButton("获取 Cookie")
         self.btn_capture.setObjectName("PrimaryButton")
         self.btn_capture.clicked.connect(self._capture_cookie)  # type: ignore[attr-defined]
 
-        cancel_container, self.btn_cancel = create_shadow_button("取消")
+        self.btn_cancel = ShadowButton("取消")
         self.btn_cancel.clicked.connect(self.reject)  # type: ignore[attr-defined]
 
         bottom.addStretch(1)
-        bottom.addWidget(cancel_container)
-        bottom.addWidget(capture_container)
+        bottom.addWidget(self.btn_cancel)
+        bottom.addWidget(self.btn_capture)
         layout.addLayout(bottom)
 
     def _on_cookie_added(self, c: QNetworkCookie) -> None:
-        try:
-            domain = (c.domain() or "").strip()
-        except Exception:
-            domain = ""
-        if domain and not _domain_interesting(domain):
+        entry = _cookie_entry(c)
+        if entry is None:
             return
-        key = _cookie_key(c)
-        self._cookies[key] = QNetworkCookie(c)
+        key, value = entry
+        self._cookies[key] = value
         self.lbl_status.setText(f"Cookie：{len(self._cookies)}")
 
     def _load_all_cookies(self) -> None:
@@ -169,36 +176,18 @@ class CookieLoginDialog(QDialog):
         QTimer.singleShot(350, self._finalize_capture)  # type: ignore[arg-type]
 
     def _finalize_capture(self) -> None:
-        items = list(self._cookies.values())
-        # Prefer weibo.cn cookies if available.
-        preferred = []
-        fallback = []
-        for c in items:
-            try:
-                d = (c.domain() or "").lower().lstrip(".")
-            except Exception:
-                d = ""
-            if d.endswith("weibo.cn"):
-                preferred.append(c)
-            else:
-                fallback.append(c)
-        chosen = preferred if preferred else fallback
-
-        parts = []
-        seen_names = set()
-        # Deduplicate by cookie name, keep the last-seen (often newest).
-        for c in chosen:
-            s = _cookie_str(c)
-            if not s:
-                continue
-            name = s.split("=", 1)[0]
-            if name in seen_names:
-                continue
-            seen_names.add(name)
-            parts.append(s)
-
+        # 只收集了登录相关的 Cookie，这里按名字去重即可：
+        # 同名时 weibo.cn 的优先（爬虫访问的是 weibo.cn），同优先级保留最后出现的（通常最新）
+        best: Dict[str, Tuple[int, str]] = {}
+        for (domain, _path, name), value in self._cookies.items():
+            prio = 1 if domain.endswith("weibo.cn") else 0
+            prev = best.get(name)
+            if prev is None or prio >= prev[0]:
+                best[name] = (prio, value)
+
+        parts = [f"{name}={value}" for name, (_prio, value) in best.items()]
         cookie = "; ".join(parts)
-        if not cookie or len(parts) < 2:
+        if not all(name in best for name in _WEIBO_COOKIE_REQUIRED):
             QMessageBox.information(
                 self,
                 "未获取到有效 Cookie",
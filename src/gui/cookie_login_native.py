@@ -1,16 +1,23 @@
 """
 原生 WebView Cookie 登录对话框 - 混合方案
 - macOS: 使用 PyObjC + WKWebView，真正嵌入到 Qt 对话框（+20MB）
-- Windows: 使用 QAxWidget + Edge WebView2（+5MB）
+- Windows: 优先使用 Edge WebView2（Chromium，经 pywebview 自带的 pythonnet 绑定嵌入），
+  不可用时退回 QAxWidget + WebBrowser ActiveX
 - Fallback: 回退到 QtWebEngine（如果可用）或手动配置
 """
 from __future__ import annotations
 
+import ctypes
+import os
+import re
 import sys
+import threading
+import traceback
 from dataclasses import dataclass
-from typing import Optional
+from types import SimpleNamespace
+from typing import Any, Optional
 
-from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtCore import QObject, Qt, QTimer, SIGNAL, Signal
 from PySide6.QtWidgets import (
     QDialog,
     QHBoxLayout,
@@ -20,7 +27,9 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from .shadow_container import create_shadow_button
+from .config_store import _get_user_config_dir
+from ._domain import _WEIBO_SUFFIXES
+from .shadow_button import ShadowButton
 
 
 @dataclass(frozen=True)
@@ -30,10 +39,126 @@ class CapturedCookie:
     user_id: str = ""  # 从URL中提取的用户ID
 
 
-def _domain_interesting(domain: str) -> bool:
-    """检查域名是否是微博相关"""
-    d = (domain or "").lower().lstrip(".")
-    return d.endswith("weibo.cn") or d.endswith("weibo.com") or d.endswith("weibo.com.cn")
+# 匹配微博用户主页URL
+# 格式: https://m.weibo.cn/u/1234567890 或 https://m.weibo.cn/profile/1234567890
+_USER_ID_RE = re.compile(r'/(?:u|profile)/(\d{10,})')
+
+# 设置环境变量 WEIBO_LIFEBOAT_DEBUG_COOKIE=1 时在日志里列出 Cookie 名（从不输出值）
+DEBUG_COOKIE = bool(os.environ.get("WEIBO_LIFEBOAT_DEBUG_COOKIE"))
+
+
+def _log_cookie_summary(prefix: str, cookies: dict) -> None:
+    """每次读取只输出一行汇总，而不是每个 Cookie 一行"""
+    if DEBUG_COOKIE:
+        print(f"{prefix} 共获取 {len(cookies)} 个微博相关Cookie: {sorted(cookies)}")
+    else:
+        print(f"{prefix} 共获取 {len(cookies)} 个微博相关Cookie")
+
+
+# 拼接 Cookie 字符串用的分隔符
+_COOKIE_SEP = "; "
+
+# document.cookie 的分隔符（"; "，兼容多余空白）
+_COOKIE_SPLIT_RE = re.compile(r'\s*;\s*')
+
+
+def _parse_cookie_string(cookie_str: str) -> dict:
+    """把 "a=1; b=2" 形式的 Cookie 字符串解析成 {name: value}（没有 "=" 的片段忽略）"""
+    return {
+        k: v
+        for k, sep, v in (p.partition('=') for p in _COOKIE_SPLIT_RE.split(cookie_str.strip()))
+        if sep and k
+    }
+
+
+# WKHTTPCookieStore 需要保留的 Cookie 域名后缀（含新浪通行证登录的 sina.com.cn）
+_MAC_COOKIE_SUFFIXES = _WEIBO_SUFFIXES + ("sina.com.cn",)
+
+# AppKit NSAutoresizingMaskOptions
+_NSViewWidthSizable = 2
+_NSViewHeightSizable = 16
+
+# Windows 原生模块（QAxContainer / pythonnet）首次创建 WebView 时导入，之后复用
+_QAxWidget: Any = None
+_webview2_modules: Optional[SimpleNamespace] = None
+# 所有登录对话框共用的 WKWebViewConfiguration（含 WKProcessPool），重复打开时不再重新构造
+_shared_config: Any = None
+
+
+# macOS 原生模块：本模块只在用户打开登录对话框时才被导入，PyObjC 直接在模块加载时导入一次
+_mac_modules: Optional[SimpleNamespace] = None
+_mac_import_error: Optional[BaseException] = None
+
+if sys.platform == "darwin":
+    try:
+        import objc
+        from Foundation import (
+            NSDate,
+            NSDefaultRunLoopMode,
+            NSMakeRect,
+            NSObject,
+            NSRunLoop,
+            NSThread,
+            NSURL,
+            NSURLRequest,
+        )
+        from WebKit import WKProcessPool, WKWebView, WKWebViewConfiguration
+        from objc import objc_object
+        from ctypes import c_void_p
+
+        class WeiboLifeboatCookieObserver(
+            NSObject, protocols=[objc.protocolNamed("WKHTTPCookieStoreObserver")]
+        ):
+            """Cookie Store 变化时回调 Python 侧的 callback（ObjC 类在进程内只能定义一次）"""
+
+            def cookiesDidChangeInCookieStore_(self, cookie_store):
+                callback = getattr(self, "callback", None)
+                if callback is not None:
+                    callback()
+
+        class WeiboLifeboatURLObserver(NSObject):
+            """WKWebView.URL 的 KVO 观察者：URL 变化时回调 callback(url)（包括单页应用的 pushState）"""
+
+            def observeValueForKeyPath_ofObject_change_context_(self, key_path, obj, change, context):
+                callback = getattr(self, "callback", None)
+                if callback is None:
+                    return
+                url = change.get("new") if change is not None else None  # NSKeyValueChangeNewKey
+                callback(str(url.absoluteString()) if hasattr(url, "absoluteString") else "")
+
+        _mac_modules = SimpleNamespace(
+            NSDate=NSDate,
+            NSDefaultRunLoopMode=NSDefaultRunLoopMode,
+            NSMakeRect=NSMakeRect,
+            NSRunLoop=NSRunLoop,
+            NSThread=NSThread,
+            NSURL=NSURL,
+            NSURLRequest=NSURLRequest,
+            WKProcessPool=WKProcessPool,
+            WKWebView=WKWebView,
+            WKWebViewConfiguration=WKWebViewConfiguration,
+            objc_object=objc_object,
+            c_void_p=c_void_p,
+            CookieObserver=WeiboLifeboatCookieObserver,
+            URLObserver=WeiboLifeboatURLObserver,
+        )
+    except Exception as e:  # PyObjC 未安装或框架不可用
+        _mac_import_error = e
+
+
+def _load_mac_modules() -> SimpleNamespace:
+    if _mac_modules is None:
+        raise ImportError(f"PyObjC 不可用: {_mac_import_error or sys.platform}")
+    return _mac_modules
+
+
+def _get_shared_config(mac: SimpleNamespace) -> Any:
+    global _shared_config
+    if _shared_config is None:
+        config = mac.WKWebViewConfiguration.alloc().init()
+        config.setProcessPool_(mac.WKProcessPool.alloc().init())
+        _shared_config = config
+    return _shared_config
 
 
 # ============================================================================
@@ -44,13 +169,20 @@ class MacOSWebViewWidget(QWidget):
     """macOS 原生 WKWebView 嵌入 Qt Widget"""
     
     url_changed = Signal(str)  # 发射URL变化信号
+    cookies_changed = Signal()  # Cookie Store 有变化
+    cookies_ready = Signal(object)  # request_cookies() 的结果：{name: value}
     
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.webview = None
         self.cookie_store = None
         self._init_success = False
-        self._navigation_delegate = None
+        self._url_observer = None
+        self._cookie_observer = None
+        self._cookie_request_seq = 0
+        # 最近一次读到的 Cookie；Cookie Store 通知变化时置空（_cookie_gen 用来识别读取期间发生的变化）
+        self._cookie_cache: Optional[dict] = None
+        self._cookie_gen = 0
         self._current_url = ""
         
         # 设置最小尺寸
@@ -61,149 +193,203 @@ class MacOSWebViewWidget(QWidget):
             self._init_success = True
         except Exception as e:
             print(f"[macOS WebView] 初始化失败: {e}")
-            import traceback
             traceback.print_exc()
+            # 撤掉已注册的监听；之后各公开方法按 _init_success 直接返回
+            self.shutdown()
+            self.webview = None
+            self.cookie_store = None
 
     def _init_webview(self):
         """初始化 WKWebView 并嵌入到 Qt"""
-        from Foundation import NSMakeRect, NSURL, NSURLRequest
-        from WebKit import WKWebView, WKWebViewConfiguration
-        from AppKit import NSView
-        from objc import objc_object
-        from ctypes import c_void_p
+        mac = _load_mac_modules()
         
-        # 1. 创建 WKWebView 配置
-        config = WKWebViewConfiguration.alloc().init()
+        # 1. 获取共享的 WKWebView 配置（WKWebView 初始化时会复制一份，可安全复用）
+        config = _get_shared_config(mac)
         self.cookie_store = config.websiteDataStore().httpCookieStore()
         
+        # 监听 Cookie 变化（代替定时轮询）；Cookie Store 只弱引用 observer，需自己持有
+        self._cookie_observer = mac.CookieObserver.alloc().init()
+        self._cookie_observer.callback = self._on_cookie_store_changed
+        self.cookie_store.addObserver_(self._cookie_observer)
+        
         # 2. 创建 WKWebView
-        frame = NSMakeRect(0, 0, 800, 600)
-        self.webview = WKWebView.alloc().initWithFrame_configuration_(frame, config)
+        frame = mac.NSMakeRect(0, 0, 800, 600)
+        self.webview = mac.WKWebView.alloc().initWithFrame_configuration_(frame, config)
         
-        # 3. 设置导航代理以监控URL变化
-        self._setup_navigation_delegate()
+        # 3. 通过 KVO 监控URL变化
+        self._setup_url_observer(mac)
         
         # 4. 获取 Qt Widget 的原生窗口
         window_id = int(self.winId())
         
         # 5. 将 WKWebView 添加到 Qt Widget
-        ns_view = objc_object(c_void_p=window_id)
+        ns_view = mac.objc_object(c_void_p=window_id)
         ns_view.addSubview_(self.webview)
         
+        # 铺满宿主视图并跟随其大小变化（由 AppKit 自动调整，拖动窗口时不经过 Python）
+        self.webview.setFrame_(ns_view.bounds())
+        self.webview.setAutoresizingMask_(_NSViewWidthSizable | _NSViewHeightSizable)
+        
         # 6. 加载微博登录页
-        url = NSURL.URLWithString_("https://m.weibo.cn")
-        request = NSURLRequest.requestWithURL_(url)
+        url = mac.NSURL.URLWithString_("https://m.weibo.cn")
+        request = mac.NSURLRequest.requestWithURL_(url)
         self.webview.loadRequest_(request)
         
-        # 7. 启动定时器监控URL变化（因为WKWebView的代理在PyObjC中不太好用）
-        from PySide6.QtCore import QTimer
-        self._url_timer = QTimer(self)
-        self._url_timer.timeout.connect(self._check_url_change)
-        self._url_timer.start(500)  # 每500ms检查一次
-        
         print("[macOS WebView] ✅ 初始化成功，WKWebView 已嵌入")
     
-    def _setup_navigation_delegate(self):
-        """设置导航代理（简化版，主要用定时器监控）"""
-        pass  # 使用定时器方案，更简单可靠
+    def _setup_url_observer(self, mac: SimpleNamespace):
+        """对 WKWebView 的 URL 属性做 KVO，URL 真正变化时才回调（代替定时轮询）"""
+        self._url_observer = mac.URLObserver.alloc().init()
+        self._url_observer.callback = self._on_url_observed
+        # options=1: NSKeyValueObservingOptionNew
+        self.webview.addObserver_forKeyPath_options_context_(self._url_observer, "URL", 1, None)
     
-    def _check_url_change(self):
-        """检查URL是否变化"""
-        if not self.webview:
+    def _on_url_observed(self, current_url: str):
+        """URL KVO 回调"""
+        if current_url and current_url != self._current_url:
+            self._current_url = current_url
+            print(f"[macOS WebView] URL变化: {current_url}")
+            self.url_changed.emit(current_url)
+
+    def reload(self):
+        """刷新页面"""
+        if not self._init_success:
             return
-        
         try:
-            current_url = str(self.webview.URL().absoluteString())
-            if current_url != self._current_url:
-                self._current_url = current_url
-                print(f"[macOS WebView] URL变化: {current_url}")
-                self.url_changed.emit(current_url)
-        except Exception as e:
-            pass  # URL获取失败时静默忽略
+            self.webview.reload()
+        except Exception:
+            pass
 
-    def resizeEvent(self, event):
-        """处理窗口大小变化"""
-        super().resizeEvent(event)
-        if self.webview:
+    def go_back(self):
+        """后退"""
+        if not self._init_success:
+            return
+        try:
+            self.webview.goBack()
+        except Exception:
+            pass
+
+    def go_forward(self):
+        """前进"""
+        if not self._init_success:
+            return
+        try:
+            self.webview.goForward()
+        except Exception:
+            pass
+
+    def _parse_cookies(self, all_cookies) -> dict:
+        """把 NSHTTPCookie 列表转成 {name: value}，只保留微博相关的 Cookie"""
+        cookies = {}
+        for cookie in all_cookies or []:
             try:
-                from Foundation import NSMakeRect
-                width = self.width()
-                height = self.height()
-                frame = NSMakeRect(0, 0, width, height)
-                self.webview.setFrame_(frame)
+                # properties() 一次拿到整个属性字典，比分别调 domain()/name()/value() 少两次桥接调用
+                props = cookie.properties()
+                domain = str(props.get("Domain") or "").lower()  # NSHTTPCookieDomain
+                
+                # 只保留微博相关的cookie（按域名后缀匹配，与 cookiesForURL_ 的规则一致）
+                if domain.endswith(_MAC_COOKIE_SUFFIXES):
+                    cookies[str(props.get("Name"))] = str(props.get("Value") or "")  # NSHTTPCookieName / Value
             except Exception as e:
-                print(f"[macOS WebView] 调整大小失败: {e}")
+                print(f"[macOS WebView] 解析Cookie失败: {e}")
+        _log_cookie_summary("[macOS WebView]", cookies)
+        return cookies
 
-    def reload(self):
-        """刷新页面"""
-        if self.webview:
-            try:
-                self.webview.reload()
-            except Exception:
-                pass
+    def _on_cookie_store_changed(self) -> None:
+        self._cookie_cache = None
+        self._cookie_gen += 1
+        self.cookies_changed.emit()
 
-    def go_back(self):
-        """后退"""
-        if self.webview:
+    def _store_cookie_cache(self, gen: int, cookies: dict) -> None:
+        # 读取期间 Cookie 又变了的话，结果可能已过时，不放进缓存
+        if gen == self._cookie_gen:
+            self._cookie_cache = cookies
+
+    def request_cookies(self) -> None:
+        """异步获取 Cookie：不阻塞 UI，结果通过 cookies_ready 信号返回（过期的请求结果会被丢弃）"""
+        if not self._init_success:
+            self.cookies_ready.emit({})
+            return
+        if self._cookie_cache is not None:
+            self.cookies_ready.emit(dict(self._cookie_cache))
+            return
+        self._cookie_request_seq += 1
+        seq = self._cookie_request_seq
+        gen = self._cookie_gen
+        
+        def completion_handler(all_cookies):
+            cookies = self._parse_cookies(all_cookies)
+            self._store_cookie_cache(gen, cookies)
+            if seq != self._cookie_request_seq:
+                return
+            self.cookies_ready.emit(dict(cookies))
+        
+        try:
+            self.cookie_store.getAllCookies_(completion_handler)
+        except Exception as e:
+            print(f"[macOS WebView] 获取 Cookie 失败: {e}")
+            self.cookies_ready.emit({})
+
+    def shutdown(self) -> None:
+        """移除 URL / Cookie 监听（对话框关闭时调用）"""
+        if self.webview is not None and self._url_observer is not None:
             try:
-                self.webview.goBack()
+                self.webview.removeObserver_forKeyPath_(self._url_observer, "URL")
             except Exception:
                 pass
-
-    def go_forward(self):
-        """前进"""
-        if self.webview:
+            self._url_observer.callback = None
+            self._url_observer = None
+        if self.cookie_store is not None and self._cookie_observer is not None:
             try:
-                self.webview.goForward()
+                self.cookie_store.removeObserver_(self._cookie_observer)
             except Exception:
                 pass
+            self._cookie_observer.callback = None
+            self._cookie_observer = None
 
     def get_cookies(self) -> dict:
-        """获取所有微博相关的 Cookie（使用原生Cookie Store，包括HttpOnly）"""
-        if not self.webview or not self.cookie_store:
+        """同步获取所有微博相关的 Cookie（使用原生Cookie Store，包括HttpOnly）"""
+        if not self._init_success:
             return {}
+        if self._cookie_cache is not None:
+            return dict(self._cookie_cache)
         
         cookies = {}
+        gen = self._cookie_gen
         
         try:
-            from Foundation import NSRunLoop, NSDate
+            mac = _load_mac_modules()
             
-            result_container = {'cookies': [], 'done': False}
+            result_container = {'cookies': []}
+            done = threading.Event()
             
             def completion_handler(all_cookies):
                 """Cookie获取完成回调"""
                 result_container['cookies'] = all_cookies or []
-                result_container['done'] = True
+                done.set()
             
             # 使用WKWebView的Cookie Store获取所有cookie（包括HttpOnly）
             self.cookie_store.getAllCookies_(completion_handler)
             
-            # 等待结果
-            import time
+            # 等待结果（最多 3 秒）
             timeout = 3.0
-            start = time.time()
-            while not result_container['done'] and (time.time() - start) < timeout:
-                NSRunLoop.currentRunLoop().runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(0.01))
+            if mac.NSThread.isMainThread():
+                # 回调投递在主队列上，主线程不能直接阻塞等待：
+                # 让 run loop 休眠到有事件源触发（通常就是这个回调）再检查，而不是每 10ms 空转一次
+                deadline = mac.NSDate.dateWithTimeIntervalSinceNow_(timeout)
+                run_loop = mac.NSRunLoop.currentRunLoop()
+                while not done.is_set() and deadline.timeIntervalSinceNow() > 0:
+                    run_loop.runMode_beforeDate_(mac.NSDefaultRunLoopMode, deadline)
+            else:
+                done.wait(timeout)
             
             # 解析Cookie对象
-            for cookie in result_container['cookies']:
-                try:
-                    domain = str(cookie.domain())
-                    name = str(cookie.name())
-                    value = str(cookie.value())
-                    
-                    # 只保留微博相关的cookie
-                    if 'weibo.cn' in domain or 'weibo.com' in domain or 'sina.com.cn' in domain:
-                        cookies[name] = value
-                        print(f"[macOS WebView] Cookie: {name}={'*' * min(8, len(value))}... (domain={domain})")
-                except Exception as e:
-                    print(f"[macOS WebView] 解析Cookie失败: {e}")
-            
-            print(f"[macOS WebView] 共获取 {len(cookies)} 个微博相关Cookie")
+            cookies = self._parse_cookies(result_container['cookies'])
+            if done.is_set():
+                self._store_cookie_cache(gen, cookies)
                 
         except Exception as e:
             print(f"[macOS WebView] 获取 Cookie 失败: {e}")
-            import traceback
             traceback.print_exc()
         
         return cookies
@@ -214,16 +400,19 @@ class MacOSWebViewWidget(QWidget):
 
 
 # ============================================================================
-# Windows 实现：QAxWidget + Edge
+# Windows 回退实现：QAxWidget + WebBrowser ActiveX
 # ============================================================================
 
 class WindowsWebViewWidget(QWidget):
-    """Windows Edge WebView2 嵌入 Qt Widget"""
+    """Windows WebBrowser ActiveX 嵌入 Qt Widget（WebView2 不可用时的回退方案）"""
+    
+    cookies_changed = Signal()  # 页面导航完成，Cookie 可能有变化
     
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.browser = None
         self._init_success = False
+        self._poll_timer = None
         
         self.setMinimumSize(800, 500)
         
@@ -232,56 +421,83 @@ class WindowsWebViewWidget(QWidget):
             self._init_success = True
         except Exception as e:
             print(f"[Windows WebView] 初始化失败: {e}")
+            self.shutdown()
 
     def _init_browser(self):
         """初始化 Edge WebView（通过 ActiveX）"""
-        try:
-            from PySide6.QtAxContainer import QAxWidget
-        except ImportError:
-            print("[Windows WebView] QAxContainer 不可用")
-            raise
+        global _QAxWidget
+        if _QAxWidget is None:
+            try:
+                from PySide6.QtAxContainer import QAxWidget
+            except ImportError:
+                print("[Windows WebView] QAxContainer 不可用")
+                raise
+            _QAxWidget = QAxWidget
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         
-        self.browser = QAxWidget(self)
+        self.browser = _QAxWidget(self)
         # 使用 WebBrowser ActiveX 控件
         self.browser.setControl("{8856F961-340A-11D0-A96B-00C04FD705A2}")
         layout.addWidget(self.browser)
         
         # 导航到微博
         self.browser.dynamicCall('Navigate(const QString&)', "https://m.weibo.cn")
+        
+        # 控件可用之后再挂 Cookie 变化通知（代替定时轮询）；事件挂不上时退回 2 秒轮询
+        try:
+            ok = QObject.connect(
+                self.browser, SIGNAL("NavigateComplete2(IDispatch*,QVariant&)"), self._on_navigate_complete
+            )
+            if ok is False:
+                raise RuntimeError("connect returned False")
+        except Exception as e:
+            print(f"[Windows WebView] 无法监听 NavigateComplete2，改为定时刷新: {e}")
+            self._poll_timer = QTimer(self)
+            self._poll_timer.timeout.connect(self.cookies_changed.emit)
+            self._poll_timer.start(2000)
+        
         print("[Windows WebView] ✅ 初始化成功")
 
+    def _on_navigate_complete(self, *args) -> None:
+        self.cookies_changed.emit()
+
+    def shutdown(self) -> None:
+        if self._poll_timer is not None:
+            self._poll_timer.stop()
+
     def reload(self):
         """刷新"""
-        if self.browser:
-            try:
-                self.browser.dynamicCall('Refresh()')
-            except Exception:
-                pass
+        if not self._init_success:
+            return
+        try:
+            self.browser.dynamicCall('Refresh()')
+        except Exception:
+            pass
 
     def go_back(self):
         """后退"""
-        if self.browser:
-            try:
-                self.browser.dynamicCall('GoBack()')
-            except Exception:
-                pass
+        if not self._init_success:
+            return
+        try:
+            self.browser.dynamicCall('GoBack()')
+        except Exception:
+            pass
 
     def go_forward(self):
         """前进"""
-        if self.browser:
-            try:
-                self.browser.dynamicCall('GoForward()')
-            except Exception:
-                pass
+        if not self._init_success:
+            return
+        try:
+            self.browser.dynamicCall('GoForward()')
+        except Exception:
+            pass
 
     def get_cookies(self) -> dict:
         """获取 Cookie（Windows 实现 - 通过 JavaScript）"""
-        if not self.browser:
+        if not self._init_success:
             return {}
-        
         cookies = {}
         
         try:
@@ -293,14 +509,9 @@ class WindowsWebViewWidget(QWidget):
                 cookie_str = document.dynamicCall('cookie()')
                 
                 if cookie_str:
-                    print(f"[Windows WebView] 获取到 Cookie: {cookie_str[:100]}...")
-                    
                     # 解析 Cookie
-                    for item in cookie_str.split(';'):
-                        item = item.strip()
-                        if '=' in item:
-                            name, value = item.split('=', 1)
-                            cookies[name.strip()] = value.strip()
+                    cookies = _parse_cookie_string(cookie_str)
+                    _log_cookie_summary("[Windows WebView]", cookies)
                 else:
                     print("[Windows WebView] Cookie 为空")
                     
@@ -310,7 +521,6 @@ class WindowsWebViewWidget(QWidget):
             # 方法2：备用方案 - 使用 WinINet API 读取 Cookie
             try:
                 import winreg
-                import os
                 
                 # 尝试从 IE Cookie 存储读取
                 # 这是一个简化实现，实际可能需要更复杂的逻辑
@@ -325,6 +535,191 @@ class WindowsWebViewWidget(QWidget):
         return self._init_success
 
 
+# ============================================================================
+# Windows 实现：Edge WebView2（Chromium）
+# ============================================================================
+
+# WebView2 直接读 Cookie 管理器（含 HttpOnly），需要按 URL 查询
+_WEBVIEW2_COOKIE_URLS = ("https://m.weibo.cn", "https://weibo.cn", "https://weibo.com")
+
+
+def _load_webview2_modules() -> SimpleNamespace:
+    """通过 pythonnet 加载 WebView2 WinForms 控件（程序集随 pywebview 分发）"""
+    global _webview2_modules
+    if _webview2_modules is None:
+        import clr  # pythonnet
+        import webview  # 只用来定位 pywebview 自带的 WebView2 程序集
+
+        lib_dir = os.path.join(os.path.dirname(webview.__file__), "lib")
+        clr.AddReference("System.Windows.Forms")
+        clr.AddReference("System.Drawing")
+        clr.AddReference(os.path.join(lib_dir, "Microsoft.Web.WebView2.Core"))
+        clr.AddReference(os.path.join(lib_dir, "Microsoft.Web.WebView2.WinForms"))
+
+        from System import Action, Uri
+        from System.Collections.Generic import List
+        from System.Threading.Tasks import Task
+        from Microsoft.Web.WebView2.Core import CoreWebView2Cookie
+        from Microsoft.Web.WebView2.WinForms import CoreWebView2CreationProperties, WebView2
+
+        _webview2_modules = SimpleNamespace(
+            Action=Action,
+            Uri=Uri,
+            List=List,
+            Task=Task,
+            CoreWebView2Cookie=CoreWebView2Cookie,
+            CoreWebView2CreationProperties=CoreWebView2CreationProperties,
+            WebView2=WebView2,
+        )
+    return _webview2_modules
+
+
+class WindowsWebView2Widget(QWidget):
+    """Windows Edge WebView2 嵌入 Qt Widget：直接读 CookieManager，不需要执行 JavaScript"""
+    
+    url_changed = Signal(str)  # 发射URL变化信号
+    cookies_changed = Signal()  # 页面导航完成，Cookie 可能有变化
+    cookies_ready = Signal(object)  # request_cookies() 的结果：{name: value}
+    
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.browser = None
+        self._init_success = False
+        self._cookies: dict = {}
+        self._cookie_request_seq = 0
+        
+        self.setMinimumSize(800, 500)
+        
+        try:
+            self._init_browser()
+            self._init_success = True
+        except Exception as e:
+            print(f"[WebView2] 初始化失败: {e}")
+
+    def _init_browser(self):
+        """创建 WebView2 WinForms 控件，并把它的窗口挂到本 Widget 的 HWND 下"""
+        wv2 = _load_webview2_modules()
+        self._wv2 = wv2
+        
+        browser = wv2.WebView2()
+        # 用户数据（含 Cookie）放在可写的配置目录，而不是程序目录
+        props = wv2.CoreWebView2CreationProperties()
+        props.UserDataFolder = str(_get_user_config_dir() / "WebView2")
+        browser.CreationProperties = props
+        browser.SourceChanged += self._on_source_changed
+        browser.NavigationCompleted += self._on_navigation_completed
+        
+        ctypes.windll.user32.SetParent(int(browser.Handle.ToInt64()), int(self.winId()))
+        self.browser = browser
+        self._fit_browser()
+        
+        # 设置 Source 会隐式初始化 CoreWebView2 并开始导航
+        browser.Source = wv2.Uri("https://m.weibo.cn")
+        print("[WebView2] ✅ 初始化成功")
+
+    def _fit_browser(self):
+        if self.browser is None:
+            return
+        # 子窗口使用物理像素
+        ratio = self.devicePixelRatioF()
+        ctypes.windll.user32.MoveWindow(
+            int(self.browser.Handle.ToInt64()), 0, 0,
+            int(self.width() * ratio), int(self.height() * ratio), True,
+        )
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._fit_browser()
+
+    def _on_source_changed(self, sender, args):
+        try:
+            self.url_changed.emit(str(self.browser.Source.AbsoluteUri))
+        except Exception:
+            pass
+
+    def _on_navigation_completed(self, sender, args):
+        self.cookies_changed.emit()
+
+    def request_cookies(self) -> None:
+        """异步读取 CookieManager，结果通过 cookies_ready 信号返回（过期的请求结果会被丢弃）"""
+        core = self.browser.CoreWebView2 if self.browser is not None else None
+        if core is None:
+            # CoreWebView2 尚未初始化完成
+            self.cookies_ready.emit(dict(self._cookies))
+            return
+        self._cookie_request_seq += 1
+        seq = self._cookie_request_seq
+        wv2 = self._wv2
+        urls = list(_WEBVIEW2_COOKIE_URLS)
+        cookies: dict = {}
+        
+        def on_done(task):
+            # 在线程池线程上回调：只做解析和发信号（跨线程信号由 Qt 排队投递到 UI 线程）
+            try:
+                for c in task.Result:
+                    cookies[str(c.Name)] = str(c.Value)
+            except Exception as e:
+                print(f"[WebView2] 获取 Cookie 失败: {e}")
+            if urls:
+                fetch(urls.pop(0))
+            elif seq == self._cookie_request_seq:
+                self._cookies = cookies
+                _log_cookie_summary("[WebView2]", cookies)
+                self.cookies_ready.emit(dict(cookies))
+        
+        def fetch(url: str):
+            core.CookieManager.GetCookiesAsync(url).ContinueWith(
+                wv2.Action[wv2.Task[wv2.List[wv2.CoreWebView2Cookie]]](on_done)
+            )
+        
+        try:
+            fetch(urls.pop(0))
+        except Exception as e:
+            print(f"[WebView2] 获取 Cookie 失败: {e}")
+            self.cookies_ready.emit(dict(self._cookies))
+
+    def get_cookies(self) -> dict:
+        """返回最近一次 request_cookies() 读到的 Cookie"""
+        return dict(self._cookies)
+
+    def shutdown(self) -> None:
+        if self.browser is not None:
+            try:
+                self.browser.SourceChanged -= self._on_source_changed
+                self.browser.NavigationCompleted -= self._on_navigation_completed
+                self.browser.Dispose()
+            except Exception:
+                pass
+            self.browser = None
+
+    def reload(self):
+        """刷新"""
+        if self.browser:
+            try:
+                self.browser.Reload()
+            except Exception:
+                pass
+
+    def go_back(self):
+        """后退"""
+        if self.browser:
+            try:
+                self.browser.GoBack()
+            except Exception:
+                pass
+
+    def go_forward(self):
+        """前进"""
+        if self.browser:
+            try:
+                self.browser.GoForward()
+            except Exception:
+                pass
+
+    def is_initialized(self) -> bool:
+        return self._init_success
+
+
 # ============================================================================
 # 主对话框：自动选择最佳实现
 # ============================================================================
@@ -343,6 +738,9 @@ class NativeCookieLoginDialog(QDialog):
         self.webview_widget = None
         self._platform = sys.platform
         self._extracted_user_id = ""  # 从URL中提取的用户ID
+        self._cookie_count = 0
+        self._capture_pending = False
+        self._tracks_login = False
 
         # 检查并创建对应平台的 WebView
         if not self._init_platform_webview():
@@ -358,13 +756,20 @@ class NativeCookieLoginDialog(QDialog):
         self._build_ui()
         
         # 连接URL变化信号
-        if hasattr(self.webview_widget, 'url_changed'):
+        self._tracks_login = hasattr(self.webview_widget, 'url_changed')
+        if self._tracks_login:
             self.webview_widget.url_changed.connect(self._on_url_changed)
         
-        # 启动定时器更新 Cookie 计数
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._update_cookie_count)
-        self._timer.start(2000)  # 每2秒更新
+        # Cookie 有变化时才刷新计数（不再定时轮询）
+        if hasattr(self.webview_widget, 'cookies_changed'):
+            self.webview_widget.cookies_changed.connect(
+                self._update_cookie_count, Qt.ConnectionType.QueuedConnection
+            )
+        if hasattr(self.webview_widget, 'cookies_ready'):
+            self.webview_widget.cookies_ready.connect(self._on_cookies_ready)
+        # 已有的持久化 Cookie 不会触发变化通知，打开时先取一次（不受登录判定限制：
+        # 持久化会话可能直接停在不带 /u/<id> 的页面上）
+        QTimer.singleShot(0, lambda: self._update_cookie_count(initial=True))
 
     def _init_platform_webview(self) -> bool:
         """根据平台初始化对应的 WebView"""
@@ -377,6 +782,15 @@ class NativeCookieLoginDialog(QDialog):
                 return False
         
         elif self._platform == "win32":  # Windows
+            # 优先 WebView2（Chromium 内核，可直接读 HttpOnly Cookie）
+            try:
+                widget = WindowsWebView2Widget(self)
+                if widget.is_initialized():
+                    self.webview_widget = widget
+                    return True
+                widget.deleteLater()
+            except Exception as e:
+                print(f"[Platform] WebView2 不可用，退回 WebBrowser 控件: {e}")
             try:
                 self.webview_widget = WindowsWebViewWidget(self)
                 return self.webview_widget.is_initialized()
@@ -407,47 +821,68 @@ class NativeCookieLoginDialog(QDialog):
         
         # 左侧：Cookie 计数
         self.lbl_status = QLabel("Cookie：0")
-        self.lbl_status.setStyleSheet("color: #666; font-size: 13px;")
+        self.lbl_status.setObjectName("CookieStatus")
         bottom.addWidget(self.lbl_status)
         
         bottom.addStretch(1)
         
         # 右侧：操作按钮
-        cancel_container, self.btn_cancel = create_shadow_button("取消")
+        self.btn_cancel = ShadowButton("取消")
         self.btn_cancel.clicked.connect(self.reject)
-        bottom.addWidget(cancel_container)
+        bottom.addWidget(self.btn_cancel)
         
-        capture_container, self.btn_capture = create_shadow_button("获取 Cookie")
+        self.btn_capture = ShadowButton("获取 Cookie")
         self.btn_capture.setObjectName("PrimaryButton")
         self.btn_capture.clicked.connect(self._capture_cookie)
-        bottom.addWidget(capture_container)
+        bottom.addWidget(self.btn_capture)
         
         layout.addLayout(bottom)
 
-    def _update_cookie_count(self):
+    def _update_cookie_count(self, initial: bool = False):
+        """重新获取 Cookie 计数（支持异步的平台结果在 _on_cookies_ready 中处理）
+
+        initial 为 True 时是打开对话框后的首次读取，用于显示已持久化的 Cookie。
+        """
+        if not self.webview_widget:
+            return
+        # 能从URL识别登录状态的平台：还没拿到用户ID（未登录）时不去读 Cookie
+        if self._tracks_login and not self._extracted_user_id and not initial:
+            self.lbl_status.setText("Cookie：未登录")
+            return
+        if hasattr(self.webview_widget, 'request_cookies'):
+            self.webview_widget.request_cookies()
+            return
+        try:
+            self._cookie_count = len(self.webview_widget.get_cookies())
+        except Exception:
+            return
+        self._refresh_status()
+
+    def _refresh_status(self):
         """更新 Cookie 计数和用户ID显示"""
-        if self.webview_widget:
-            try:
-                cookies = self.webview_widget.get_cookies()
-                status_text = f"Cookie：{len(cookies)}"
-                if self._extracted_user_id:
-                    status_text += f" | 用户ID：{self._extracted_user_id}"
-                self.lbl_status.setText(status_text)
-            except Exception:
-                pass
+        status_text = f"Cookie：{self._cookie_count}"
+        if self._extracted_user_id:
+            status_text += f" | 用户ID：{self._extracted_user_id}"
+        self.lbl_status.setText(status_text)
+
+    def _on_cookies_ready(self, cookies: dict):
+        self._cookie_count = len(cookies)
+        self._refresh_status()
+        if self._capture_pending:
+            self._capture_pending = False
+            self._finish_capture(cookies)
     
     def _on_url_changed(self, url: str):
-        """处理URL变化，提取用户ID"""
-        import re
-        # 匹配微博用户主页URL
-        # 格式: https://m.weibo.cn/u/1234567890 或 https://m.weibo.cn/profile/1234567890
-        match = re.search(r'/(?:u|profile)/(\d{10,})', url)
+        """处理URL变化：提取用户ID，并顺带刷新 Cookie 计数（导航往往伴随 Cookie 变化）"""
+        if 'weibo' not in url:
+            return
+        match = _USER_ID_RE.search(url)
         if match:
             user_id = match.group(1)
             if user_id != self._extracted_user_id:
                 self._extracted_user_id = user_id
                 print(f"[Cookie Login] ✅ 从URL提取到用户ID: {user_id}")
-                self._update_cookie_count()  # 更新状态显示
+        self._update_cookie_count()  # 更新状态显示
 
     def _capture_cookie(self) -> None:
         """捕获 Cookie"""
@@ -455,25 +890,37 @@ class NativeCookieLoginDialog(QDialog):
             QMessageBox.warning(self, "错误", "WebView 未初始化")
             return
 
+        if hasattr(self.webview_widget, 'request_cookies'):
+            self._capture_pending = True
+            self.webview_widget.request_cookies()
+            return
         try:
             cookies = self.webview_widget.get_cookies()
-            
-            if not cookies or len(cookies) < 2:
+        except Exception as e:
+            QMessageBox.warning(self, "错误", f"获取 Cookie 失败：{e}")
+            return
+        self._finish_capture(cookies)
+
+    def _finish_capture(self, cookies: dict) -> None:
+        """根据拿到的 Cookie 完成捕获"""
+        try:
+            count = len(cookies) if cookies else 0
+            if count < 2:
                 QMessageBox.information(
                     self,
                     "未获取到有效 Cookie",
-                    f"暂未收集到足够的 Cookie（当前：{len(cookies)}个）。\n"
+                    f"暂未收集到足够的 Cookie（当前：{count}个）。\n"
                     "请确认已登录成功后再试。",
                 )
                 return
 
             # 格式化 Cookie 字符串
-            cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()])
+            cookie_str = _COOKIE_SEP.join(f"{k}={v}" for k, v in cookies.items())
             
             # 包含从URL提取的用户ID
             self._captured = CapturedCookie(
                 cookie=cookie_str, 
-                count=len(cookies),
+                count=count,
                 user_id=self._extracted_user_id
             )
             self.cookie_captured.emit(self._captured)
@@ -483,11 +930,11 @@ class NativeCookieLoginDialog(QDialog):
         except Exception as e:
             QMessageBox.warning(self, "错误", f"获取 Cookie 失败：{e}")
 
-    def closeEvent(self, event):
-        """窗口关闭事件"""
-        if hasattr(self, '_timer') and self._timer:
-            self._timer.stop()
-        event.accept()
+    def done(self, result):
+        """关闭对话框（accept/reject/关闭窗口都会走到这里）时停止 Cookie 监听"""
+        if self.webview_widget is not None and hasattr(self.webview_widget, 'shutdown'):
+            self.webview_widget.shutdown()
+        super().done(result)
 
 
 # 向后兼容
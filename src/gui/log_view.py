@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Iterable, List
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtWidgets import QAbstractItemView, QApplication, QListView
+
+
+class LogModel(QAbstractListModel):
+    """
+    日志行模型：deque(maxlen) 环形缓冲，追加 O(1)，超出上限时丢弃最旧的行。
+    每批追加只发一次 beginInsertRows/endInsertRows。
+    """
+
+    def __init__(self, max_lines: int, parent=None):
+        super().__init__(parent)
+        self._max_lines = max_lines
+        self._lines: Deque[str] = deque(maxlen=max_lines)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        return self._lines[index.row()]
+
+    def append_many(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        if len(lines) > self._max_lines:
+            lines = lines[-self._max_lines:]
+        overflow = len(self._lines) + len(lines) - self._max_lines
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._lines.popleft()
+            self.endRemoveRows()
+        start = len(self._lines)
+        self.beginInsertRows(QModelIndex(), start, start + len(lines) - 1)
+        self._lines.extend(lines)
+        self.endInsertRows()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._lines.clear()
+        self.endResetModel()
+
+    def lines(self, rows: Iterable[int]) -> List[str]:
+        return [self._lines[r] for r in rows]
+
+
+class LogView(QListView):
+    """
+    只读日志视图：只绘制可见行，行数由 LogModel 封顶。
+    已滚动到底部时追加后自动跟随；支持多选后 Ctrl/Cmd+C 复制（便于贴日志诊断）。
+    """
+
+    def __init__(self, max_lines: int, parent=None):
+        super().__init__(parent)
+        self._model = LogModel(max_lines, self)
+        self.setModel(self._model)
+        self.setUniformItemSizes(True)
+        self.setWordWrap(False)
+        self.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+
+        act_copy = QAction(self)
+        act_copy.setShortcut(QKeySequence.StandardKey.Copy)
+        act_copy.setShortcutContext(Qt.ShortcutContext.WidgetShortcut)
+        act_copy.triggered.connect(self.copy_selection)  # type: ignore[attr-defined]
+        self.addAction(act_copy)
+
+    def append_lines(self, lines: List[str]) -> None:
+        bar = self.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum()
+        self._model.append_many(lines)
+        if at_bottom:
+            self.scrollToBottom()
+
+    def clear(self) -> None:
+        self._model.clear()
+
+    def copy_selection(self) -> None:
+        rows = sorted(idx.row() for idx in self.selectionModel().selectedRows())
+        if rows:
+            QApplication.clipboard().setText("\n".join(self._model.lines(rows)))
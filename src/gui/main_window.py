@@ -1,33 +1,32 @@
 from __future__ import annotations
 
-import json
+import base64
+import hashlib
+import re
+import sys
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple
 
-from PySide6.QtCore import Qt, QTimer, QUrl, QThread, Signal
+from PySide6.QtCore import QModelIndex, QStringListModel, Qt, QTimer, QUrl, QThread, Signal
 from PySide6.QtGui import QAction, QColor, QDesktopServices, QFont, QPalette
 from PySide6.QtWidgets import (
     QApplication,
-    QDateEdit,
     QDialog,
-    QFileDialog,
     QFormLayout,
     QFrame,
     QHBoxLayout,
     QLabel,
+    QAbstractItemView,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMainWindow,
     QMessageBox,
     QPushButton,
     QCheckBox,
-    QPlainTextEdit,
     QProgressBar,
     QScrollArea,
-    QSpinBox,
-    QDoubleSpinBox,
     QStackedWidget,
     QToolBar,
     QToolButton,
@@ -35,6 +34,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from . import _json
 from .config_store import (
     AppPrefs,
     ensure_config_shape,
@@ -47,10 +47,80 @@ from .config_store import (
     safe_int,
     set_nested,
     _ensure_user_config_exists,
+    _get_user_data_dir,
 )
-from .pipeline_process import PipelineLaunchSpec, PipelineProcess
-from .sidebar_delegate import SidebarItemDelegate
-from .shadow_container import create_shadow_button
+from .log_view import LogView
+from .shadow_button import ShadowButton
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    import httpx
+
+    from .pipeline_process import PipelineProcess
+
+
+# SUB 解码后的长数字串（用户 ID 通常 10 位以上）/ MLOGIN 里的 uid=...
+_RE_UID_DIGITS = re.compile(r'\d{10,}')
+_RE_MLOGIN_UID = re.compile(r'uid[=:](\d+)', re.IGNORECASE)
+# 个人主页跳转后的 URL（/u/<uid> 或 /profile/<uid>）/ 页面内嵌 JSON 里的 "uid": <uid>
+_RE_UID_URL = re.compile(r'/(?:u|profile)/(\d+)')
+_RE_UID_JSON = re.compile(r'"uid"\s*:\s*(\d+)')
+# 登录态 Cookie：一个都没有时 API 必然返回未登录，不必发请求
+_LOGIN_COOKIE_KEYS = frozenset({'SUB', 'SSOLoginState', 'SCF'})
+# 探测用户 ID 的请求参数（只读，按请求合并出新的 headers）
+_DEFAULT_UA = 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15'
+_HEADERS_BASE = {'Referer': 'https://m.weibo.cn/'}
+_CONTAINER_PARAMS = {'containerid': '100103type=1'}
+# Cookie 预览：换行替换成空格，最多显示前 N 个字符
+_COOKIE_PREVIEW_TR = str.maketrans({'\n': ' ', '\r': ' '})
+_COOKIE_PREVIEW_LEN = 120
+
+_title_font: Optional[QFont] = None
+
+
+def _get_title_font() -> QFont:
+    """对话框标题字体：首次调用时创建（需在 QApplication 之后），之后复用同一个实例"""
+    global _title_font
+    if _title_font is None:
+        _title_font = QFont()
+        _title_font.setPointSize(15)
+        _title_font.setBold(True)
+    return _title_font
+
+
+# (objc 运行时, NSColor 类, window / colorWithRed:green:blue:alpha: / setBackgroundColor: 的 selector)
+_objc_runtime: Optional[Tuple[Any, int, int, int, int]] = None
+
+
+def _get_objc_runtime() -> Tuple[Any, int, int, int, int]:
+    """macOS：首次调用时加载 Objective-C 运行时并注册用到的 selector，之后复用"""
+    global _objc_runtime
+    if _objc_runtime is None:
+        import ctypes
+        import ctypes.util
+
+        objc = ctypes.cdll.LoadLibrary(ctypes.util.find_library("objc"))
+        objc.objc_getClass.restype = ctypes.c_void_p
+        objc.sel_registerName.restype = ctypes.c_void_p
+        objc.objc_msgSend.restype = ctypes.c_void_p
+        _objc_runtime = (
+            objc,
+            objc.objc_getClass(b"NSColor"),
+            objc.sel_registerName(b"window"),
+            objc.sel_registerName(b"colorWithRed:green:blue:alpha:"),
+            objc.sel_registerName(b"setBackgroundColor:"),
+        )
+    return _objc_runtime
+
+
+def _make_hint_label(text: str, *, word_wrap: bool = False) -> QLabel:
+    """灰色说明文字（样式由 QSS 的 #CardHint 决定）"""
+    label = QLabel(text)
+    label.setObjectName("CardHint")
+    if word_wrap:
+        label.setWordWrap(True)
+    return label
 
 
 class CustomMessageDialog(QDialog):
@@ -80,10 +150,7 @@ class CustomMessageDialog(QDialog):
         
         # 标题
         title = QLabel(self._title)
-        title_font = QFont()
-        title_font.setPointSize(15)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title.setFont(_get_title_font())
         layout.addWidget(title)
         
         # 消息内容
@@ -98,17 +165,19 @@ class CustomMessageDialog(QDialog):
         button_layout.addStretch(1)
         
         for idx, (text, obj_name) in enumerate(self._buttons):
-            container, btn = create_shadow_button(text)
+            btn = ShadowButton(text)
             if obj_name:
                 btn.setObjectName(obj_name)
-            # 使用 lambda 捕获索引值
-            btn.clicked.connect(lambda checked=False, i=idx: self._on_button_clicked(i))  # type: ignore[attr-defined]
-            button_layout.addWidget(container)
+            # 索引存在按钮属性上，所有按钮共用一个槽，不再为每个按钮生成闭包
+            btn.setProperty("btn_index", idx)
+            btn.clicked.connect(self._on_button_clicked)  # type: ignore[attr-defined]
+            button_layout.addWidget(btn)
         
         layout.addLayout(button_layout)
     
-    def _on_button_clicked(self, index: int) -> None:
-        self._result = index
+    def _on_button_clicked(self) -> None:
+        btn = self.sender()
+        self._result = int(btn.property("btn_index") or 0) if btn is not None else 0
         self.accept()
     
     def get_result(self) -> int:
@@ -116,7 +185,11 @@ class CustomMessageDialog(QDialog):
         return self._result
 
 
-@dataclass
+# dataclass(slots=True) 需要 Python 3.10+；3.9 上退回普通实例字典
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(eq=False, repr=False, **_DATACLASS_SLOTS)
 class UiState:
     current_phase: str = ""
     list_page: int = 0
@@ -129,37 +202,267 @@ class UiState:
     media_videos_total: int = 0
 
 
+# ---------------------------
+# Pipeline 事件 -> 友好中文日志（每种事件一个格式化函数，_EVENT_FORMATTERS 按事件名分派）
+# 返回空字符串表示该事件不输出日志
+# ---------------------------
+_PHASE_DISPLAY: Dict[str, str] = {
+    "list": "列表抓取",
+    "detail": "详情抓取",
+    "media": "媒体下载",
+    "html": "HTML生成",
+}
+# 反爬只会出现在需要请求微博的阶段，HTML 阶段沿用原始名称
+_ANTIBOT_PHASE_DISPLAY: Dict[str, str] = {k: v for k, v in _PHASE_DISPLAY.items() if k != "html"}
+
+
+def _fmt_run_started(data: Dict[str, Any]) -> str:
+    phases = ", ".join(data.get("phases", []))
+    return f"📋 开始备份任务 [{phases}]"
+
+
+def _fmt_run_completed(data: Dict[str, Any]) -> str:
+    return "✅ 备份任务完成！"
+
+
+def _fmt_phase_started(data: Dict[str, Any]) -> str:
+    phase = data.get("phase", "")
+    phase_name = _PHASE_DISPLAY.get(phase, phase)
+    return f"▶️  开始阶段：{phase_name}"
+
+
+def _fmt_phase_completed(data: Dict[str, Any]) -> str:
+    phase = data.get("phase", "")
+    return f"✓ 完成阶段：{phase}"
+
+
+def _fmt_list_started(data: Dict[str, Any]) -> str:
+    return f"🔍 开始抓取微博列表（从第{data.get('start_page', 1)}页开始）"
+
+
+def _fmt_list_page(data: Dict[str, Any]) -> str:
+    page = data.get("page", 0)
+    new_count = data.get("new_count", 0)
+    new_total = data.get("new_total", 0)
+    # 每5页显示一次，避免刷屏
+    if page % 5 == 0 or page == 1:
+        return f"   第{page}页：新增 {new_count} 条，累计 {new_total} 条"
+    return ""  # 其他页不显示
+
+
+def _fmt_list_completed(data: Dict[str, Any]) -> str:
+    total = data.get("new_total", 0)
+    last_page = data.get("last_page", 0)
+    return f"✓ 列表抓取完成：共 {last_page} 页，{total} 条微博"
+
+
+def _fmt_list_stopped(data: Dict[str, Any]) -> str:
+    reason = data.get("reason", "")
+    if reason == "no_data":
+        return "⚠️  列表抓取停止：未获取到数据"
+    return f"⚠️  列表抓取停止：{reason}"
+
+
+def _fmt_detail_batch_started(data: Dict[str, Any]) -> str:
+    batch = data.get("batch", 0)
+    total = data.get("total", 0)
+    return f"   批次 {batch}：准备抓取 {total} 条详情"
+
+
+def _fmt_detail_batch_progress(data: Dict[str, Any]) -> str:
+    done = data.get("done", 0)
+    total = data.get("total", 0)
+    return f"   进度：{done}/{total} ({done*100//total if total>0 else 0}%)"
+
+
+def _fmt_detail_completed(data: Dict[str, Any]) -> str:
+    total = data.get("total_done", 0)
+    batches = data.get("batches", 0)
+    return f"✓ 详情抓取完成：{batches} 个批次，共 {total} 条"
+
+
+def _fmt_detail_stopped(data: Dict[str, Any]) -> str:
+    reason = data.get("reason", "")
+    if reason == "antibot_max_cooldowns":
+        return "⚠️  详情抓取停止：触发反爬虫次数过多，已自动停止"
+    elif reason == "zero_success":
+        return "⚠️  详情抓取停止：本批次无成功更新"
+    return f"⚠️  详情抓取停止：{reason}"
+
+
+def _fmt_antibot_triggered(data: Dict[str, Any]) -> str:
+    phase = data.get("phase", "")
+    phase_name = _ANTIBOT_PHASE_DISPLAY.get(phase, phase)
+    cooldowns = data.get("cooldowns", 0)
+    max_cooldowns = data.get("max_cooldowns", 3)
+    cooldown_seconds = data.get("cooldown_seconds", 1800)
+    cooldown_minutes = cooldown_seconds // 60
+    
+    return (f"⚠️  触发反爬虫机制（{phase_name}）\n"
+           f"   将等待 {cooldown_minutes} 分钟后自动继续... "
+           f"({cooldowns}/{max_cooldowns} 次)")
+
+
+def _fmt_media_images_progress(data: Dict[str, Any]) -> str:
+    done = data.get("done", 0)
+    total = data.get("total", 0)
+    return f"   图片：{done}/{total} ({done*100//total if total>0 else 0}%)"
+
+
+def _fmt_media_images_completed(data: Dict[str, Any]) -> str:
+    total = data.get("total", 0)
+    return f"✓ 图片下载完成：共 {total} 张"
+
+
+def _fmt_media_videos_progress(data: Dict[str, Any]) -> str:
+    done = data.get("done", 0)
+    total = data.get("total", 0)
+    return f"   视频：{done}/{total} ({done*100//total if total>0 else 0}%)"
+
+
+def _fmt_media_videos_completed(data: Dict[str, Any]) -> str:
+    total = data.get("total", 0)
+    return f"✓ 视频下载完成：共 {total} 个"
+
+
+def _fmt_html_generated(data: Dict[str, Any]) -> str:
+    # HTML生成（通常很快，只显示关键信息）
+    return "✓ HTML页面生成完成"
+
+
+# 计数类事件 -> ((UiState 字段, 事件 data 键), ...)，_on_event 按表更新状态
+_EVENT_STATE_FIELDS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "list_page": (("list_page", "page"), ("list_new_total", "new_total")),
+    "detail_batch_progress": (("detail_done", "done"), ("detail_total", "total")),
+    "media_images_progress": (("media_images_done", "done"), ("media_images_total", "total")),
+    "media_videos_progress": (("media_videos_done", "done"), ("media_videos_total", "total")),
+}
+
+
+def _as_int(v: Any) -> int:
+    # JSON 解出的计数本来就是 int，只有异常值才走转换
+    return v if type(v) is int else int(v or 0)
+
+
+# 进度类事件每前进多少条才输出一次日志（另外完成时总会输出）；未到步长的事件在 _on_event 里直接跳过格式化
+_PROGRESS_LOG_STEPS: Dict[str, int] = {
+    "detail_batch_progress": 20,
+    "media_images_progress": 10,
+    "media_videos_progress": 5,
+}
+
+_EVENT_FORMATTERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    # 运行级别事件
+    "run_started": _fmt_run_started,
+    "run_completed": _fmt_run_completed,
+    # 阶段事件
+    "phase_started": _fmt_phase_started,
+    "phase_completed": _fmt_phase_completed,
+    # 列表抓取事件
+    "list_started": _fmt_list_started,
+    "list_page": _fmt_list_page,
+    "list_completed": _fmt_list_completed,
+    "list_stopped": _fmt_list_stopped,
+    # 详情抓取事件
+    "detail_batch_started": _fmt_detail_batch_started,
+    "detail_batch_progress": _fmt_detail_batch_progress,
+    "detail_completed": _fmt_detail_completed,
+    "detail_stopped": _fmt_detail_stopped,
+    # 反爬虫事件
+    "antibot_triggered": _fmt_antibot_triggered,
+    # 媒体下载事件
+    "media_images_progress": _fmt_media_images_progress,
+    "media_images_completed": _fmt_media_images_completed,
+    "media_videos_progress": _fmt_media_videos_progress,
+    "media_videos_completed": _fmt_media_videos_completed,
+    "html_generated": _fmt_html_generated,
+}
+
+
+# 日志视图最多保留的行数（也是待刷新缓冲区的条数上限）
+LOG_MAX_LINES = 15000
+# 日志合并刷新间隔：每批交给 LogView.append_lines，一次 beginInsertRows 插入整批，避免逐行插入/重绘
+LOG_FLUSH_INTERVAL_MS = 50
+# 进度刷新合并间隔（约一帧）：事件再密集，进度条每帧最多重绘一次
+PROGRESS_RENDER_INTERVAL_MS = 16
+# 设置页各卡片表单左列标签宽度（保持各卡片对齐）
+FORM_LABEL_WIDTH = 160
+# 通过 API 探测到的用户 ID 最多缓存多少个 Cookie
+UID_CACHE_MAX = 16
+
+
 class MainWindow(QMainWindow):
+    _SETTINGS_PAGE = 1
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("微博逃生舱 · Weibo Lifeboat")
         self.resize(1100, 720)
-        
-        # Set window background to match app background (helps macOS title bar color)
-        palette = self.palette()
-        palette.setColor(QPalette.ColorRole.Window, QColor("#ECECEC"))
-        self.setPalette(palette)
+        # 窗口背景色与 macOS 标题栏颜色在第一次 showEvent 时设置（见 showEvent）
+        self._window_chrome_ready = False
 
         # 确保用户配置文件存在
         _ensure_user_config_exists()
         
         self._prefs: AppPrefs = load_prefs()
         self._config_path: Path = Path(self._prefs.last_config_path).expanduser()
+        self._user_data_dir: Path = _get_user_data_dir()
         self._config: Dict[str, Any] = {}
         self._state = UiState()
-
-        self._pipeline = PipelineProcess()
-        self._pipeline.started.connect(self._on_pipeline_started)  # type: ignore[attr-defined]
-        self._pipeline.finished.connect(self._on_pipeline_finished)  # type: ignore[attr-defined]
-        self._pipeline.log_line.connect(self._append_log)  # type: ignore[attr-defined]
-        self._pipeline.event.connect(self._on_event)  # type: ignore[attr-defined]
+        # 进度类事件名 -> 上次输出日志时的 done（见 _should_log_progress）
+        self._progress_logged: Dict[str, int] = {}
+        # 上次在文件对话框里选中的目录，下次打开对话框直接从这里开始
+        self._last_dialog_dir: Optional[str] = None
+
+        self._log_buf: Deque[str] = deque(maxlen=LOG_MAX_LINES)
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_timer.timeout.connect(self._flush_log)  # type: ignore[attr-defined]
+
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(PROGRESS_RENDER_INTERVAL_MS)
+        self._render_timer.timeout.connect(self._render_state)  # type: ignore[attr-defined]
+
+        # 首次点「开始」时才创建（见 _ensure_pipeline），启动时不加载 pipeline_process
+        self._pipeline: Optional[PipelineProcess] = None
+        # 获取用户 ID 时的 HTTP 客户端，首次使用时创建（见 _get_httpx_client），多次探测复用连接
+        self._httpx_client: Optional[httpx.Client] = None
+        # 并发探测用户 ID 的线程池，首次使用时创建（见 _get_probe_pool），关闭窗口时先于客户端关闭
+        self._probe_pool: Optional[ThreadPoolExecutor] = None
+        # Cookie 摘要 -> 探测到的用户 ID（LRU）：同一 Cookie 不重复发起网络探测
+        self._uid_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        # 上次 _update_run_buttons 应用的运行状态（None 表示还没应用过）
+        self._buttons_running: Optional[bool] = None
 
         self._build_ui()
         self._load_config_into_form(best_effort=True)
         self._update_run_buttons()
-        
-        # Set macOS title bar color after window is created
-        self._set_macos_titlebar_color()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if not self._window_chrome_ready:
+            self._window_chrome_ready = True
+            self._apply_palette()
+            # Set macOS title bar color after window is created
+            self._set_macos_titlebar_color()
+
+    def closeEvent(self, event) -> None:
+        if self._probe_pool is not None:
+            # 先等仍在跑的用户 ID 探测结束（最多一个请求超时），再关闭它们共用的客户端
+            self._probe_pool.shutdown(wait=True, cancel_futures=True)
+            self._probe_pool = None
+        if self._httpx_client is not None:
+            self._httpx_client.close()
+            self._httpx_client = None
+        super().closeEvent(event)
+
+    def _apply_palette(self) -> None:
+        # Set window background to match app background (helps macOS title bar color)
+        palette = self.palette()
+        palette.setColor(QPalette.ColorRole.Window, QColor("#ECECEC"))
+        self.setPalette(palette)
 
     # ---------------------------
     # UI build
@@ -170,29 +473,32 @@ class MainWindow(QMainWindow):
         root_layout.setContentsMargins(0, 0, 0, 0)
         root_layout.setSpacing(0)
 
-        self.sidebar = QListWidget()
+        self.sidebar = QListView()
         self.sidebar.setObjectName("Sidebar")
+        self.sidebar.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.sidebar.setFixedWidth(220)
         self.sidebar.setSpacing(8)  # Reduced spacing
         self.sidebar.setUniformItemSizes(True)
         # Use custom delegate for top-aligned text and shadow rendering
+        from .sidebar_delegate import SidebarItemDelegate
         self.sidebar.setItemDelegate(SidebarItemDelegate(self.sidebar))
 
         self.stack = QStackedWidget()
         self.stack.setContentsMargins(0, 0, 0, 0)
 
-        self._page_tasks = self._build_tasks_page()
-        self._page_settings = self._build_settings_page()
-
-        self.stack.addWidget(self._page_tasks)
-        self.stack.addWidget(self._page_settings)
+        # 页面先放占位 QWidget，首次切到该页时才真正构建（见 _ensure_page）
+        self._page_builders = (self._build_tasks_page, self._build_settings_page)
+        self._pages: Dict[int, QWidget] = {}
+        for _ in self._page_builders:
+            self.stack.addWidget(QWidget())
 
         # Keep the app simple: Cookie is configured within Settings only.
-        for title in ["开始逃生", "逃生设置"]:
-            self.sidebar.addItem(QListWidgetItem(title))
+        self._sidebar_model = QStringListModel(["开始逃生", "逃生设置"], self)
+        self.sidebar.setModel(self._sidebar_model)
 
-        self.sidebar.currentRowChanged.connect(self.stack.setCurrentIndex)  # type: ignore[attr-defined]
-        self.sidebar.setCurrentRow(0)
+        self.sidebar.selectionModel().currentRowChanged.connect(self._on_sidebar_row_changed)  # type: ignore[attr-defined]
+        self._ensure_page(0)
+        self._select_page(0)
 
         root_layout.addWidget(self.sidebar)
 
@@ -237,6 +543,32 @@ class MainWindow(QMainWindow):
         self.setUnifiedTitleAndToolBarOnMac(True)
         run_menu.addAction(self._act_stop)
 
+    def _select_page(self, row: int) -> None:
+        self.sidebar.setCurrentIndex(self._sidebar_model.index(row))
+
+    def _on_sidebar_row_changed(self, current: QModelIndex, previous: QModelIndex) -> None:
+        # 先换入真实页面，再切换 stack 的当前页
+        row = current.row()
+        self._ensure_page(row)
+        self.stack.setCurrentIndex(row)
+
+    def _ensure_page(self, idx: int) -> Optional[QWidget]:
+        page = self._pages.get(idx)
+        if page is not None or not 0 <= idx < len(self._page_builders):
+            return page
+        page = self._page_builders[idx]()
+        self._pages[idx] = page
+        placeholder = self.stack.widget(idx)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.stack.insertWidget(idx, page)
+        if idx == self._SETTINGS_PAGE:
+            self._populate_form()
+        return page
+
+    def _settings_built(self) -> bool:
+        return self._SETTINGS_PAGE in self._pages
+
     def _page_header(self, title: str, subtitle: str) -> QWidget:
         box = QWidget()
         box.setObjectName("PageHeader")
@@ -273,22 +605,20 @@ class MainWindow(QMainWindow):
         lt.setObjectName("CardTitle")
         hl.addWidget(lt)
         if hint:
-            lh = QLabel(hint)
-            lh.setObjectName("CardHint")
-            lh.setWordWrap(True)
-            hl.addWidget(lh)
+            hl.addWidget(_make_hint_label(hint, word_wrap=True))
         card_layout.addWidget(header)
         return card, card_layout
 
-    def _fix_form_label_width(self, form: QFormLayout, fields: List[QWidget], width: int) -> None:
+    def _form_label(self, text: str) -> QLabel:
         # Make left column consistent across cards (avoid misalignment between sections).
-        for w in fields:
-            lab = form.labelForField(w)
-            if lab:
-                lab.setFixedWidth(width)
-                lab.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        lab = QLabel(text)
+        lab.setFixedWidth(FORM_LABEL_WIDTH)
+        lab.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return lab
 
     def _build_settings_page(self) -> QWidget:
+        from PySide6.QtWidgets import QDoubleSpinBox, QSpinBox
+
         outer = QWidget()
         outer_layout = QVBoxLayout(outer)
         outer_layout.setContentsMargins(0, 0, 0, 0)
@@ -320,11 +650,11 @@ class MainWindow(QMainWindow):
         row.setContentsMargins(0, 0, 0, 0)
         row.setSpacing(10)
         self.lbl_cfg_path = QLabel("")
-        choose_cfg_container, self.btn_choose_cfg = create_shadow_button("选择…")
+        self.btn_choose_cfg = ShadowButton("选择…")
         self.btn_choose_cfg.clicked.connect(self._choose_config_path)  # type: ignore[attr-defined]
         row.addWidget(QLabel("当前："))
         row.addWidget(self.lbl_cfg_path, 1)
-        row.addWidget(choose_cfg_container)
+        row.addWidget(self.btn_choose_cfg)
         cl.addLayout(row)
         layout.addWidget(card_cfg)
 
@@ -338,30 +668,27 @@ class MainWindow(QMainWindow):
 
         self.ed_user_id = QLineEdit()
         self.ed_user_agent = QLineEdit()
-        self.ed_cookie = QPlainTextEdit()
+        # Cookie 基本是整段粘贴/自动填入，单行输入框足够，不需要 QTextDocument
+        self.ed_cookie = QLineEdit()
         self.ed_cookie.setPlaceholderText("Cookie 字符串（将写入 config.json；如需更安全可后续改 Keychain）")
-        self.ed_cookie.setMaximumBlockCount(2000)
-        self.ed_cookie.setFixedHeight(120)
+        self.ed_cookie.setClearButtonEnabled(True)
 
-        self.lbl_cookie_preview = QLabel("当前 Cookie：未设置")
-        self.lbl_cookie_preview.setWordWrap(True)
-        self.lbl_cookie_preview.setObjectName("CardHint")
+        self.lbl_cookie_preview = _make_hint_label("当前 Cookie：未设置", word_wrap=True)
 
         btns = QHBoxLayout()
         btns.setSpacing(10)
-        login_cookie_container, self.btn_login_cookie = create_shadow_button("登录并自动获取 Cookie…")
+        self.btn_login_cookie = ShadowButton("登录并自动获取 Cookie…")
         self.btn_login_cookie.setObjectName("PrimaryButton")
         self.btn_login_cookie.clicked.connect(self._open_cookie_login)  # type: ignore[attr-defined]
-        open_profile_container, self.btn_open_profile = create_shadow_button("打开用户主页")
+        self.btn_open_profile = ShadowButton("打开用户主页")
         self.btn_open_profile.clicked.connect(self._open_profile_link)  # type: ignore[attr-defined]
-        btns.addWidget(login_cookie_container)
-        btns.addWidget(open_profile_container)
+        btns.addWidget(self.btn_login_cookie)
+        btns.addWidget(self.btn_open_profile)
         btns.addStretch(1)
 
-        form_weibo.addRow("用户 ID", self.ed_user_id)
-        form_weibo.addRow("User-Agent", self.ed_user_agent)
-        form_weibo.addRow("Cookie", self.ed_cookie)
-        self._fix_form_label_width(form_weibo, [self.ed_user_id, self.ed_user_agent, self.ed_cookie], width=160)
+        form_weibo.addRow(self._form_label("用户 ID"), self.ed_user_id)
+        form_weibo.addRow(self._form_label("User-Agent"), self.ed_user_agent)
+        form_weibo.addRow(self._form_label("Cookie"), self.ed_cookie)
         clw.addLayout(form_weibo)
         clw.addWidget(self.lbl_cookie_preview)
         clw.addLayout(btns)
@@ -383,9 +710,12 @@ class MainWindow(QMainWindow):
         self.sb_timeout.setRange(5, 300)
         self.sb_timeout.setSuffix(" 秒")
 
-        form_crawler.addRow("请求间隔", self.sb_request_delay)
-        form_crawler.addRow("超时", self.sb_timeout)
-        self._fix_form_label_width(form_crawler, [self.sb_request_delay, self.sb_timeout], width=160)
+        # 只在编辑完成时发 valueChanged，而不是每次按键
+        self.sb_request_delay.setKeyboardTracking(False)
+        self.sb_timeout.setKeyboardTracking(False)
+
+        form_crawler.addRow(self._form_label("请求间隔"), self.sb_request_delay)
+        form_crawler.addRow(self._form_label("超时"), self.sb_timeout)
         clc.addLayout(form_crawler)
         layout.addWidget(card_crawler)
 
@@ -401,33 +731,27 @@ class MainWindow(QMainWindow):
         self.ed_videos_dir = QLineEdit()
         self.ed_output_dir = QLineEdit()
 
-        form_storage.addRow("数据库路径", self.ed_db_path)
-        form_storage.addRow("图片目录", self.ed_images_dir)
-        form_storage.addRow("视频目录", self.ed_videos_dir)
-        form_storage.addRow("输出目录", self.ed_output_dir)
-        self._fix_form_label_width(form_storage, [self.ed_db_path, self.ed_images_dir, self.ed_videos_dir, self.ed_output_dir], width=160)
+        form_storage.addRow(self._form_label("数据库路径"), self.ed_db_path)
+        form_storage.addRow(self._form_label("图片目录"), self.ed_images_dir)
+        form_storage.addRow(self._form_label("视频目录"), self.ed_videos_dir)
+        form_storage.addRow(self._form_label("输出目录"), self.ed_output_dir)
         cls.addLayout(form_storage)
         
         # 添加数据目录说明
-        from .config_store import _get_user_data_dir
-        data_dir = _get_user_data_dir()
-        hint_label = QLabel(f"💡 默认数据目录：{data_dir}")
-        hint_label.setObjectName("CardHint")
-        hint_label.setWordWrap(True)
-        cls.addWidget(hint_label)
+        cls.addWidget(_make_hint_label(f"💡 默认数据目录：{self._user_data_dir}", word_wrap=True))
 
         btn_row = QHBoxLayout()
         btn_row.setSpacing(10)
-        open_data_container, self.btn_open_data = create_shadow_button("打开数据目录")
+        self.btn_open_data = ShadowButton("打开数据目录")
         self.btn_open_data.clicked.connect(self._open_data_dir)  # type: ignore[attr-defined]
-        open_output_container, self.btn_open_output = create_shadow_button("打开输出目录")
+        self.btn_open_output = ShadowButton("打开输出目录")
         self.btn_open_output.clicked.connect(self._open_output_dir)  # type: ignore[attr-defined]
-        save_cfg_container, self.btn_save_cfg = create_shadow_button("保存配置")
+        self.btn_save_cfg = ShadowButton("保存配置")
         self.btn_save_cfg.clicked.connect(self._save_config_from_form)  # type: ignore[attr-defined]
-        btn_row.addWidget(open_data_container)
-        btn_row.addWidget(open_output_container)
+        btn_row.addWidget(self.btn_open_data)
+        btn_row.addWidget(self.btn_open_output)
         btn_row.addStretch(1)
-        btn_row.addWidget(save_cfg_container)
+        btn_row.addWidget(self.btn_save_cfg)
         cls.addLayout(btn_row)
         layout.addWidget(card_storage)
 
@@ -437,6 +761,19 @@ class MainWindow(QMainWindow):
         outer_layout.addWidget(scroll, 1)
         return outer
 
+    def _make_progress_row(self, text: str) -> tuple[QHBoxLayout, QProgressBar]:
+        row = QHBoxLayout()
+        row.setSpacing(8)
+        lbl = _make_hint_label(text)
+        lbl.setFixedWidth(40)
+        pb = QProgressBar()
+        pb.setFormat("%p%")
+        pb.setRange(0, 100)
+        pb.setValue(0)
+        row.addWidget(lbl)
+        row.addWidget(pb)
+        return row, pb
+
     def _build_tasks_page(self) -> QWidget:
         w = QWidget()
         layout = QVBoxLayout(w)
@@ -458,20 +795,24 @@ class MainWindow(QMainWindow):
         self.cb_detail = QCheckBox("微博全文抓取")
         self.cb_media = QCheckBox("图片下载")
         self.cb_html = QCheckBox("生成 HTML")
-        for cb in [self.cb_list, self.cb_detail, self.cb_media, self.cb_html]:
+        # (阶段名, 复选框)，顺序即 pipeline 执行顺序
+        self._phase_boxes = (
+            ("list", self.cb_list),
+            ("detail", self.cb_detail),
+            ("media", self.cb_media),
+            ("html", self.cb_html),
+        )
+        for _, cb in self._phase_boxes:
             cb.setChecked(True)
-        run_row.addWidget(self.cb_list)
-        run_row.addWidget(self.cb_detail)
-        run_row.addWidget(self.cb_media)
-        run_row.addWidget(self.cb_html)
+            run_row.addWidget(cb)
         run_row.addStretch(1)
 
-        # Create shadow buttons (container draws shadow, button is standard QPushButton)
-        stop_container, self.btn_stop = create_shadow_button("停止")
+        # Shadow buttons: shadow is painted in the button's own margins, body by QSS
+        self.btn_stop = ShadowButton("停止")
         self.btn_stop.clicked.connect(self._stop_pipeline)  # type: ignore[attr-defined]
         self.btn_stop.setEnabled(False)
         
-        start_container, self.btn_start = create_shadow_button("开始")
+        self.btn_start = ShadowButton("开始")
         self.btn_start.setObjectName("PrimaryButton")
         self.btn_start.clicked.connect(self._start_pipeline)  # type: ignore[attr-defined]
         
@@ -481,74 +822,34 @@ class MainWindow(QMainWindow):
         self._loading_dots = 0
         self._original_start_text = "开始"
 
-        run_row.addWidget(stop_container)
-        run_row.addWidget(start_container)
+        run_row.addWidget(self.btn_stop)
+        run_row.addWidget(self.btn_start)
         clr.addLayout(run_row)
         layout.addWidget(card_run)
 
         card_prog, clp = self._card("逃生进度", "")
-        self.lbl_phase = QLabel("阶段：-")
-        self.lbl_phase.setObjectName("CardHint")
+        self.lbl_phase = _make_hint_label("阶段：-")
 
         # Progress bars with labels on the left
-        # 列表进度条
-        list_row = QHBoxLayout()
-        list_row.setSpacing(8)
-        lbl_list = QLabel("列表")
-        lbl_list.setObjectName("CardHint")
-        lbl_list.setFixedWidth(40)
-        self.pb_list = QProgressBar()
-        self.pb_list.setFormat("%p%")
-        self.pb_list.setRange(0, 100)
-        self.pb_list.setValue(0)
-        list_row.addWidget(lbl_list)
-        list_row.addWidget(self.pb_list)
-
-        # 详情进度条
-        detail_row = QHBoxLayout()
-        detail_row.setSpacing(8)
-        lbl_detail = QLabel("详情")
-        lbl_detail.setObjectName("CardHint")
-        lbl_detail.setFixedWidth(40)
-        self.pb_detail = QProgressBar()
-        self.pb_detail.setFormat("%p%")
-        self.pb_detail.setRange(0, 100)
-        self.pb_detail.setValue(0)
-        detail_row.addWidget(lbl_detail)
-        detail_row.addWidget(self.pb_detail)
-
-        # 图片进度条
-        images_row = QHBoxLayout()
-        images_row.setSpacing(8)
-        lbl_images = QLabel("图片")
-        lbl_images.setObjectName("CardHint")
-        lbl_images.setFixedWidth(40)
-        self.pb_media_images = QProgressBar()
-        self.pb_media_images.setFormat("%p%")
-        self.pb_media_images.setRange(0, 100)
-        self.pb_media_images.setValue(0)
-        images_row.addWidget(lbl_images)
-        images_row.addWidget(self.pb_media_images)
-
         clp.addWidget(self.lbl_phase)
-        clp.addLayout(list_row)
-        clp.addLayout(detail_row)
-        clp.addLayout(images_row)
+        list_row, self.pb_list = self._make_progress_row("列表")
+        detail_row, self.pb_detail = self._make_progress_row("详情")
+        images_row, self.pb_media_images = self._make_progress_row("图片")
+        for row in (list_row, detail_row, images_row):
+            clp.addLayout(row)
         layout.addWidget(card_prog)
 
         card_log, cll = self._card("逃生日志", "完整日志（用于诊断）。")
-        self.log_full = QPlainTextEdit()
+        self.log_full = LogView(LOG_MAX_LINES)
         self.log_full.setObjectName("LogView")
-        self.log_full.setReadOnly(True)
-        self.log_full.setMaximumBlockCount(15000)
         cll.addWidget(self.log_full)
 
         btns = QHBoxLayout()
         btns.addStretch(1)
-        clear_container, self.btn_clear_log = create_shadow_button("清空")
+        self.btn_clear_log = ShadowButton("清空")
         self.btn_clear_log.clicked.connect(self._clear_log)  # type: ignore[attr-defined]
         self.btn_clear_log.setEnabled(False)  # 初始状态：没有日志时不可点击
-        btns.addWidget(clear_container)
+        btns.addWidget(self.btn_clear_log)
         cll.addLayout(btns)
 
         layout.addWidget(card_log, 1)
@@ -559,17 +860,19 @@ class MainWindow(QMainWindow):
     # Config load/save
     # ---------------------------
     def _choose_config_path(self) -> None:
-        start_dir = str(self._config_path.parent if self._config_path else Path.cwd())
+        from PySide6.QtWidgets import QFileDialog
+
+        start_dir = self._last_dialog_dir or str(self._config_path.parent if self._config_path else Path.cwd())
         path, _ = QFileDialog.getOpenFileName(self, "选择 config.json", start_dir, "JSON (*.json)")
         if not path:
             return
         self._config_path = Path(path)
+        self._last_dialog_dir = str(self._config_path.parent)
         self._prefs.last_config_path = str(self._config_path)
         save_prefs(self._prefs)
         self._load_config_into_form(best_effort=False)
 
     def _load_config_into_form(self, *, best_effort: bool) -> None:
-        self.lbl_cfg_path.setText(str(self._config_path))
         try:
             self._config = ensure_config_shape(load_config(self._config_path))
         except Exception as e:
@@ -578,38 +881,48 @@ class MainWindow(QMainWindow):
                 dialog = CustomMessageDialog("无法加载配置", f"读取失败：{e}", [("确定", "PrimaryButton")], self)
                 dialog.exec()
 
+        # 设置页还没构建时只更新 self._config，等 _ensure_page 构建后再填表单
+        if self._settings_built():
+            self._populate_form()
+
+    def _populate_form(self) -> None:
+        self.lbl_cfg_path.setText(str(self._config_path))
+
         # Populate form controls
-        self.ed_user_id.setText(str(get_nested(self._config, ["weibo", "user_id"], "")))
-        self.ed_user_agent.setText(str(get_nested(self._config, ["weibo", "user_agent"], "")))
-        self.ed_cookie.setPlainText(str(get_nested(self._config, ["weibo", "cookie"], "")))
+        self.ed_user_id.setText(str(get_nested(self._config, ("weibo", "user_id"), "")))
+        self.ed_user_agent.setText(str(get_nested(self._config, ("weibo", "user_agent"), "")))
+        self.ed_cookie.setText(str(get_nested(self._config, ("weibo", "cookie"), "")))
 
-        self.sb_request_delay.setValue(safe_float(get_nested(self._config, ["crawler", "request_delay"], 1.0), 1.0))
-        self.sb_timeout.setValue(safe_int(get_nested(self._config, ["crawler", "timeout"], 30), 30))
+        self.sb_request_delay.setValue(safe_float(get_nested(self._config, ("crawler", "request_delay"), 1.0), 1.0))
+        self.sb_timeout.setValue(safe_int(get_nested(self._config, ("crawler", "timeout"), 30), 30))
 
-        self.ed_db_path.setText(str(get_nested(self._config, ["storage", "database_path"], "data/weibo.db")))
-        self.ed_images_dir.setText(str(get_nested(self._config, ["storage", "images_dir"], "data/images")))
-        self.ed_videos_dir.setText(str(get_nested(self._config, ["storage", "videos_dir"], "data/videos")))
-        self.ed_output_dir.setText(str(get_nested(self._config, ["storage", "output_dir"], "data/output")))
+        self.ed_db_path.setText(str(get_nested(self._config, ("storage", "database_path"), "data/weibo.db")))
+        self.ed_images_dir.setText(str(get_nested(self._config, ("storage", "images_dir"), "data/images")))
+        self.ed_videos_dir.setText(str(get_nested(self._config, ("storage", "videos_dir"), "data/videos")))
+        self.ed_output_dir.setText(str(get_nested(self._config, ("storage", "output_dir"), "data/output")))
         self._refresh_cookie_preview()
 
     def _save_config_from_form(self) -> None:
+        if not self._settings_built():
+            # 表单从未打开过，没有可保存的改动
+            return
         if not self._config_path:
             dialog = CustomMessageDialog("缺少配置", "请先选择 config.json", [("确定", "PrimaryButton")], self)
             dialog.exec()
             return
 
         cfg = ensure_config_shape(dict(self._config or {}))
-        set_nested(cfg, ["weibo", "user_id"], self.ed_user_id.text().strip())
-        set_nested(cfg, ["weibo", "user_agent"], self.ed_user_agent.text().strip())
-        set_nested(cfg, ["weibo", "cookie"], self.ed_cookie.toPlainText().strip())
+        set_nested(cfg, ("weibo", "user_id"), self.ed_user_id.text().strip())
+        set_nested(cfg, ("weibo", "user_agent"), self.ed_user_agent.text().strip())
+        set_nested(cfg, ("weibo", "cookie"), self.ed_cookie.text().strip())
 
-        set_nested(cfg, ["crawler", "request_delay"], float(self.sb_request_delay.value()))
-        set_nested(cfg, ["crawler", "timeout"], int(self.sb_timeout.value()))
+        set_nested(cfg, ("crawler", "request_delay"), float(self.sb_request_delay.value()))
+        set_nested(cfg, ("crawler", "timeout"), int(self.sb_timeout.value()))
 
-        set_nested(cfg, ["storage", "database_path"], self.ed_db_path.text().strip())
-        set_nested(cfg, ["storage", "images_dir"], self.ed_images_dir.text().strip())
-        set_nested(cfg, ["storage", "videos_dir"], self.ed_videos_dir.text().strip())
-        set_nested(cfg, ["storage", "output_dir"], self.ed_output_dir.text().strip())
+        set_nested(cfg, ("storage", "database_path"), self.ed_db_path.text().strip())
+        set_nested(cfg, ("storage", "images_dir"), self.ed_images_dir.text().strip())
+        set_nested(cfg, ("storage", "videos_dir"), self.ed_videos_dir.text().strip())
+        set_nested(cfg, ("storage", "output_dir"), self.ed_output_dir.text().strip())
 
         try:
             save_config(self._config_path, cfg)
@@ -633,16 +946,16 @@ class MainWindow(QMainWindow):
     
     def _open_data_dir(self) -> None:
         """打开数据目录（文档目录下的WeiboLifeboat）"""
-        from .config_store import _get_user_data_dir
-        data_dir = _get_user_data_dir()
+        data_dir = self._user_data_dir
+        # 目录路径按进程缓存，期间若被用户删掉这里补建一次
+        data_dir.mkdir(parents=True, exist_ok=True)
         QDesktopServices.openUrl(QUrl.fromLocalFile(str(data_dir)))
 
     def _open_output_dir(self) -> None:
         out = self.ed_output_dir.text().strip()
         if not out:
             # 如果没有设置，使用默认数据目录
-            from .config_store import _get_user_data_dir
-            out_path = _get_user_data_dir() / "output"
+            out_path = self._user_data_dir / "output"
         else:
             # 如果是绝对路径，直接使用；否则相对于配置文件目录
             out_path = Path(out)
@@ -675,7 +988,7 @@ class MainWindow(QMainWindow):
 
     def _apply_captured_cookie(self, *, cookie: str, count: int, user_id: str = "") -> None:
         # 更新表单 - 优先使用从URL提取的用户ID
-        self.ed_cookie.setPlainText(cookie)
+        self.ed_cookie.setText(cookie)
         
         if user_id:
             # 从URL提取到了用户ID，直接使用
@@ -734,24 +1047,20 @@ class MainWindow(QMainWindow):
         """
         try:
             # 解析Cookie字符串
-            cookies_dict = {}
-            for item in cookie.split(';'):
-                item = item.strip()
-                if '=' in item:
-                    key, value = item.split('=', 1)
-                    cookies_dict[key.strip()] = value.strip()
+            cookies_dict = {
+                key.strip(): value.strip()
+                for key, value in (item.split('=', 1) for item in cookie.split(';') if '=' in item)
+            }
             
             # 方法1: 从SUB字段提取（最可靠）
             if 'SUB' in cookies_dict:
-                import base64
                 try:
                     # SUB格式: _2A25...（base64编码，包含用户ID）
                     sub_value = cookies_dict['SUB']
                     # 尝试解码（微博SUB是特殊编码，这里尝试提取数字部分）
                     decoded = base64.b64decode(sub_value + '==')  # 添加padding
                     # 从解码结果中提取数字（用户ID通常是数字）
-                    import re
-                    numbers = re.findall(r'\d{10,}', decoded.decode('latin1', errors='ignore'))
+                    numbers = _RE_UID_DIGITS.findall(decoded.decode('latin1', errors='ignore'))
                     if numbers:
                         return numbers[0]
                 except Exception:
@@ -762,8 +1071,7 @@ class MainWindow(QMainWindow):
                 try:
                     mlogin = cookies_dict['MLOGIN']
                     # MLOGIN格式通常是: 1; uid=用户ID
-                    import re
-                    match = re.search(r'uid[=:](\d+)', mlogin, re.IGNORECASE)
+                    match = _RE_MLOGIN_UID.search(mlogin)
                     if match:
                         return match.group(1)
                 except Exception:
@@ -781,111 +1089,201 @@ class MainWindow(QMainWindow):
         
         return ""
     
+    def _get_httpx_client(self) -> httpx.Client:
+        """延迟创建共用的 httpx.Client：几个探测接口和后续调用复用同一连接池（keep-alive）"""
+        if self._httpx_client is None or self._httpx_client.is_closed:
+            from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+            import httpx
+
+            from src.pipeline.http_utils import HTTP2_AVAILABLE
+
+            # Cookie 罐不接收任何域名的 Cookie：每个请求只带调用方给的 Cookie 头，
+            # 并发探测之间、前后两个账号之间不会互相串用，也不必在请求间清空共享状态
+            self._httpx_client = httpx.Client(
+                timeout=10.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+                http2=HTTP2_AVAILABLE,
+                cookies=CookieJar(DefaultCookiePolicy(allowed_domains=[])),
+            )
+        return self._httpx_client
+
+    def _get_probe_pool(self) -> ThreadPoolExecutor:
+        if self._probe_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._probe_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="uid-probe")
+        return self._probe_pool
+
     def _fetch_user_id_from_api(self, cookie: str, user_agent: str) -> str:
-        """通过微博API获取当前登录用户的ID"""
+        """通过微博API获取当前登录用户的ID（按 Cookie 缓存成功结果）"""
+        key = hashlib.blake2b(cookie.encode("utf-8"), digest_size=16).digest()
+        uid = self._uid_cache.get(key)
+        if uid is not None:
+            self._uid_cache.move_to_end(key)
+            self._append_log(f"[ui] 使用已缓存的用户 ID: {uid}")
+            return uid
+        names = {item.split('=', 1)[0].strip() for item in cookie.split(';') if '=' in item}
+        if names.isdisjoint(_LOGIN_COOKIE_KEYS):
+            self._append_log("[ui] Cookie缺少登录字段，跳过API探测")
+            return ""
+        uid = self._probe_user_id_from_api(cookie, user_agent)
+        if uid:
+            self._uid_cache[key] = uid
+            if len(self._uid_cache) > UID_CACHE_MAX:
+                self._uid_cache.popitem(last=False)
+        return uid
+
+    def _probe_user_id_from_api(self, cookie: str, user_agent: str) -> str:
         try:
-            import httpx
-            
-            headers = {
-                'Cookie': cookie,
-                'User-Agent': user_agent or 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15',
-                'Referer': 'https://m.weibo.cn/',
-            }
+            headers = {**_HEADERS_BASE, 'Cookie': cookie, 'User-Agent': user_agent or _DEFAULT_UA}
             
-            with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-                # 方法1: 访问 /api/config 接口
-                try:
-                    resp = client.get('https://m.weibo.cn/api/config', headers=headers)
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        if 'data' in data:
-                            # 检查是否登录
-                            if data['data'].get('login'):
-                                if 'uid' in data['data']:
-                                    uid = str(data['data']['uid'])
-                                    self._append_log(f"[ui] 从API获取到用户 ID: {uid}")
-                                    return uid
-                            else:
-                                self._append_log("[ui] API显示未登录状态，Cookie可能不完整")
-                except Exception as e:
-                    self._append_log(f"[ui] API方法失败: {e}")
-                
-                # 方法2: 访问个人主页 /profile/me，会重定向到真实用户主页
-                try:
-                    resp = client.get('https://m.weibo.cn/profile/me', headers=headers, follow_redirects=True)
-                    if resp.status_code == 200:
-                        # 从重定向URL中提取用户ID
-                        # 格式: https://m.weibo.cn/u/1234567890 或 https://m.weibo.cn/profile/1234567890
-                        final_url = str(resp.url)
-                        self._append_log(f"[ui] 个人主页URL: {final_url}")
-                        import re
-                        match = re.search(r'/(?:u|profile)/(\d+)', final_url)
-                        if match:
-                            uid = match.group(1)
-                            self._append_log(f"[ui] 从个人主页URL提取到用户 ID: {uid}")
-                            return uid
-                        
-                        # 从页面内容中提取
-                        match = re.search(r'"uid"\s*:\s*(\d+)', resp.text)
-                        if match:
-                            uid = match.group(1)
-                            self._append_log(f"[ui] 从个人主页内容提取到用户 ID: {uid}")
-                            return uid
-                except Exception as e:
-                    self._append_log(f"[ui] 个人主页方法失败: {e}")
+            client = self._get_httpx_client()
+            # 三个接口同时请求（各自最多等 10s），按优先级取第一个拿到的用户 ID；
+            # 探测在线程里跑，日志先收集起来，回到 UI 线程再输出
+            pool = self._get_probe_pool()
+            probes = (self._probe_config, self._probe_profile, self._probe_container)
+            logs: List[List[str]] = [[] for _ in probes]
+            futures = [pool.submit(probe, client, headers, log) for probe, log in zip(probes, logs)]
+            try:
+                for fut, log in zip(futures, logs):
+                    uid = fut.result()
+                    for line in log:
+                        self._append_log(line)
+                    if uid:
+                        return uid
+            finally:
+                # 已拿到结果时不等其余探测：未开始的取消，已在跑的留在线程池里结束（closeEvent 会等它们）
+                for fut in futures:
+                    fut.cancel()
                 
-                # 方法3: 访问 /api/container/getIndex 接口
-                try:
-                    resp = client.get('https://m.weibo.cn/api/container/getIndex', 
-                                    params={'containerid': '100103type=1'}, 
-                                    headers=headers)
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        if 'data' in data and 'userInfo' in data['data']:
-                            uid = str(data['data']['userInfo'].get('id', ''))
-                            if uid and uid.isdigit():
-                                self._append_log(f"[ui] 从container接口获取到用户 ID: {uid}")
-                                return uid
-                except Exception:
-                    pass
-                    
         except Exception as e:
             self._append_log(f"[ui] API获取用户 ID 失败: {e}")
         
         return ""
 
+    # 三个探测各自返回用户 ID，失败返回 None；只有网络错误 / 非 JSON 响应走异常
+    @staticmethod
+    def _probe_config(client: httpx.Client, headers: Dict[str, str], log: List[str]) -> Optional[str]:
+        """方法1: 访问 /api/config 接口"""
+        import httpx
+
+        try:
+            resp = client.get('https://m.weibo.cn/api/config', headers=headers)
+            data = resp.json() if resp.status_code == 200 else None
+        except (httpx.HTTPError, ValueError) as e:
+            log.append(f"[ui] API方法失败: {e}")
+            return None
+        info = data.get('data') if isinstance(data, dict) else None
+        if not isinstance(info, dict):
+            return None
+        # 检查是否登录
+        if not info.get('login'):
+            log.append("[ui] API显示未登录状态，Cookie可能不完整")
+            return None
+        if 'uid' not in info:
+            return None
+        uid = str(info['uid'])
+        log.append(f"[ui] 从API获取到用户 ID: {uid}")
+        return uid
+
+    @staticmethod
+    def _probe_profile(client: httpx.Client, headers: Dict[str, str], log: List[str]) -> Optional[str]:
+        """方法2: 访问个人主页 /profile/me，会重定向到真实用户主页"""
+        import httpx
+
+        try:
+            resp = client.get('https://m.weibo.cn/profile/me', headers=headers, follow_redirects=True)
+        except httpx.HTTPError as e:
+            log.append(f"[ui] 个人主页方法失败: {e}")
+            return None
+        if resp.status_code != 200:
+            return None
+        # 从重定向URL中提取用户ID
+        # 格式: https://m.weibo.cn/u/1234567890 或 https://m.weibo.cn/profile/1234567890
+        final_url = str(resp.url)
+        log.append(f"[ui] 个人主页URL: {final_url}")
+        match = _RE_UID_URL.search(final_url)
+        if match:
+            uid = match.group(1)
+            log.append(f"[ui] 从个人主页URL提取到用户 ID: {uid}")
+            return uid
+        
+        # 从页面内容中提取
+        match = _RE_UID_JSON.search(resp.text)
+        if match:
+            uid = match.group(1)
+            log.append(f"[ui] 从个人主页内容提取到用户 ID: {uid}")
+            return uid
+        return None
+
+    @staticmethod
+    def _probe_container(client: httpx.Client, headers: Dict[str, str], log: List[str]) -> Optional[str]:
+        """方法3: 访问 /api/container/getIndex 接口"""
+        import httpx
+
+        try:
+            resp = client.get('https://m.weibo.cn/api/container/getIndex', 
+                            params=_CONTAINER_PARAMS, 
+                            headers=headers)
+            data = resp.json() if resp.status_code == 200 else None
+        except (httpx.HTTPError, ValueError):
+            return None
+        info = data.get('data') if isinstance(data, dict) else None
+        user_info = info.get('userInfo') if isinstance(info, dict) else None
+        if not isinstance(user_info, dict):
+            return None
+        uid = str(user_info.get('id', ''))
+        if uid.isdigit():
+            log.append(f"[ui] 从container接口获取到用户 ID: {uid}")
+            return uid
+        return None
+
     def _refresh_cookie_preview(self) -> None:
         try:
-            c = (self.ed_cookie.toPlainText() or "").strip()
+            c = (self.ed_cookie.text() or "").strip()
         except Exception:
             c = ""
         if not c:
             self.lbl_cookie_preview.setText("当前 Cookie：未设置")
             return
         # Do not show full cookie to avoid leaking; show a short preview.
-        preview = c[:120].replace("\n", " ").strip()
-        if len(c) > 120:
+        preview = c[:_COOKIE_PREVIEW_LEN].translate(_COOKIE_PREVIEW_TR).strip()
+        if len(c) > _COOKIE_PREVIEW_LEN:
             preview += "…"
         self.lbl_cookie_preview.setText(f"当前 Cookie：{preview}")
 
     def _selected_phases(self) -> List[str]:
-        phases: List[str] = []
-        if self.cb_list.isChecked():
-            phases.append("list")
-        if self.cb_detail.isChecked():
-            phases.append("detail")
-        if self.cb_media.isChecked():
-            phases.append("media")
-        if self.cb_html.isChecked():
-            phases.append("html")
-        return phases
+        return [phase for phase, cb in self._phase_boxes if cb.isChecked()]
+
+    def _is_running(self) -> bool:
+        return self._pipeline is not None and self._pipeline.is_running()
+
+    def _ensure_pipeline(self) -> PipelineProcess:
+        if self._pipeline is None:
+            from .pipeline_process import PipelineProcess
+
+            self._pipeline = PipelineProcess()
+            # started/finished 总在 GUI 线程发出，直接调用；
+            # log_line/event 在打包模式下从工作线程发出，保留 AutoConnection 让 Qt 按发送线程决定是否排队
+            # （两者同线程发出、同一队列投递，先后顺序不变；日志合并由 _append_log 的缓冲负责）
+            direct = Qt.ConnectionType.DirectConnection
+            self._pipeline.started.connect(self._on_pipeline_started, direct)  # type: ignore[attr-defined]
+            self._pipeline.finished.connect(self._on_pipeline_finished, direct)  # type: ignore[attr-defined]
+            self._pipeline.log_line.connect(self._append_log)  # type: ignore[attr-defined]
+            self._pipeline.event.connect(self._on_event)  # type: ignore[attr-defined]
+        return self._pipeline
 
     def _start_pipeline(self) -> None:
-        if self._pipeline.is_running():
+        if self._is_running():
             return
 
         # 检查 Cookie 是否已设置（包括示例文本检查）
-        cookie = self.ed_cookie.toPlainText().strip()
+        if self._settings_built():
+            cookie = self.ed_cookie.text().strip()
+        else:
+            cookie = str(get_nested(self._config, ("weibo", "cookie"), "")).strip()
         if not cookie or cookie in ["你的Cookie字符串", "你的Cookie", "your_cookie_here"]:
             dialog = CustomMessageDialog(
                 "尚未设置 Cookie", 
@@ -895,7 +1293,7 @@ class MainWindow(QMainWindow):
             )
             result = dialog.exec()
             if dialog.get_result() == 0:  # 点击了"前往设置"
-                self.sidebar.setCurrentRow(1)  # 切换到设置页面
+                self._select_page(self._SETTINGS_PAGE)  # 切换到设置页面
             return
 
         self._save_config_from_form()
@@ -907,18 +1305,21 @@ class MainWindow(QMainWindow):
 
         # Reset UI state
         self._state = UiState()
+        self._progress_logged.clear()
         self._render_state()
 
+        from .pipeline_process import PipelineLaunchSpec
+
         spec = PipelineLaunchSpec(
             config_path=self._config_path,
             phases=phases,
         )
         self._append_log(f"[ui] 启动任务 phases={','.join(phases)}")
-        self._pipeline.start(spec)
+        self._ensure_pipeline().start(spec)
         self._update_run_buttons()
 
     def _stop_pipeline(self) -> None:
-        if not self._pipeline.is_running():
+        if not self._is_running():
             return
         self._append_log("[ui] 请求停止…")
         self._pipeline.terminate()
@@ -926,7 +1327,7 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(2500, self._kill_if_still_running)  # type: ignore[arg-type]
 
     def _kill_if_still_running(self) -> None:
-        if self._pipeline.is_running():
+        if self._is_running():
             self._append_log("[ui] 强制停止（kill）")
             self._pipeline.kill()
             # 强制停止后立即更新按钮状态
@@ -944,151 +1345,53 @@ class MainWindow(QMainWindow):
         self._update_run_buttons()
 
     def _on_event(self, payload: Dict[str, Any]) -> None:
-        ev = str(payload.get("event") or "")
+        # JSON 解出的事件名不是驻留字符串；驻留后与下面各字面量/分派表键的比较可先走指针相等
+        ev = sys.intern(str(payload.get("event") or ""))
         data = payload.get("data") or {}
         if not isinstance(data, dict):
             data = {}
 
         # High-signal state updates
-        if ev == "phase_started":
+        fields = _EVENT_STATE_FIELDS.get(ev)
+        if fields is not None:
+            state = self._state
+            for attr, key in fields:
+                setattr(state, attr, _as_int(data.get(key)))
+        elif ev == "phase_started":
             self._state.current_phase = str(data.get("phase") or "")
-        elif ev == "list_page":
-            self._state.list_page = int(data.get("page") or 0)
-            self._state.list_new_total = int(data.get("new_total") or 0)
-        elif ev == "detail_batch_progress":
-            self._state.detail_done = int(data.get("done") or 0)
-            self._state.detail_total = int(data.get("total") or 0)
-        elif ev == "media_images_progress":
-            self._state.media_images_done = int(data.get("done") or 0)
-            self._state.media_images_total = int(data.get("total") or 0)
-        elif ev == "media_videos_progress":
-            self._state.media_videos_done = int(data.get("done") or 0)
-            self._state.media_videos_total = int(data.get("total") or 0)
-
-        # 将事件转换为友好的中文日志
-        friendly_log = self._format_event_friendly(ev, data)
-        if friendly_log:
-            self._append_log(friendly_log)
+
+        # 将事件转换为友好的中文日志（进度事件未到输出步长时不做格式化）
+        if ev not in _PROGRESS_LOG_STEPS or self._should_log_progress(ev, data):
+            friendly_log = self._format_event_friendly(ev, data)
+            if friendly_log:
+                self._append_log(friendly_log)
         
-        self._render_state()
+        if not self._render_timer.isActive():
+            self._render_timer.start()
+
+    def _should_log_progress(self, ev: str, data: Dict[str, Any]) -> bool:
+        done = int(data.get("done") or 0)
+        total = int(data.get("total") or 0)
+        last = self._progress_logged.get(ev, 0)
+        if done < last:
+            # done 变小说明开始了新一批，重新计数
+            last = 0
+        if done != total and done - last < _PROGRESS_LOG_STEPS[ev]:
+            return False
+        self._progress_logged[ev] = done
+        return True
     
     def _format_event_friendly(self, event: str, data: Dict[str, Any]) -> str:
         """将pipeline事件转换为友好的中文日志"""
-        try:
-            # 运行级别事件
-            if event == "run_started":
-                phases = ", ".join(data.get("phases", []))
-                return f"📋 开始备份任务 [{phases}]"
-            elif event == "run_completed":
-                return "✅ 备份任务完成！"
-            
-            # 阶段事件
-            elif event == "phase_started":
-                phase_names = {
-                    "list": "列表抓取",
-                    "detail": "详情抓取", 
-                    "media": "媒体下载",
-                    "html": "HTML生成"
-                }
-                phase = data.get("phase", "")
-                phase_name = phase_names.get(phase, phase)
-                return f"▶️  开始阶段：{phase_name}"
-            elif event == "phase_completed":
-                phase = data.get("phase", "")
-                return f"✓ 完成阶段：{phase}"
-            
-            # 列表抓取事件
-            elif event == "list_started":
-                return f"🔍 开始抓取微博列表（从第{data.get('start_page', 1)}页开始）"
-            elif event == "list_page":
-                page = data.get("page", 0)
-                new_count = data.get("new_count", 0)
-                new_total = data.get("new_total", 0)
-                # 每5页显示一次，避免刷屏
-                if page % 5 == 0 or page == 1:
-                    return f"   第{page}页：新增 {new_count} 条，累计 {new_total} 条"
-                return ""  # 其他页不显示
-            elif event == "list_completed":
-                total = data.get("new_total", 0)
-                last_page = data.get("last_page", 0)
-                return f"✓ 列表抓取完成：共 {last_page} 页，{total} 条微博"
-            elif event == "list_stopped":
-                reason = data.get("reason", "")
-                if reason == "no_data":
-                    return "⚠️  列表抓取停止：未获取到数据"
-                return f"⚠️  列表抓取停止：{reason}"
-            
-            # 详情抓取事件
-            elif event == "detail_batch_started":
-                batch = data.get("batch", 0)
-                total = data.get("total", 0)
-                return f"   批次 {batch}：准备抓取 {total} 条详情"
-            elif event == "detail_batch_progress":
-                done = data.get("done", 0)
-                total = data.get("total", 0)
-                if done % 20 == 0 or done == total:  # 每20条显示一次
-                    return f"   进度：{done}/{total} ({done*100//total if total>0 else 0}%)"
-                return ""
-            elif event == "detail_completed":
-                total = data.get("total_done", 0)
-                batches = data.get("batches", 0)
-                return f"✓ 详情抓取完成：{batches} 个批次，共 {total} 条"
-            elif event == "detail_stopped":
-                reason = data.get("reason", "")
-                if reason == "antibot_max_cooldowns":
-                    return "⚠️  详情抓取停止：触发反爬虫次数过多，已自动停止"
-                elif reason == "zero_success":
-                    return "⚠️  详情抓取停止：本批次无成功更新"
-                return f"⚠️  详情抓取停止：{reason}"
-            
-            # 反爬虫事件
-            elif event == "antibot_triggered":
-                phase_names = {
-                    "list": "列表抓取",
-                    "detail": "详情抓取",
-                    "media": "媒体下载"
-                }
-                phase = data.get("phase", "")
-                phase_name = phase_names.get(phase, phase)
-                cooldowns = data.get("cooldowns", 0)
-                max_cooldowns = data.get("max_cooldowns", 3)
-                cooldown_seconds = data.get("cooldown_seconds", 1800)
-                cooldown_minutes = cooldown_seconds // 60
-                
-                return (f"⚠️  触发反爬虫机制（{phase_name}）\n"
-                       f"   将等待 {cooldown_minutes} 分钟后自动继续... "
-                       f"({cooldowns}/{max_cooldowns} 次)")
-            
-            # 媒体下载事件
-            elif event == "media_images_progress":
-                done = data.get("done", 0)
-                total = data.get("total", 0)
-                if done % 10 == 0 or done == total:  # 每10个显示一次
-                    return f"   图片：{done}/{total} ({done*100//total if total>0 else 0}%)"
-                return ""
-            elif event == "media_images_completed":
-                total = data.get("total", 0)
-                return f"✓ 图片下载完成：共 {total} 张"
-            elif event == "media_videos_progress":
-                done = data.get("done", 0)
-                total = data.get("total", 0)
-                if done % 5 == 0 or done == total:  # 每5个显示一次
-                    return f"   视频：{done}/{total} ({done*100//total if total>0 else 0}%)"
-                return ""
-            elif event == "media_videos_completed":
-                total = data.get("total", 0)
-                return f"✓ 视频下载完成：共 {total} 个"
-            
-            # HTML生成（通常很快，只显示关键信息）
-            elif event == "html_generated":
-                return "✓ HTML页面生成完成"
-            
+        formatter = _EVENT_FORMATTERS.get(event)
+        if formatter is None:
             # 其他不重要的事件不显示
             return ""
-            
+        try:
+            return formatter(data)
         except Exception as e:
             # 如果格式化失败，返回原始JSON（保底）
-            return json.dumps({"event": event, "data": data}, ensure_ascii=False)
+            return _json.dumps_line({"event": event, "data": data})
 
     # ---------------------------
     # Rendering + logs
@@ -1100,7 +1403,10 @@ class MainWindow(QMainWindow):
         self.btn_start.setText(f"运行中{dots}")
     
     def _update_run_buttons(self) -> None:
-        running = self._pipeline.is_running()
+        running = self._is_running()
+        if running == self._buttons_running:
+            return
+        self._buttons_running = running
         
         # 开始按钮：运行中不可点击，显示loading动画
         if running:
@@ -1123,7 +1429,17 @@ class MainWindow(QMainWindow):
     def _append_log(self, line: str) -> None:
         if not line:
             return
-        self.log_full.appendPlainText(line)
+        self._log_buf.append(line)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self) -> None:
+        if not self._log_buf:
+            return
+        # 日志视图一行一条：多行消息（批量转发的子进程输出、反爬提示等）拆开
+        lines = [part for line in self._log_buf for part in line.split("\n")]
+        self._log_buf.clear()
+        self.log_full.append_lines(lines)
         
         # 有日志后启用"清空"按钮
         if hasattr(self, 'btn_clear_log') and not self.btn_clear_log.isEnabled():
@@ -1131,56 +1447,61 @@ class MainWindow(QMainWindow):
     
     def _clear_log(self) -> None:
         """清空日志"""
-        self.log_full.setPlainText("")
+        self._log_buf.clear()
+        self._log_timer.stop()
+        self.log_full.clear()
         # 清空后禁用按钮
         if hasattr(self, 'btn_clear_log'):
             self.btn_clear_log.setEnabled(False)
 
-    def _pct(self, done: int, total: int) -> int:
-        if total <= 0:
-            return 0
-        return max(0, min(100, int(done * 100 / total)))
-
     def _render_state(self) -> None:
-        phase = self._state.current_phase or "-"
-        self.lbl_phase.setText(f"阶段：{phase}")
+        # 只在值变化时才写回控件，避免无谓的重绘
+        self._render_timer.stop()
+        state = self._state
+        phase_text = f"阶段：{state.current_phase or '-'}"
+        if self.lbl_phase.text() != phase_text:
+            self.lbl_phase.setText(phase_text)
 
         # 列表进度条（基于页数，假设大约200页为100%）
-        if self._state.list_page > 0:
-            list_pct = min(100, int(self._state.list_page * 100 / 200))
-            self.pb_list.setValue(list_pct)
-            self.pb_list.setFormat(f"第 {self._state.list_page} 页 ({self._state.list_new_total} 条)")
+        if state.list_page > 0:
+            list_pct = min(100, state.list_page * 100 // 200)
+            list_fmt = f"第 {state.list_page} 页 ({state.list_new_total} 条)"
         else:
-            self.pb_list.setValue(0)
-            self.pb_list.setFormat("-")
-
-        # 详情和图片进度条
-        self.pb_detail.setValue(self._pct(self._state.detail_done, self._state.detail_total))
-        self.pb_media_images.setValue(self._pct(self._state.media_images_done, self._state.media_images_total))
+            list_pct = 0
+            list_fmt = "-"
+        if self.pb_list.format() != list_fmt:
+            self.pb_list.setFormat(list_fmt)
+
+        # 详情和图片进度条（计数在 _on_event 里已转成 int，这里直接整数运算）
+        total = state.detail_total
+        detail_pct = max(0, min(100, state.detail_done * 100 // total)) if total > 0 else 0
+        total = state.media_images_total
+        images_pct = max(0, min(100, state.media_images_done * 100 // total)) if total > 0 else 0
+
+        for bar, value in (
+            (self.pb_list, list_pct),
+            (self.pb_detail, detail_pct),
+            (self.pb_media_images, images_pct),
+        ):
+            if bar.value() != value:
+                bar.setValue(value)
     
     def _set_macos_titlebar_color(self) -> None:
         """Set macOS native title bar color to match app background"""
-        import platform
-        if platform.system() != "Darwin":
+        if sys.platform != "darwin":
             return
         
         def set_color():
             try:
                 import ctypes
-                import ctypes.util
-                
-                # Load Objective-C runtime
-                objc = ctypes.cdll.LoadLibrary(ctypes.util.find_library("objc"))
-                objc.objc_getClass.restype = ctypes.c_void_p
-                objc.sel_registerName.restype = ctypes.c_void_p
-                objc.objc_msgSend.restype = ctypes.c_void_p
+
+                objc, NSColor, window_sel, colorWithRed_sel, setBackgroundColor_sel = _get_objc_runtime()
                 
                 # Get NSView from Qt window
                 win_id = int(self.winId())
                 nsview = ctypes.c_void_p(win_id)
                 
                 # Get NSWindow
-                window_sel = objc.sel_registerName(b"window")
                 objc.objc_msgSend.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
                 nswindow = objc.objc_msgSend(nsview, window_sel)
                 
@@ -1188,8 +1509,7 @@ class MainWindow(QMainWindow):
                     return
                 
                 # Create NSColor (#ECECEC)
-                NSColor = objc.objc_getClass(b"NSColor")
-                colorWithRed_sel = objc.sel_registerName(b"colorWithRed:green:blue:alpha:")
+                # 返回的是 autorelease 对象，不跨事件循环缓存，每次现取
                 objc.objc_msgSend.argtypes = [
                     ctypes.c_void_p, ctypes.c_void_p,
                     ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.c_double
@@ -1203,7 +1523,6 @@ class MainWindow(QMainWindow):
                 )
                 
                 # Set window background color
-                setBackgroundColor_sel = objc.sel_registerName(b"setBackgroundColor:")
                 objc.objc_msgSend.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
                 objc.objc_msgSend(nswindow, setBackgroundColor_sel, bg_color)
                 
@@ -34,8 +34,11 @@ class PipelineProcess(QObject):
 
     started = Signal()
     finished = Signal(int)  # exit code
-    log_line = Signal(str)  # stderr or non-json stdout lines
+    # stderr or non-json stdout lines（一次读到的多行用 "\n" 拼成一条发出；
+    # 与 event 按产生顺序发出，合并刷新由 MainWindow 的日志缓冲统一负责）
+    log_line = Signal(str)
     event = Signal(dict)  # {"ts": ..., "event": ..., "data": {...}}
+    _thread_finished = Signal(int)  # 线程模式：把结束通知切回 GUI 线程
 
     def __init__(self) -> None:
         super().__init__()
@@ -44,6 +47,7 @@ class PipelineProcess(QObject):
         self._stdout_buf = b""
         self._running = False
         self._stop_requested = False
+        self._thread_finished.connect(self._on_thread_finished)  # type: ignore[attr-defined]
 
     def is_running(self) -> bool:
         return self._running
@@ -134,15 +138,18 @@ class PipelineProcess(QObject):
             self._emit_log_from_thread(traceback.format_exc())
             exit_code = 1
         finally:
-            self._running = False
-            self.finished.emit(exit_code)
+            self._thread_finished.emit(exit_code)
+
+    def _on_thread_finished(self, exit_code: int) -> None:
+        self._running = False
+        self.finished.emit(int(exit_code))
     
     def _emit_event_from_thread(self, event_data: Dict[str, Any]) -> None:
         """从线程中安全地发送事件"""
         self.event.emit(event_data)
     
     def _emit_log_from_thread(self, message: str) -> None:
-        """从线程中安全地发送日志"""
+        """从线程中安全地发送日志（跨线程信号由 Qt 排队，与 event 保持先后顺序）"""
         self.log_line.emit(message)
 
     def terminate(self) -> None:
@@ -186,9 +193,9 @@ class PipelineProcess(QObject):
             txt = data.decode("utf-8", errors="replace")
         except Exception:
             txt = str(data)
-        for line in txt.splitlines():
-            if line.strip():
-                self.log_line.emit(line.rstrip())
+        lines = [line.rstrip() for line in txt.splitlines() if line.strip()]
+        if lines:
+            self.log_line.emit("\n".join(lines))
 
     def _emit_stdout_line(self, line: bytes) -> None:
         b = line.strip()
@@ -1,125 +1,104 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Qt, QRectF
-from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QPainterPath
-from PySide6.QtWidgets import QPushButton
+from collections import OrderedDict
+from typing import Tuple
+
+from PySide6.QtCore import QRect, QRectF, QSize, Qt
+from PySide6.QtGui import QBrush, QColor, QPainter, QPainterPath, QPixmap
+from PySide6.QtWidgets import QPushButton, QStyle, QStyleOptionButton, QStylePainter
+
+# 阴影向右下偏移，所以右/下需要更多留白（与原 ShadowContainer 的布局边距一致）
+_SHADOW_LEFT = 2
+_SHADOW_TOP = 2
+_SHADOW_RIGHT = 10
+_SHADOW_BOTTOM = 10
+
+# Shadow parameters (matching sidebar tabs)
+_SHADOW_BLUR = 8
+_SHADOW_OFFSET = 2
+_RADIUS = 6.0
+
+# 按状态区分的阴影不透明度：禁用 / 按下 / 正常
+_OPACITY_DISABLED = 0
+_OPACITY_PRESSED = 1
+_OPACITY_NORMAL = 2
+_SHADOW_OPACITY = (0.01, 0.015, 0.02)
+
+# 阴影 pixmap 缓存上限：按钮尺寸随窗口/布局变化时旧尺寸的条目按 LRU 淘汰
+_SHADOW_CACHE_MAX = 32
 
 
 class ShadowButton(QPushButton):
     """
-    QPushButton with subtle shadow effect (similar to sidebar tabs)
+    自带阴影的 QPushButton：按钮本体仍由当前 style/QSS 绘制（只是画在内缩后的矩形里），
+    阴影画在四周留白中。取代原先「容器 QWidget + 按钮」的两层结构。
+    阴影 pixmap 按 (宽, 高, 状态, DPR) 缓存在类上（LRU，最多 _SHADOW_CACHE_MAX 个），同尺寸按钮共用。
     """
 
-    def __init__(self, text: str = "", parent=None):
-        super().__init__(text, parent)
-        # Track hover state properly instead of using underMouse() in paintEvent
-        self._is_hover = False
-        self.setMouseTracking(True)
-
-    def enterEvent(self, event):
-        """Track hover state on enter"""
-        self._is_hover = True
-        self.update()
-        super().enterEvent(event)
-
-    def leaveEvent(self, event):
-        """Track hover state on leave"""
-        self._is_hover = False
-        self.update()
-        super().leaveEvent(event)
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        # Use save/restore instead of end() - this is the delegate pattern
-        painter.save()
+    _shadow_cache: "OrderedDict[Tuple[int, int, int, float], QPixmap]" = OrderedDict()
+
+    def sizeHint(self) -> QSize:
+        return self._with_margins(super().sizeHint())
+
+    @staticmethod
+    def _with_margins(size: QSize) -> QSize:
+        return QSize(size.width() + _SHADOW_LEFT + _SHADOW_RIGHT, size.height() + _SHADOW_TOP + _SHADOW_BOTTOM)
+
+    def _button_rect(self) -> QRect:
+        return self.rect().adjusted(_SHADOW_LEFT, _SHADOW_TOP, -_SHADOW_RIGHT, -_SHADOW_BOTTOM)
+
+    def hitButton(self, pos) -> bool:
+        # 阴影留白不响应点击
+        return self._button_rect().contains(pos)
+
+    def _shadow_pixmap(self, state: int) -> QPixmap:
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), state, dpr)
+        pm = self._shadow_cache.get(key)
+        if pm is not None:
+            self._shadow_cache.move_to_end(key)
+            return pm
+
+        pm = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pm)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Get state (use tracked hover state instead of underMouse())
-        is_enabled = self.isEnabled()
-        is_down = self.isDown()
-        is_hover = self._is_hover
-        is_primary = self.objectName() == "PrimaryButton"
-        
-        # Colors based on theme (matching style.py)
-        if is_primary:
-            if not is_enabled:
-                bg_color = QColor("#FF4A00")
-                bg_color.setAlphaF(0.4)
-            elif is_down:
-                bg_color = QColor("#005FCC")
-            elif is_hover:
-                bg_color = QColor("#006FE6")
-            else:
-                bg_color = QColor("#007AFF")
-            border_color = QColor(0, 0, 0, int(0.08 * 255))
-            text_color = QColor(255, 255, 255)
-        else:
-            if not is_enabled:
-                bg_color = QColor(255, 255, 255, 80)
-            elif is_down:
-                bg_color = QColor("#EEF2F7")
-            elif is_hover:
-                bg_color = QColor("#F1F5F9")
-            else:
-                bg_color = QColor("#F4F4F4")
-            border_color = QColor(60, 60, 67, int(0.18 * 255))
-            text_color = QColor("#1d1d1f") if is_enabled else QColor(60, 60, 67, 128)
-        
-        rect = QRectF(self.rect())
-        radius = 6.0
-        
-        # Only draw shadow if enabled and not pressed
-        if is_enabled and not is_down:
-            # Shadow base rect: 4px smaller than button (2px inset on each side)
-            shadow_base_rect = rect.adjusted(2, 2, -2, -2)
-            
-            # Draw shadow with offset right and down
-            shadow_blur = 12 if (is_hover or is_primary) else 12
-            shadow_offset_x = 2  # Move right 2px
-            shadow_offset_y = 2  # Move down 2px
-            base_opacity = 0.01  # Base opacity
-            
-            # Draw shadow layers from outer to inner for proper blending
-            for i in range(shadow_blur, 0, -1):
-                # Calculate opacity for this layer (gaussian-like falloff)
-                layer_opacity = base_opacity * (1.0 - (i / shadow_blur) ** 2)
-                shadow_color = QColor(0, 0, 0, int(layer_opacity * 255))
-                
-                # Shadow rectangle expands outward from the smaller base and shifts
-                shadow_rect = shadow_base_rect.adjusted(
-                    -i + shadow_offset_x,
-                    -i + shadow_offset_y,
-                    i + shadow_offset_x,
-                    i + shadow_offset_y
-                )
-                shadow_path = QPainterPath()
-                shadow_path.addRoundedRect(shadow_rect, radius + i * 0.5, radius + i * 0.5)
-                painter.fillPath(shadow_path, QBrush(shadow_color))
-        
-        # Draw background
-        path = QPainterPath()
-        path.addRoundedRect(rect, radius, radius)
-        painter.fillPath(path, QBrush(bg_color))
-        
-        # Draw border
-        painter.setPen(QPen(border_color, 1.0))
-        painter.drawRoundedRect(rect.adjusted(0.5, 0.5, -0.5, -0.5), radius, radius)
-        
-        # Draw text
-        text = self.text()
-        if text:
-            painter.setPen(QPen(text_color))
-            font = self.font()
-            if is_primary:
-                font.setWeight(600)
-            painter.setFont(font)
-            
-            painter.drawText(
-                rect.toRect(),
-                int(Qt.AlignmentFlag.AlignCenter),
-                text
+        base_opacity = _SHADOW_OPACITY[state]
+        # Shadow base rect: 2px smaller than button (1px inset on each side)
+        shadow_base_rect = QRectF(self._button_rect()).adjusted(1, 1, -1, -1)
+        # Draw shadow layers from outer to inner
+        for i in range(_SHADOW_BLUR, 0, -1):
+            # Calculate opacity for this layer (gaussian-like falloff)
+            layer_opacity = base_opacity * (1.0 - (i / _SHADOW_BLUR) ** 2)
+            shadow_rect = shadow_base_rect.adjusted(
+                -i + _SHADOW_OFFSET,
+                -i + _SHADOW_OFFSET,
+                i + _SHADOW_OFFSET,
+                i + _SHADOW_OFFSET,
             )
-        
-        # Use restore() instead of end() - safer and follows delegate pattern
-        painter.restore()
+            path = QPainterPath()
+            path.addRoundedRect(shadow_rect, _RADIUS + i * 0.5, _RADIUS + i * 0.5)
+            painter.fillPath(path, QBrush(QColor(0, 0, 0, int(layer_opacity * 255))))
+        painter.end()
+
+        self._shadow_cache[key] = pm
+        if len(self._shadow_cache) > _SHADOW_CACHE_MAX:
+            self._shadow_cache.popitem(last=False)
+        return pm
+
+    def paintEvent(self, event) -> None:
+        if not self.isEnabled():
+            state = _OPACITY_DISABLED
+        elif self.isDown():
+            state = _OPACITY_PRESSED
+        else:
+            state = _OPACITY_NORMAL
+
+        painter = QStylePainter(self)
+        painter.drawPixmap(0, 0, self._shadow_pixmap(state))
 
+        opt = QStyleOptionButton()
+        self.initStyleOption(opt)
+        opt.rect = self._button_rect()
+        painter.drawControl(QStyle.ControlElement.CE_PushButton, opt)
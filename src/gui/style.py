@@ -299,14 +299,14 @@ def apply_app_style(app: QApplication) -> Theme:
     /* Page header: no margin hacks. The header/cards insets are handled per-page in layouts. */
 
     /* Sidebar */
-    QListWidget#Sidebar {{
+    QListView#Sidebar {{
       background: {theme.sidebar_bg};
       border: none;
       border-right: 1px solid {theme.border};
       padding: 8px;  /* Reduced padding */
       outline: none;
     }}
-    QListWidget#Sidebar::item {{
+    QListView#Sidebar::item {{
       /* openai.fm-like "tab cards" - shadow drawn by delegate */
       background-color: transparent;  /* Delegate draws everything */
       border: none;  /* Delegate draws border */
@@ -314,15 +314,15 @@ def apply_app_style(app: QApplication) -> Theme:
       /* Padding here only affects background/border rendering, not text */
       padding: 0px;
       border-radius: {tab_radius}px;
-      margin: 0px;  /* Margin doesn't affect spacing; QListWidget.setSpacing() controls it */
+      margin: 0px;  /* Margin doesn't affect spacing; QListView.setSpacing() controls it */
       color: {theme.text};
       font-size: 14px;
       min-height: 80px;  /* Increased from 60px to 80px (added 20px) */
     }}
-    QListWidget#Sidebar::item:hover {{
+    QListView#Sidebar::item:hover {{
       background: transparent;
     }}
-    QListWidget#Sidebar::item:selected {{
+    QListView#Sidebar::item:selected {{
       background-color: transparent;
       color: {theme.text};
       font-weight: 600;
@@ -347,6 +347,10 @@ def apply_app_style(app: QApplication) -> Theme:
       color: {theme.secondary_text};
       line-height: 16px;
     }}
+    QLabel#CookieStatus {{
+      font-size: 13px;
+      color: {theme.secondary_text};
+    }}
 
     /* Inputs */
     QLineEdit, QPlainTextEdit, QSpinBox, QDoubleSpinBox {{
@@ -498,11 +502,12 @@ def apply_app_style(app: QApplication) -> Theme:
     }}
 
     /* Log views: avoid nested borders ("all lines" look) */
-    QPlainTextEdit#LogView {{
+    QListView#LogView {{
       border: none;
       background: transparent;
       padding: 0px;
       font-size: 12px;
+      outline: none;
     }}
 
     /* Scrollbars: macOS-like rounded overlay handle */
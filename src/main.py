@@ -111,6 +111,8 @@ class WeiboBackup:
         except Exception as e:
             logger.exception(f"备份过程出错: {e}")
         finally:
+            await self.fetcher.aclose()
+            await self.downloader.aclose()
             self.db.close()
     
     async def _fetch_weibos(self):
@@ -2,12 +2,34 @@
 媒体文件下载模块 - 异步下载图片和视频
 """
 import asyncio
+import os
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Tuple
 import httpx
 from loguru import logger
 import aiofiles
 
+# 图片 CDN 支持 HTTP/2：h2 缺失时退回 HTTP/1.1
+try:
+    # 兼容：python -m src.pipeline.runner
+    from src.pipeline.http_utils import HTTP2_AVAILABLE  # type: ignore
+except ImportError:
+    # 兼容：python src/main.py（此时 sys.path[0] 是 src/）
+    from pipeline.http_utils import HTTP2_AVAILABLE  # type: ignore
+
+
+# 下载分块大小：大块写入减少系统调用次数
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """已知文件大小时预分配磁盘空间（减少碎片）；平台不支持时忽略"""
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except OSError:
+            pass
+
 
 class MediaDownloader:
     """媒体文件下载器"""
@@ -32,6 +54,7 @@ class MediaDownloader:
         # 延迟创建信号量（避免在没有event loop的线程中初始化）
         self._semaphore = None
         self._concurrent_downloads = config.get('concurrent_downloads', 20)
+        self._client: Optional[httpx.AsyncClient] = None
         
         logger.info(f"MediaDownloader 初始化完成")
         logger.info(f"图片目录: {self.images_dir}")
@@ -44,6 +67,27 @@ class MediaDownloader:
             self._semaphore = asyncio.Semaphore(self._concurrent_downloads)
         return self._semaphore
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """延迟创建共用的 AsyncClient：所有下载复用同一连接池"""
+        if self._client is None or self._client.is_closed:
+            # 并发已由 semaphore 控制，这里只需保证 keep-alive 连接够用
+            limits = httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=max(int(self._concurrent_downloads), 20),
+                keepalive_expiry=60.0,
+            )
+            self._client = httpx.AsyncClient(
+                timeout=60, follow_redirects=True, limits=limits, http2=HTTP2_AVAILABLE
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """关闭连接池"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def download_file(self, url: str, save_path: Path, retry: int = 3) -> bool:
         """
         下载单个文件
@@ -56,15 +100,33 @@ class MediaDownloader:
         Returns:
             是否下载成功
         """
+        # 先写到 .part 临时文件，完整下载后再改名：中断留下的半截文件不会被当成“已存在”而跳过
+        tmp_path = save_path.with_name(save_path.name + '.part')
         async with self.semaphore:
             for attempt in range(retry):
                 try:
-                    async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client:
-                        response = await client.get(url, headers=self.headers)
-                        
+                    async with self.client.stream('GET', url, headers=self.headers) as response:
                         if response.status_code == 200:
-                            async with aiofiles.open(save_path, 'wb') as f:
-                                await f.write(response.content)
+                            # 有 Content-Encoding 时解压后的长度与 Content-Length 不一致，不做预分配/校验
+                            expected = None
+                            if response.headers.get('Content-Encoding', 'identity') == 'identity':
+                                try:
+                                    expected = int(response.headers.get('Content-Length') or 0) or None
+                                except ValueError:
+                                    expected = None
+                            
+                            written = 0
+                            # 已按 1MB 分块写入，不需要再经过 Python 层缓冲
+                            async with aiofiles.open(tmp_path, 'wb', buffering=0) as f:
+                                if expected:
+                                    await asyncio.to_thread(_preallocate, f.fileno(), expected)
+                                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                                    await f.write(chunk)
+                                    written += len(chunk)
+                            
+                            if expected and written != expected:
+                                raise IOError(f"文件不完整: {written}/{expected} 字节")
+                            os.replace(tmp_path, save_path)
                             
                             logger.debug(f"下载成功: {save_path.name}")
                             return True
@@ -73,6 +135,7 @@ class MediaDownloader:
                             
                 except Exception as e:
                     logger.warning(f"下载出错 (尝试 {attempt + 1}/{retry}): {e}")
+                    tmp_path.unlink(missing_ok=True)
                     if attempt < retry - 1:
                         await asyncio.sleep(1)
             
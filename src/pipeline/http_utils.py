@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import importlib.util
 import random
 from dataclasses import dataclass
 from typing import Dict, Optional, Tuple
 
 import httpx
 
+from .rate_limit import HostRateLimiter, parse_retry_after
+
+# HTTP/2 需要 h2 包（httpx[http2]）：这里只探测是否安装，不导入；缺失时各客户端退回 HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 class AntiBotTriggered(RuntimeError):
     pass
@@ -29,11 +35,15 @@ async def get_with_retries(
     params: Optional[Dict[str, str]] = None,
     policy: HttpRetryPolicy = HttpRetryPolicy(),
     antibot_fail_fast: bool = True,
+    limiter: Optional[HostRateLimiter] = None,
 ) -> httpx.Response:
     last_exc: Optional[Exception] = None
     for attempt in range(1, policy.max_attempts + 1):
         await asyncio.sleep(policy.base_delay + random.random() * policy.jitter)
+        bucket = limiter.bucket(url) if limiter is not None else None
         try:
+            if bucket is not None:
+                await bucket.acquire()
             resp = await client.get(url, headers=headers, params=params)
         except Exception as e:
             last_exc = e
@@ -51,10 +61,19 @@ async def get_with_retries(
             await asyncio.sleep(backoff)
             continue
 
+        # 服务端给出的等待时间（Retry-After / X-RateLimit-*）优先于本地退避
+        if bucket is not None:
+            retry_after = bucket.update_from_headers(resp.headers)
+        else:
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+
         if resp.status_code in policy.antibot_statuses:
             if antibot_fail_fast:
                 raise AntiBotTriggered(f"anti-bot status={resp.status_code} url={url}")
-            backoff = policy.backoff_base * (2 ** (attempt - 1)) + random.random()
+            if retry_after is not None:
+                backoff = retry_after + random.random()
+            else:
+                backoff = policy.backoff_base * (2 ** (attempt - 1)) + random.random()
             await asyncio.sleep(backoff)
             continue
 
@@ -63,7 +82,12 @@ async def get_with_retries(
 
         # non-200: retry a couple times, then return
         if attempt < policy.max_attempts:
-            backoff = 1.0 + random.random()
+            if retry_after is not None:
+                backoff = retry_after + random.random()
+            elif resp.status_code >= 500:
+                backoff = 2 ** (attempt - 1) + random.random()
+            else:
+                backoff = 1.0 + random.random()
             await asyncio.sleep(backoff)
             continue
         return resp
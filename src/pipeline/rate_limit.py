@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After：既可能是秒数，也可能是 HTTP-date。返回需要等待的秒数（无法解析时 None）。
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if dt is None:
+        return None
+    return max(0.0, dt.timestamp() - time.time())
+
+
+class TokenBucket:
+    """
+    令牌桶：平均 rate 个请求/秒，允许 burst 个突发。
+    服务端通过 Retry-After / X-RateLimit-* 明确要求等待时，整桶暂停到指定时间。
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # 延迟创建锁（避免在没有event loop的线程中初始化）
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aenter__(self) -> "TokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    def pause(self, seconds: float) -> None:
+        """暂停发放令牌 seconds 秒（只会延长，不会缩短已有的暂停）"""
+        if seconds > 0:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        根据响应头调整节奏，返回服务端要求的等待秒数（没有则 None）。
+        - Retry-After: 直接暂停
+        - X-RateLimit-Remaining=0: 暂停到 X-RateLimit-Reset（秒数或 epoch 时间戳）
+        """
+        wait = parse_retry_after(headers.get("Retry-After"))
+        if wait is None:
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            if remaining is not None and reset is not None:
+                try:
+                    if int(float(remaining)) <= 0:
+                        reset_val = float(reset)
+                        # 大于一年的秒数视为 epoch 时间戳
+                        wait = max(0.0, reset_val - time.time()) if reset_val > 31536000 else reset_val
+                except ValueError:
+                    wait = None
+        if wait is not None:
+            self.pause(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """按 host 分桶的限速器：不同域名（weibo.cn / sinaimg.cn ...）互不影响"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).hostname or ""
+        b = self._buckets.get(host)
+        if b is None:
+            b = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return b
@@ -3,14 +3,15 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
+import os
 import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-import httpx
 from bs4 import BeautifulSoup
 from bs4 import XMLParsedAsHTMLWarning
 from loguru import logger
@@ -29,6 +30,7 @@ except Exception:
     from weibo_fetcher import WeiboFetcher  # type: ignore
 
 from .http_utils import AntiBotTriggered, HttpRetryPolicy, get_with_retries
+from .rate_limit import HostRateLimiter
 from .events import PipelineEventSink
 from .weibo_cn_parser import (
     classify_retweet_from_list_card,
@@ -49,6 +51,11 @@ class PipelineConfig:
     detail_batch_size: int = 200
     detail_concurrency: int = 3
     detail_retry: HttpRetryPolicy = HttpRetryPolicy()
+    detail_parse_workers: Optional[int] = None  # None => min(8, cpu_count)；<=1 则在当前线程解析
+    # 抓取与落库解耦：worker 把结果放入有界队列，单个 writer 攒批后一个事务提交
+    detail_queue_size: int = 1024
+    detail_write_batch: int = 500
+    detail_write_interval: float = 1.0
 
     # safety
     antibot_fail_fast: bool = True
@@ -89,6 +96,38 @@ def _detail_url(user_id: str, weibo_id: str) -> str:
     return f"https://weibo.cn/{user_id}/{clean}"
 
 
+def _parse_detail_html(body: str, wid: str) -> Dict[str, Any]:
+    """
+    解析详情页 HTML，只返回可 pickle 的纯数据（在进程池中执行，必须是模块级函数）。
+    """
+    # 子进程不会继承主进程的 warnings 过滤
+    warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+    # XHTML 用 lxml 的 HTML 解析器即可（warning 已被过滤）
+    soup = BeautifulSoup(body, "lxml")
+    card = soup.find("div", id=wid) or soup.find("div", class_="c", id=True)
+    if not card:
+        t = soup.get_text("\n", strip=True).lower()
+        missing = "does not exist" in t or "不存在" in t or "已被删除" in t or "作者删除" in t
+        return {"card": False, "missing": missing}
+
+    content_span = card.find("span", class_="ctt")
+    text, html = extract_text_html_preserve_links(content_span) if content_span else ("", "")
+    images = extract_images_from_soup(soup)
+
+    is_forward, _meta = classify_retweet_from_list_card(card)
+    reason_len = 0
+    if is_forward:
+        _, reason_len, _src = extract_forward_reason_from_detail(card)
+    return {
+        "card": True,
+        "text": text,
+        "html": html,
+        "images": list(images),
+        "is_forward": bool(is_forward),
+        "reason_len": int(reason_len),
+    }
+
+
 def _classify_from_text_heuristic(text: str) -> Tuple[int, str]:
     """
     仅在“不重复抓取”的前提下，用于补齐 is_retweet 缺失的保守启发式。
@@ -131,6 +170,24 @@ class WeiboPipeline:
             headers={"User-Agent": weibo_cfg["user_agent"], "Referer": "https://weibo.cn/"},
         )
         self.html_generator = HTMLGenerator(config=storage_cfg)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        """
+        详情页解析用的进程池（首次使用时创建）。返回 None 表示退回 loop 默认线程池。
+        """
+        if self._parse_pool is None:
+            workers = self.pipeline_cfg.detail_parse_workers
+            if workers is None:
+                workers = min(8, os.cpu_count() or 1)
+            if workers <= 1:
+                return None
+            try:
+                self._parse_pool = ProcessPoolExecutor(max_workers=workers)
+            except Exception as e:
+                logger.warning(f"[detail] 无法创建解析进程池，改为线程内解析: {type(e).__name__}: {e}")
+                return None
+        return self._parse_pool
 
     async def run(self, phases: List[str]) -> None:
         try:
@@ -139,27 +196,47 @@ class WeiboPipeline:
                 phases=phases,
                 config_path=str(self.cfg.get("_config_path", "")),
             )
+            self._migrate_raw_json()
             if "list" in phases:
                 self.events.emit("phase_started", phase="list")
                 await self.phase_list_fetch()
+                self.db.flush()
                 self.events.emit("phase_completed", phase="list")
             if "detail" in phases:
                 self.events.emit("phase_started", phase="detail")
                 await self.phase_detail_enrich()
+                self.db.flush()
                 self.events.emit("phase_completed", phase="detail")
             if "media" in phases:
                 self.events.emit("phase_started", phase="media")
                 await self.phase_download_media()
+                self.db.flush()
                 self.events.emit("phase_completed", phase="media")
             if "html" in phases:
                 self.events.emit("phase_started", phase="html")
                 self.phase_generate_html()
+                self.db.flush()
                 self.events.emit("phase_completed", phase="html")
             self.events.emit("run_completed", ok=True)
         finally:
+            await self.fetcher.aclose()
+            await self.downloader.aclose()
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(wait=False, cancel_futures=True)
+                self._parse_pool = None
             self.db.close()
             self.events.close()
 
+    def _migrate_raw_json(self) -> None:
+        """旧版本写入的 raw_json 未压缩：首次运行时整库转换一次，之后凭 progress 标记跳过"""
+        if self.db.get_progress("raw_json_compressed"):
+            return
+        converted = self.db.compress_raw_json()
+        self.db.set_progress("raw_json_compressed", "1")
+        self.db.flush()
+        if converted:
+            logger.info(f"[db] 已压缩旧数据的 raw_json：{converted} 条")
+
     async def phase_list_fetch(self) -> None:
         last_page = self.db.get_progress("last_page")
         start_page = int(last_page) + 1 if last_page else 1
@@ -202,20 +279,28 @@ class WeiboPipeline:
                 self.events.emit("list_stopped", reason="no_valid_weibos", page=page)
                 break
 
-            new_count = 0
+            new_weibos: List[Dict[str, Any]] = []
+            seen_ids = set()
             for w in page_weibos:
                 wid = w.get("id")
-                if not wid:
+                if not wid or wid in seen_ids:
                     continue
                 if self.db.weibo_exists(wid):
                     continue
-                # 新微博：直接入库（包含 is_truncated/is_retweet/html_with_links 等增量字段）
-                if self.db.save_weibo(w):
-                    new_count += 1
-                    new_total += 1
-                    # 图片/视频记录入库（去重）
-                    for img in w.get("images", []) or []:
-                        self.db.save_image(wid, img)
+                seen_ids.add(wid)
+                new_weibos.append(w)
+
+            # 新微博：整页一次性入库（包含 is_truncated/is_retweet/html_with_links 等增量字段）
+            # 按页落库而不是跨页攒批：last_page checkpoint 必须在本页数据写入之后才推进
+            new_count = self.db.save_weibos_bulk(new_weibos)
+            if new_count:
+                new_total += new_count
+                # 图片/视频记录入库（去重）
+                self.db.save_images_bulk(
+                    (w["id"], img) for w in new_weibos for img in (w.get("images", []) or [])
+                )
+                for w in new_weibos:
+                    wid = w["id"]
                     for vid in w.get("videos", []) or []:
                         if isinstance(vid, dict) and vid.get("url"):
                             self.db.save_video(wid, vid["url"], vid.get("cover"))
@@ -264,7 +349,6 @@ class WeiboPipeline:
         total_batches = 0
         total_done = 0
 
-        timeout = httpx.Timeout(float(crawler_cfg.get("timeout", 30.0)))
         # 详情页更容易触发反爬：优先使用 crawler.request_delay 作为基础节奏
         detail_policy = HttpRetryPolicy(
             max_attempts=self.pipeline_cfg.detail_retry.max_attempts,
@@ -274,229 +358,223 @@ class WeiboPipeline:
             antibot_statuses=self.pipeline_cfg.detail_retry.antibot_statuses,
         )
 
-        cooldowns = 0
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, verify=False) as client:
-            while True:
-                # 先做“完全不联网”的缺失补齐（detail_fetched=1 的不重复抓取）
-                missing = self.db.list_weibos_missing_retweet_flag(limit=self.pipeline_cfg.detail_batch_size)
-                patched_heur = 0
-                for item in missing:
-                    if int(item.get("detail_fetched") or 0) == 1:
-                        is_retweet, cat = _classify_from_text_heuristic(item.get("text") or "")
-                        self.db.update_weibo_fields(
-                            item["id"],
-                            {
-                                "is_retweet": int(is_retweet),
-                                "retweet_category": cat,
-                                "fetched_at": datetime.now().isoformat(),
-                            },
-                        )
-                        patched_heur += 1
-                if patched_heur:
-                    logger.info(f"[detail] 离线启发式补齐 is_retweet：{patched_heur} 条（不重复抓取）")
-
-                # 需要抓详情页的集合：补全文 + 缺失转发标记且未抓详情
-                need_detail_ids = set(self.db.list_weibos_needing_detail(limit=self.pipeline_cfg.detail_batch_size))
-                for item in missing:
-                    if int(item.get("detail_fetched") or 0) == 0:
-                        need_detail_ids.add(item["id"])
-
-                # 方案A：对既有数据库做“转发纠错”复核（不新增列）
-                if self.pipeline_cfg.retweet_recheck_year is not None:
-                    cands = self.db.list_retweet_recheck_candidates(
-                        year=int(self.pipeline_cfg.retweet_recheck_year),
-                        limit=int(self.pipeline_cfg.retweet_recheck_limit),
-                        mode=str(self.pipeline_cfg.retweet_recheck_mode or "video_phrase"),
-                    )
-                    for wid in cands:
-                        brief = self.db.get_weibo_brief(wid) or {}
-                        if int(brief.get("detail_fetched") or 0) == 0:
-                            need_detail_ids.add(wid)
-
-                # 历史回填：对某个年份之前的所有微博补抓一次详情页（不区分原创/转发）
-                if self.pipeline_cfg.detail_backfill_before_year is not None:
-                    backfill_ids = self.db.list_weibos_detail_unfetched_before_year(
-                        before_year=int(self.pipeline_cfg.detail_backfill_before_year),
-                        limit=int(self.pipeline_cfg.detail_batch_size),
-                    )
-                    need_detail_ids.update(backfill_ids)
+        # 按 host 限速：默认与 并发数/request_delay 的节奏一致，服务端返回限流头时自动放慢
+        limiter = HostRateLimiter(
+            rate=self.pipeline_cfg.detail_concurrency / max(detail_policy.base_delay, 0.1),
+            burst=self.pipeline_cfg.detail_concurrency,
+        )
 
-                # 方案A（范围版）：如果没指定单年，但指定了历史回填范围，可顺手把该范围内“原创候选”加入复核（用于纠错）
-                if (
-                    self.pipeline_cfg.retweet_recheck_year is None
-                    and self.pipeline_cfg.detail_backfill_before_year is not None
-                ):
-                    cands2 = self.db.list_retweet_recheck_candidates_before_year(
-                        before_year=int(self.pipeline_cfg.detail_backfill_before_year),
-                        limit=int(self.pipeline_cfg.retweet_recheck_limit),
-                        mode=str(self.pipeline_cfg.retweet_recheck_mode or "video_phrase"),
-                    )
-                    for wid in cands2:
-                        brief = self.db.get_weibo_brief(wid) or {}
-                        if int(brief.get("detail_fetched") or 0) == 0:
-                            need_detail_ids.add(wid)
+        loop = asyncio.get_running_loop()
+        parse_pool = self._get_parse_pool()
 
-                if not need_detail_ids:
-                    if total_batches == 0:
-                        logger.info("[detail] 无需抓取详情页的任务，跳过")
-                    else:
-                        logger.info(f"[detail] 本轮已完成全部详情补抓：批次={total_batches} 成功更新={total_done} 条")
-                    self.events.emit(
-                        "detail_completed",
-                        batches=total_batches,
-                        total_done=total_done,
+        cooldowns = 0
+        # 与列表页共用 WeiboFetcher 的连接池（同为 weibo.cn，复用 keep-alive/TLS 连接）
+        client = self.fetcher.client
+        while True:
+            # 先做“完全不联网”的缺失补齐（detail_fetched=1 的不重复抓取）
+            missing = self.db.list_weibos_missing_retweet_flag(limit=self.pipeline_cfg.detail_batch_size)
+            patched_heur = 0
+            for item in missing:
+                if int(item.get("detail_fetched") or 0) == 1:
+                    is_retweet, cat = _classify_from_text_heuristic(item.get("text") or "")
+                    self.db.update_weibo_fields(
+                        item["id"],
+                        {
+                            "is_retweet": int(is_retweet),
+                            "retweet_category": cat,
+                            "fetched_at": datetime.now().isoformat(),
+                        },
                     )
-                    return
-
-                total_batches += 1
-                batch_ids = sorted(need_detail_ids)
-                logger.info(
-                    f"[detail] 批次 {total_batches}: 需要抓取详情页：{len(batch_ids)} 条（并发={self.pipeline_cfg.detail_concurrency}）"
+                    patched_heur += 1
+            if patched_heur:
+                logger.info(f"[detail] 离线启发式补齐 is_retweet：{patched_heur} 条（不重复抓取）")
+
+            # 需要抓详情页的集合：补全文 + 缺失转发标记且未抓详情
+            need_detail_ids = set(self.db.list_weibos_needing_detail(limit=self.pipeline_cfg.detail_batch_size))
+            for item in missing:
+                if int(item.get("detail_fetched") or 0) == 0:
+                    need_detail_ids.add(item["id"])
+
+            # 方案A：对既有数据库做“转发纠错”复核（不新增列）
+            if self.pipeline_cfg.retweet_recheck_year is not None:
+                cands = self.db.list_retweet_recheck_candidates(
+                    year=int(self.pipeline_cfg.retweet_recheck_year),
+                    limit=int(self.pipeline_cfg.retweet_recheck_limit),
+                    mode=str(self.pipeline_cfg.retweet_recheck_mode or "video_phrase"),
+                )
+                for wid in cands:
+                    brief = self.db.get_weibo_brief(wid) or {}
+                    if int(brief.get("detail_fetched") or 0) == 0:
+                        need_detail_ids.add(wid)
+
+            # 历史回填：对某个年份之前的所有微博补抓一次详情页（不区分原创/转发）
+            if self.pipeline_cfg.detail_backfill_before_year is not None:
+                backfill_ids = self.db.list_weibos_detail_unfetched_before_year(
+                    before_year=int(self.pipeline_cfg.detail_backfill_before_year),
+                    limit=int(self.pipeline_cfg.detail_batch_size),
+                )
+                need_detail_ids.update(backfill_ids)
+
+            # 方案A（范围版）：如果没指定单年，但指定了历史回填范围，可顺手把该范围内“原创候选”加入复核（用于纠错）
+            if (
+                self.pipeline_cfg.retweet_recheck_year is None
+                and self.pipeline_cfg.detail_backfill_before_year is not None
+            ):
+                cands2 = self.db.list_retweet_recheck_candidates_before_year(
+                    before_year=int(self.pipeline_cfg.detail_backfill_before_year),
+                    limit=int(self.pipeline_cfg.retweet_recheck_limit),
+                    mode=str(self.pipeline_cfg.retweet_recheck_mode or "video_phrase"),
                 )
+                for wid in cands2:
+                    brief = self.db.get_weibo_brief(wid) or {}
+                    if int(brief.get("detail_fetched") or 0) == 0:
+                        need_detail_ids.add(wid)
+
+            if not need_detail_ids:
+                if total_batches == 0:
+                    logger.info("[detail] 无需抓取详情页的任务，跳过")
+                else:
+                    logger.info(f"[detail] 本轮已完成全部详情补抓：批次={total_batches} 成功更新={total_done} 条")
                 self.events.emit(
-                    "detail_batch_started",
-                    batch=total_batches,
-                    total=len(batch_ids),
-                    concurrency=self.pipeline_cfg.detail_concurrency,
+                    "detail_completed",
+                    batches=total_batches,
+                    total_done=total_done,
                 )
-                sem = asyncio.Semaphore(self.pipeline_cfg.detail_concurrency)
-                done = 0
-                last_emit = time.monotonic()
-
-                async def work(wid: str) -> None:
-                    nonlocal done
-                    nonlocal last_emit
-                    url = _detail_url(user_id, wid)
+                return
+
+            total_batches += 1
+            batch_ids = sorted(need_detail_ids)
+            logger.info(
+                f"[detail] 批次 {total_batches}: 需要抓取详情页：{len(batch_ids)} 条（并发={self.pipeline_cfg.detail_concurrency}）"
+            )
+            self.events.emit(
+                "detail_batch_started",
+                batch=total_batches,
+                total=len(batch_ids),
+                concurrency=self.pipeline_cfg.detail_concurrency,
+            )
+            sem = asyncio.Semaphore(self.pipeline_cfg.detail_concurrency)
+            write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_cfg.detail_queue_size)
+            # done = 已真正落库的条数（由写入协程统计并上报进度）
+            writer = asyncio.create_task(self._detail_writer(write_queue, batch=total_batches, total=len(batch_ids)))
+            done = 0
+
+            async def work(wid: str) -> None:
+                url = _detail_url(user_id, wid)
+                try:
+                    async with sem:
+                        resp = await get_with_retries(
+                            client,
+                            url,
+                            headers=headers,
+                            policy=detail_policy,
+                            antibot_fail_fast=self.pipeline_cfg.antibot_fail_fast,
+                            limiter=limiter,
+                        )
+                except AntiBotTriggered:
+                    raise
+                except Exception as e:
+                    # 单条失败不应导致整批退出（保持可续跑）
+                    logger.warning(f"[detail] 单条详情抓取失败 wid={wid} err={type(e).__name__}: {e}")
+                    return
+
+                if resp.status_code != 200:
+                    return
+
+                body = (resp.text or "").strip()
+                body_lower = body.lower()
+
+                # 200 也可能是验证码/频繁访问提示页
+                if any(s in body for s in ("验证码", "请输入验证码", "访问过于频繁", "请稍后再试")):
+                    raise AntiBotTriggered(f"anti-bot page(200) url={url}")
+
+                # 有些详情页会明确返回“不存在/已删除”（内容已删除/不可访问）。这类属于“终态”，应打 checkpoint 避免反复补抓。
+                if (
+                    ("does not exist" in body_lower)
+                    or ("微博不存在" in body)
+                    or ("该微博不存在" in body)
+                    or ("此微博不存在" in body)
+                    or ("该微博已被删除" in body)
+                    or ("此微博已被删除" in body)
+                    or ("已被作者删除" in body)
+                ):
+                    brief = self.db.get_weibo_brief(wid) or {}
+                    raw = {}
                     try:
-                        async with sem:
-                            resp = await get_with_retries(
-                                client,
-                                url,
-                                headers=headers,
-                                policy=detail_policy,
-                                antibot_fail_fast=self.pipeline_cfg.antibot_fail_fast,
-                            )
-                    except AntiBotTriggered:
-                        raise
-                    except Exception as e:
-                        # 单条失败不应导致整批退出（保持可续跑）
-                        logger.warning(f"[detail] 单条详情抓取失败 wid={wid} err={type(e).__name__}: {e}")
-                        return
-
-                    if resp.status_code != 200:
-                        return
-
-                    body = (resp.text or "").strip()
-                    body_lower = body.lower()
-
-                    # 200 也可能是验证码/频繁访问提示页
-                    if any(s in body for s in ("验证码", "请输入验证码", "访问过于频繁", "请稍后再试")):
-                        raise AntiBotTriggered(f"anti-bot page(200) url={url}")
-
-                    # 有些详情页会明确返回“不存在/已删除”（内容已删除/不可访问）。这类属于“终态”，应打 checkpoint 避免反复补抓。
-                    if (
-                        ("does not exist" in body_lower)
-                        or ("微博不存在" in body)
-                        or ("该微博不存在" in body)
-                        or ("此微博不存在" in body)
-                        or ("该微博已被删除" in body)
-                        or ("此微博已被删除" in body)
-                        or ("已被作者删除" in body)
-                    ):
-                        brief = self.db.get_weibo_brief(wid) or {}
+                        raw = json.loads(brief.get("raw_json") or "{}")
+                    except Exception:
                         raw = {}
-                        try:
-                            raw = json.loads(brief.get("raw_json") or "{}")
-                        except Exception:
-                            raw = {}
-                        raw["detail_missing"] = True
-                        raw["detail_missing_reason"] = "missing_or_deleted"
-                        self.db.update_weibo_fields(
+                    raw["detail_missing"] = True
+                    raw["detail_missing_reason"] = "missing_or_deleted"
+                    await write_queue.put(
+                        (
                             wid,
                             {
                                 "raw_json": json.dumps(raw, ensure_ascii=False),
                                 "detail_fetched": 1,
                                 "fetched_at": datetime.now().isoformat(),
                             },
+                            [],
                         )
-                        done += 1
-                        now = time.monotonic()
-                        if done == len(batch_ids) or done % 25 == 0 or (now - last_emit) >= 1.0:
-                            last_emit = now
-                            self.events.emit(
-                                "detail_batch_progress",
-                                batch=total_batches,
-                                done=done,
-                                total=len(batch_ids),
-                            )
-                        return
-
-                    # XHTML 用 lxml 的 HTML 解析器即可（warning 已被过滤）
-                    soup = BeautifulSoup(body, "lxml")
-                    card = soup.find("div", id=wid) or soup.find("div", class_="c", id=True)
-                    if not card:
-                        # 没找到正文卡片：如果文本提示是“已删除/不存在”，也打终态 checkpoint；否则留给下次重试
-                        t = soup.get_text("\n", strip=True).lower()
-                        if "does not exist" in t or "不存在" in t or "已被删除" in t or "作者删除" in t:
-                            brief = self.db.get_weibo_brief(wid) or {}
+                    )
+                    return
+
+                # HTML 解析是 CPU 密集型：放到进程池，避免阻塞 event loop
+                parsed = await loop.run_in_executor(parse_pool, _parse_detail_html, body, wid)
+                if not parsed["card"]:
+                    # 没找到正文卡片：如果文本提示是“已删除/不存在”，也打终态 checkpoint；否则留给下次重试
+                    if parsed["missing"]:
+                        brief = self.db.get_weibo_brief(wid) or {}
+                        raw = {}
+                        try:
+                            raw = json.loads(brief.get("raw_json") or "{}")
+                        except Exception:
                             raw = {}
-                            try:
-                                raw = json.loads(brief.get("raw_json") or "{}")
-                            except Exception:
-                                raw = {}
-                            raw["detail_missing"] = True
-                            raw["detail_missing_reason"] = "missing_or_deleted(no_card)"
-                            self.db.update_weibo_fields(
+                        raw["detail_missing"] = True
+                        raw["detail_missing_reason"] = "missing_or_deleted(no_card)"
+                        await write_queue.put(
+                            (
                                 wid,
                                 {
                                     "raw_json": json.dumps(raw, ensure_ascii=False),
                                     "detail_fetched": 1,
                                     "fetched_at": datetime.now().isoformat(),
                                 },
+                                [],
                             )
-                            done += 1
-                            now = time.monotonic()
-                            if done == len(batch_ids) or done % 25 == 0 or (now - last_emit) >= 1.0:
-                                last_emit = now
-                                self.events.emit(
-                                    "detail_batch_progress",
-                                    batch=total_batches,
-                                    done=done,
-                                    total=len(batch_ids),
-                                )
-                        return
-
-                    content_span = card.find("span", class_="ctt")
-                    text, html = extract_text_html_preserve_links(content_span) if content_span else ("", "")
-                    images = extract_images_from_soup(soup)
-
-                    # 分类：基于详情页卡片
-                    is_forward, _meta = classify_retweet_from_list_card(card)
-                    if is_forward:
-                        _, reason_len, _src = extract_forward_reason_from_detail(card)
-                        if reason_len > self.pipeline_cfg.retweet_long_comment_threshold:
-                            is_retweet = 0
-                            category = "long_comment"
-                        else:
-                            is_retweet = 1
-                            category = "retweet"
-                    else:
-                        is_retweet = 0
-                        category = "original"
+                        )
+                    return
 
-                    # 更新 DB（允许用详情页完整正文覆盖）
-                    brief = self.db.get_weibo_brief(wid) or {}
+                text = parsed["text"]
+                html = parsed["html"]
+                images = parsed["images"]
+
+                # 分类：基于详情页卡片
+                if parsed["is_forward"]:
+                    if parsed["reason_len"] > self.pipeline_cfg.retweet_long_comment_threshold:
+                        is_retweet = 0
+                        category = "long_comment"
+                    else:
+                        is_retweet = 1
+                        category = "retweet"
+                else:
+                    is_retweet = 0
+                    category = "original"
+
+                # 更新 DB（允许用详情页完整正文覆盖）
+                brief = self.db.get_weibo_brief(wid) or {}
+                raw = {}
+                try:
+                    raw = json.loads(brief.get("raw_json") or "{}")
+                except Exception:
                     raw = {}
-                    try:
-                        raw = json.loads(brief.get("raw_json") or "{}")
-                    except Exception:
-                        raw = {}
-                    if html:
-                        raw["html_with_links"] = html
-                    if text:
-                        raw["text_detail"] = text
+                if html:
+                    raw["html_with_links"] = html
+                if text:
+                    raw["text_detail"] = text
 
-                    self.db.update_weibo_fields(
+                await write_queue.put(
+                    (
                         wid,
                         {
                             "text": text or (brief.get("text") or ""),
@@ -506,53 +584,99 @@ class WeiboPipeline:
                             "detail_fetched": 1,
                             "fetched_at": datetime.now().isoformat(),
                         },
+                        images,
                     )
-                    for u in images:
-                        self.db.save_image(wid, u)
-                    done += 1
-                    now = time.monotonic()
-                    if done == len(batch_ids) or done % 25 == 0 or (now - last_emit) >= 1.0:
-                        last_emit = now
-                        self.events.emit(
-                            "detail_batch_progress",
-                            batch=total_batches,
-                            done=done,
-                            total=len(batch_ids),
-                        )
+                )
 
+            tasks = [asyncio.ensure_future(work(wid)) for wid in batch_ids]
+            try:
                 try:
-                    await asyncio.gather(*(work(wid) for wid in batch_ids))
-                except AntiBotTriggered as e:
-                    cooldowns += 1
-                    logger.error(f"[detail] 触发反爬：{e}")
-                    self.events.emit(
-                        "antibot_triggered",
-                        phase="detail",
-                        cooldown_seconds=self.pipeline_cfg.antibot_cooldown_seconds,
-                        cooldowns=cooldowns,
-                        max_cooldowns=self.pipeline_cfg.antibot_max_cooldowns,
-                        error=str(e),
-                    )
-                    if cooldowns > self.pipeline_cfg.antibot_max_cooldowns:
-                        logger.error(f"[detail] 冷却次数已达上限（{self.pipeline_cfg.antibot_max_cooldowns}），停止以避免浪费时间")
-                        self.events.emit("detail_stopped", reason="antibot_max_cooldowns")
-                        return
-                    logger.warning(f"[detail] 进入冷却：{self.pipeline_cfg.antibot_cooldown_seconds}s 后自动继续（第 {cooldowns}/{self.pipeline_cfg.antibot_max_cooldowns} 次）")
-                    await asyncio.sleep(float(self.pipeline_cfg.antibot_cooldown_seconds))
-                    continue
-
-                logger.info(f"[detail] 批次完成：{done}/{len(batch_ids)}")
+                    await asyncio.gather(*tasks)
+                finally:
+                    # 触发反爬时取消同批其余请求；已抓到的结果照常落库
+                    for t in tasks:
+                        t.cancel()
+                    await write_queue.put(None)
+                    done = await writer
+            except AntiBotTriggered as e:
+                cooldowns += 1
+                logger.error(f"[detail] 触发反爬：{e}")
                 self.events.emit(
-                    "detail_batch_completed",
-                    batch=total_batches,
-                    done=done,
-                    total=len(batch_ids),
+                    "antibot_triggered",
+                    phase="detail",
+                    cooldown_seconds=self.pipeline_cfg.antibot_cooldown_seconds,
+                    cooldowns=cooldowns,
+                    max_cooldowns=self.pipeline_cfg.antibot_max_cooldowns,
+                    error=str(e),
                 )
-                total_done += done
-                if done == 0:
-                    logger.warning("[detail] 本批次 0 条成功更新，停止以避免无限循环（可能是登录失效或触发反爬）")
-                    self.events.emit("detail_stopped", reason="zero_success")
+                if cooldowns > self.pipeline_cfg.antibot_max_cooldowns:
+                    logger.error(f"[detail] 冷却次数已达上限（{self.pipeline_cfg.antibot_max_cooldowns}），停止以避免浪费时间")
+                    self.events.emit("detail_stopped", reason="antibot_max_cooldowns")
                     return
+                logger.warning(f"[detail] 进入冷却：{self.pipeline_cfg.antibot_cooldown_seconds}s 后自动继续（第 {cooldowns}/{self.pipeline_cfg.antibot_max_cooldowns} 次）")
+                await asyncio.sleep(float(self.pipeline_cfg.antibot_cooldown_seconds))
+                continue
+
+            logger.info(f"[detail] 批次完成：{done}/{len(batch_ids)}")
+            self.events.emit(
+                "detail_batch_completed",
+                batch=total_batches,
+                done=done,
+                total=len(batch_ids),
+            )
+            total_done += done
+            if done == 0:
+                logger.warning("[detail] 本批次 0 条成功更新，停止以避免无限循环（可能是登录失效或触发反爬）")
+                self.events.emit("detail_stopped", reason="zero_success")
+                return
+
+    async def _detail_writer(
+        self,
+        queue: "asyncio.Queue[Optional[Tuple[str, Dict[str, Any], List[str]]]]",
+        *,
+        batch: int,
+        total: int,
+    ) -> int:
+        """
+        详情补抓的落库阶段：从队列取 (wid, fields, images)，
+        攒够 detail_write_batch 条或等待 detail_write_interval 秒后单事务提交；收到 None 时写完剩余并退出。
+        每次提交成功后上报 detail_batch_progress；返回实际落库的条数。
+        """
+        loop = asyncio.get_running_loop()
+        max_batch = max(1, int(self.pipeline_cfg.detail_write_batch))
+        interval = float(self.pipeline_cfg.detail_write_interval)
+        written = 0
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                return written
+            pending = [item]
+            deadline = loop.time() + interval
+            while len(pending) < max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                pending.append(item)
+            try:
+                self.db.update_weibos_bulk(
+                    ((wid, fields) for wid, fields, _ in pending),
+                    images=((wid, u) for wid, _, imgs in pending for u in imgs),
+                )
+            except Exception as e:
+                # 写入失败不应卡死队列：这些微博保持 detail_fetched=0，不计入 done，下轮会重新补抓
+                logger.error(f"[detail] 批量落库失败（{len(pending)} 条）：{type(e).__name__}: {e}")
+                continue
+            written += len(pending)
+            self.events.emit("detail_batch_progress", batch=batch, done=written, total=total)
+        return written
 
     async def phase_download_media(self) -> None:
         images = self.db.get_undownloaded_images()
@@ -723,10 +847,24 @@ def run_pipeline_from_gui(
         # 现在可以安全地创建 WeiboPipeline，因为 event loop 已经设置好了
         pipeline = WeiboPipeline(config_path=config_path, pipeline_cfg=cfg, events=events)  # type: ignore
         
-        # 运行pipeline
-        try:
-            loop.run_until_complete(pipeline.run(phases))
+        # 运行pipeline：作为 task 跑在本线程的 loop 上，GUI 请求停止时取消该 task
+        # （run() 的 finally 会关闭连接池/数据库，已落库的数据不受影响）
+        async def _run_until_stopped() -> int:
+            task = asyncio.ensure_future(pipeline.run(phases))
+            while not task.done():
+                if should_stop():
+                    task.cancel()
+                    break
+                await asyncio.wait({task}, timeout=0.2)
+            try:
+                await task
+            except asyncio.CancelledError:
+                log_callback("[INFO] Pipeline stopped by user")
+                return 1
             return 0
+
+        try:
+            return loop.run_until_complete(_run_until_stopped())
         finally:
             loop.close()
     
@@ -10,6 +10,18 @@ from bs4 import BeautifulSoup
 from loguru import logger
 
 
+# 连接池参数：同一 host 的请求复用 keep-alive 连接，避免每次重新 TLS 握手
+_POOL_LIMITS = httpx.Limits(max_connections=128, max_keepalive_connections=64, keepalive_expiry=60.0)
+
+# HTTP/2：并发请求复用同一条 TLS 连接（多路复用）；h2 缺失时退回 HTTP/1.1
+try:
+    # 兼容：python -m src.pipeline.runner
+    from src.pipeline.http_utils import HTTP2_AVAILABLE  # type: ignore
+except ImportError:
+    # 兼容：python src/main.py（此时 sys.path[0] 是 src/）
+    from pipeline.http_utils import HTTP2_AVAILABLE  # type: ignore
+
+
 class WeiboFetcher:
     """微博数据抓取器"""
     
@@ -40,8 +52,29 @@ class WeiboFetcher:
         }
         
         self.base_url = 'https://weibo.cn'
+        # 延迟创建长连接 client（避免在没有event loop的线程中初始化）
+        self._client: Optional[httpx.AsyncClient] = None
         logger.info(f"WeiboFetcher 初始化完成，用户ID: {user_id}")
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """整个抓取过程共用一个 AsyncClient（连接池 + keep-alive）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                verify=False,
+                limits=_POOL_LIMITS,
+                http2=HTTP2_AVAILABLE,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """关闭连接池"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def fetch_user_weibos(self, page: int = 1) -> Optional[Dict[str, Any]]:
         """
         获取用户微博列表（HTML解析方式）
@@ -57,39 +90,37 @@ class WeiboFetcher:
         params = {'page': page} if page > 1 else {}
         
         try:
-            async with httpx.AsyncClient(timeout=self.config['timeout'], follow_redirects=True, verify=False) as client:
-                self.client = client  # 保存client用于_fetch_all_images
-                response = await client.get(url, headers=self.headers, params=params)
+            response = await self.client.get(url, headers=self.headers, params=params)
+            
+            if response.status_code == 200:
+                # 解析HTML
+                html = response.text
+                weibos = self._parse_html_page(html)
                 
-                if response.status_code == 200:
-                    # 解析HTML
-                    html = response.text
-                    weibos = self._parse_html_page(html)
+                if weibos:
+                    # 处理组图：对有picall的微博，获取所有图片
+                    for weibo in weibos:
+                        if weibo.get('has_picall'):
+                            images = await self._fetch_all_images(weibo['has_picall'])
+                            weibo['images'] = images
+                            # 清除标记
+                            del weibo['has_picall']
                     
-                    if weibos:
-                        # 处理组图：对有picall的微博，获取所有图片
-                        for weibo in weibos:
-                            if weibo.get('has_picall'):
-                                images = await self._fetch_all_images(weibo['has_picall'])
-                                weibo['images'] = images
-                                # 清除标记
-                                del weibo['has_picall']
-                        
-                        logger.info(f"成功获取第 {page} 页数据，共 {len(weibos)} 条")
-                        # 构造类似API的返回格式
-                        return {
-                            'ok': 1,
-                            'data': {
-                                'cards': [{'card_type': 9, 'mblog': w} for w in weibos]
-                            }
+                    logger.info(f"成功获取第 {page} 页数据，共 {len(weibos)} 条")
+                    # 构造类似API的返回格式
+                    return {
+                        'ok': 1,
+                        'data': {
+                            'cards': [{'card_type': 9, 'mblog': w} for w in weibos]
                         }
-                    else:
-                        logger.warning(f"第 {page} 页没有解析到微博")
-                        return None
+                    }
                 else:
-                    logger.error(f"HTTP错误: {response.status_code}")
+                    logger.warning(f"第 {page} 页没有解析到微博")
                     return None
-                    
+            else:
+                logger.error(f"HTTP错误: {response.status_code}")
+                return None
+                
         except Exception as e:
             logger.error(f"请求失败: {e}")
             return None
@@ -360,73 +391,72 @@ class WeiboFetcher:
         url = f'{self.base_url}/{self.user_id}/{weibo_id}'
         
         try:
-            async with httpx.AsyncClient(timeout=self.config['timeout'], follow_redirects=True) as client:
-                response = await client.get(url, headers=self.headers)
+            response = await self.client.get(url, headers=self.headers)
+            
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.text, 'lxml')
                 
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'lxml')
-                    
-                    result = {
-                        'text': None,
-                        'images': []
-                    }
+                result = {
+                    'text': None,
+                    'images': []
+                }
+                
+                # 1. 提取完整内容
+                content = soup.find('span', class_='ctt')
+                if content:
+                    # 移除"全文"链接
+                    for a in content.find_all('a'):
+                        if a.get_text() == '全文':
+                            a.decompose()
                     
-                    # 1. 提取完整内容
-                    content = soup.find('span', class_='ctt')
-                    if content:
-                        # 移除"全文"链接
-                        for a in content.find_all('a'):
-                            if a.get_text() == '全文':
-                                a.decompose()
+                    result['text'] = content.get_text().strip()
+                
+                # 2. 提取图片
+                # 查找所有图片相关的链接
+                img_tags = soup.find_all('img')
+                image_ids = set()  # 用于去重
+                
+                for img in img_tags:
+                    src = img.get('src', '')
+                    if 'sinaimg.cn' in src and ('wap' in src or 'thumb' in src or 'orj' in src):
+                        # 转换为large大图
+                        large_url = src.replace('/wap180/', '/large/').replace('/thumb180/', '/large/').replace('/orj360/', '/large/')
                         
-                        result['text'] = content.get_text().strip()
-                    
-                    # 2. 提取图片
-                    # 查找所有图片相关的链接
-                    img_tags = soup.find_all('img')
-                    image_ids = set()  # 用于去重
-                    
-                    for img in img_tags:
-                        src = img.get('src', '')
-                        if 'sinaimg.cn' in src and ('wap' in src or 'thumb' in src or 'orj' in src):
-                            # 转换为large大图
-                            large_url = src.replace('/wap180/', '/large/').replace('/thumb180/', '/large/').replace('/orj360/', '/large/')
-                            
-                            # 提取图片ID用于去重
-                            parts = large_url.split('/')
-                            if len(parts) >= 2:
-                                pic_id = parts[-1].split('.')[0]
-                                if pic_id not in image_ids:
-                                    image_ids.add(pic_id)
-                                    # 确保URL带扩展名
-                                    if not large_url.endswith(('.jpg', '.jpeg', '.png', '.gif')):
-                                        large_url = large_url + '.jpg'
-                                    result['images'].append(large_url)
-                    
-                    # 也可以从原图链接提取
-                    oripic_links = soup.find_all('a', href=lambda x: x and 'oripic' in str(x))
-                    for link in oripic_links:
-                        href = link.get('href', '')
-                        if '&u=' in href:
-                            pic_id_raw = href.split('&u=')[-1]
-                            # 去除可能的参数（如 &rl=1）
-                            if '&' in pic_id_raw:
-                                pic_id_raw = pic_id_raw.split('&')[0]
-                            pic_id = pic_id_raw.split('.')[0]
+                        # 提取图片ID用于去重
+                        parts = large_url.split('/')
+                        if len(parts) >= 2:
+                            pic_id = parts[-1].split('.')[0]
                             if pic_id not in image_ids:
                                 image_ids.add(pic_id)
-                                large_url = f'https://wx1.sinaimg.cn/large/{pic_id_raw}'
+                                # 确保URL带扩展名
                                 if not large_url.endswith(('.jpg', '.jpeg', '.png', '.gif')):
                                     large_url = large_url + '.jpg'
                                 result['images'].append(large_url)
-                    
-                    if result['text'] or result['images']:
-                        logger.debug(f"获取详情成功: {weibo_id} (文本: {len(result['text']) if result['text'] else 0}字, 图片: {len(result['images'])}张)")
-                        return result
-                    
-                logger.warning(f"详情页未找到内容: {weibo_id}")
-                return None
                 
+                # 也可以从原图链接提取
+                oripic_links = soup.find_all('a', href=lambda x: x and 'oripic' in str(x))
+                for link in oripic_links:
+                    href = link.get('href', '')
+                    if '&u=' in href:
+                        pic_id_raw = href.split('&u=')[-1]
+                        # 去除可能的参数（如 &rl=1）
+                        if '&' in pic_id_raw:
+                            pic_id_raw = pic_id_raw.split('&')[0]
+                        pic_id = pic_id_raw.split('.')[0]
+                        if pic_id not in image_ids:
+                            image_ids.add(pic_id)
+                            large_url = f'https://wx1.sinaimg.cn/large/{pic_id_raw}'
+                            if not large_url.endswith(('.jpg', '.jpeg', '.png', '.gif')):
+                                large_url = large_url + '.jpg'
+                            result['images'].append(large_url)
+                
+                if result['text'] or result['images']:
+                    logger.debug(f"获取详情成功: {weibo_id} (文本: {len(result['text']) if result['text'] else 0}字, 图片: {len(result['images'])}张)")
+                    return result
+                
+            logger.warning(f"详情页未找到内容: {weibo_id}")
+            return None
+            
         except Exception as e:
             logger.error(f"获取详情失败 {weibo_id}: {e}")
             return None